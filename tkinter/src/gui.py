@@ -1,9 +1,9 @@
-from tkinter import messagebox, Canvas, Tk, DoubleVar, Menu, Frame, Scale, HORIZONTAL, Label, Button, LAST, Text, Entry
+from tkinter import filedialog, messagebox, Canvas, Tk, DoubleVar, Menu, Frame, Scale, HORIZONTAL, Label, Button, LAST, Text, Entry
 from math import cos, sin, sqrt, radians
+from threading import Event, Thread
 import random
 
-from exceptions import NotConnectedGraphException
-from models import Grille, Sommet
+from models import Grille, Sommet, LIMITE_ANNULATION
 
 BLACK = "black"
 WHITE = "#E0E0E0"
@@ -85,6 +85,8 @@ class App(Tk):
         self.canvas.bind("<B1-Motion>", self.drag)  # Dragging avec le clic gauche
 
         self.is_stopped_button_pressed = False
+        self.annulation = Event()
+        self.calcul = None  # Fil du calcul en cours, les poids ne sont pas modifiables tant qu'il tourne
         self.sum_weight = 0
 
         self.grille = Grille(num_cols, num_rows)
@@ -141,6 +143,44 @@ class App(Tk):
             self.start = None
             self.end = None
 
+    def open_grid(self):
+        """
+        Ouvre une grille enregistrée au format binaire et l'affiche à la place de la grille courante.
+        """
+        chemin = filedialog.askopenfilename(filetypes=[("Grille", "*.saeg"), ("Tous les fichiers", "*")])
+        if not chemin:
+            return
+        try:
+            grille = Grille.load(chemin)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Ouverture impossible", str(e))
+            return
+
+        self.stop_algo_exec()
+        self.clear_arrows()
+        self.grille = grille
+        self.num_cols = grille.height
+        self.num_rows = grille.width
+        for entry, valeur in ((self.entry_length, self.num_cols), (self.entry_width, self.num_rows)):
+            entry.delete(0, "end")
+            entry.insert(0, str(valeur))
+        self.start = self.grille.tab[0][self.num_cols - 1]
+        self.end = self.grille.tab[self.num_rows - 1][0]
+        self.on_resize_released()
+
+    def save_grid(self):
+        """
+        Enregistre la grille courante au format binaire.
+        """
+        chemin = filedialog.asksaveasfilename(defaultextension=".saeg",
+                                              filetypes=[("Grille", "*.saeg"), ("Tous les fichiers", "*")])
+        if not chemin:
+            return
+        try:
+            self.grille.save(chemin)
+        except OSError as e:
+            messagebox.showerror("Enregistrement impossible", str(e))
+
     def create_elements(self):
         """
         Crée les éléments et les boutons et les place en haut de la fenêtre.
@@ -148,12 +188,24 @@ class App(Tk):
 
         menu_bar = Menu(self)
 
+        file_menu = Menu(menu_bar, tearoff=0)
+        file_menu.add_command(label="Ouvrir...", command=self.open_grid)
+        file_menu.add_command(label="Enregistrer...", command=self.save_grid)
+        menu_bar.add_cascade(label="Fichier", menu=file_menu)
+
         algo_menu = Menu(menu_bar, tearoff=0)
         algo_menu.add_command(label="Parcours en profondeur", command=self.launch_parcours_en_profondeur)
         algo_menu.add_command(label="Parcours en largeur", command=self.launch_parcours_en_largeur)
         algo_menu.add_command(label="Bellman-Ford", command=self.launch_bellman_ford)
         algo_menu.add_command(label="Dijkstra", command=self.launch_dijkstra)
+        algo_menu.add_command(label="Dijkstra (file de Dial)", command=self.launch_dial)
+        algo_menu.add_command(label="Chemin depuis l'arbre du départ", command=self.launch_chemin_depuis_champ)
         algo_menu.add_command(label="A*", command=self.a_star)
+        algo_menu.add_command(label="A* (repères ALT)", command=self.launch_a_star_reperes)
+        algo_menu.add_command(label="Dijkstra bidirectionnel", command=self.launch_dijkstra_bidirectionnel)
+        algo_menu.add_command(label="A* bidirectionnel", command=self.launch_a_star_bidirectionnel)
+        algo_menu.add_command(label="LPA* (incrémental)", command=self.launch_lpa_star)
+        algo_menu.add_command(label="HPA* (hiérarchique)", command=self.launch_hpa_star)
         algo_menu.add_command(label="AllerÀToire", command=self.launch_allerAToire)
         menu_bar.add_cascade(label="Algorithmes", menu=algo_menu)
 
@@ -252,7 +304,9 @@ class App(Tk):
                             10: YELLOW,
                             self.grille.WALL: BLACK
                         }
-                        self.paint_hexagon(c, r, colors[self.grille.tab[r][c].weight])
+                        # Un poids hors palette (grille ouverte depuis un fichier) prend la couleur la plus proche
+                        weight = self.grille.tab[r][c].weight
+                        self.paint_hexagon(c, r, colors[min(colors, key=lambda poids: abs(poids - weight))])
 
         self.init_hexagones()
         self.selected_color = old_selected
@@ -268,9 +322,10 @@ class App(Tk):
 
     def stop_algo_exec(self):
         """
-        Arrête l'exécution de l'algorithme en cours.
+        Arrête l'exécution de l'algorithme en cours : le calcul est annulé et l'animation interrompue.
         """
         self.is_stopped_button_pressed = True
+        self.annulation.set()
 
     def click(self, evt):
         """
@@ -386,7 +441,7 @@ class App(Tk):
 
         self.init_grid(self.num_cols, self.num_rows, self.hex_size)
         if self.chemins:
-            self._display_results(self.chemins[:], self.start)
+            self._display_results(self.chemins)
 
     def paint_hexagon_on_click(self, x, y):
         """
@@ -406,7 +461,9 @@ class App(Tk):
 
                     col, row = map(int, hex_id.split("-"))
 
-                    if not self.is_sommet_start_or_end(self.grille.tab[row][col]):
+                    if self._calcul_en_cours():
+                        self.bell()
+                    elif not self.is_sommet_start_or_end(self.grille.tab[row][col]):
                         color = self.selected_color
                         self.paint_hexagon(col, row, color)
 
@@ -433,6 +490,9 @@ class App(Tk):
         """
         Réinitialise tous les hexagones à blanc
         """
+        if self._calcul_en_cours():
+            self.bell()
+            return
         for hexagon in self.hexagons.values():
             y, x = map(int, hexagon.id.split("-"))
             if x < len(self.grille.tab) and y < len(self.grille.tab[x]) and not self.is_sommet_start_or_end(
@@ -469,6 +529,9 @@ class App(Tk):
         """
         Applique des couleurs aléatoires aux hexagones de la grille.
         """
+        if self._calcul_en_cours():
+            self.bell()
+            return
         colors = [BLACK, WHITE, BLUE, GREEN, YELLOW]
         for hex_id, hexagon in self.hexagons.items():
             random_color = random.choice(colors)
@@ -496,12 +559,63 @@ class App(Tk):
         """
         self.clear_arrows()
         self.grille.init_grid()
-        try:
-            chemins = self.grille.a_star(self.start, self.end)
-            self._display_results(chemins, self.start)
-        except NotConnectedGraphException as e:
-            self.alert_popup(e.message)
+        self._lancer(self.grille.etapes_a_star(self.start, self.end))
+
+
+    def launch_dijkstra_bidirectionnel(self):
+        """
+        Lance Dijkstra bidirectionnel entre le départ et l'objectif.
+        """
+        self.is_stopped_button_pressed = False
+        self.clear_arrows()
+        self.grille.init_grid()
+        self._lancer(self.grille.etapes_dijkstra_bidirectionnel(self.start, self.end))
+
+    def launch_a_star_bidirectionnel(self):
+        """
+        Lance A* bidirectionnel entre le départ et l'objectif.
+        """
+        self.is_stopped_button_pressed = False
+        self.clear_arrows()
+        self.grille.init_grid()
+        self._lancer(self.grille.etapes_a_star_bidirectionnel(self.start, self.end))
+
+    def launch_lpa_star(self):
+        """
+        Lance LPA* entre le départ et l'objectif, en réutilisant la recherche précédente si seuls des poids ont changé.
+        """
+        self.is_stopped_button_pressed = False
+        self.clear_arrows()
+        self.grille.init_grid()
+        self._lancer(self.grille.etapes_lpa_star(self.start, self.end))
+
+    def launch_hpa_star(self):
+        """
+        Lance HPA* entre le départ et l'objectif : recherche sur les clusters puis raffinement du chemin.
+        """
+        self.is_stopped_button_pressed = False
+        self.clear_arrows()
+        self.grille.init_grid()
+        self._lancer(self.grille.etapes_hpa_star(self.start, self.end))
+
+    def launch_a_star_reperes(self):
+        """
+        Lance A* avec l'heuristique des repères (ALT), les repères étant calculés à la première exécution.
+        """
+        self.is_stopped_button_pressed = False
+        self.clear_arrows()
+        self.grille.init_grid()
+        self._lancer(self.grille.etapes_a_star_reperes(self.start, self.end))
 
+    def launch_chemin_depuis_champ(self):
+        """
+        Affiche le plus court chemin en réutilisant l'arbre des distances du départ, calculé une fois par départ
+        tant que la grille n'est pas modifiée : changer seulement l'objectif ne relance aucune recherche.
+        """
+        self.is_stopped_button_pressed = False
+        self.clear_arrows()
+        self.grille.init_grid()
+        self._lancer(self.grille.etapes_chemin_depuis_champ(self.start, self.end))
 
     def launch_parcours_en_largeur(self):
         """
@@ -510,11 +624,7 @@ class App(Tk):
         self.is_stopped_button_pressed = False
         self.clear_arrows()
         self.grille.init_grid()
-        try:
-            chemins = self.grille.parcours_largeur(self.start, self.end)
-            self._display_results(chemins, self.start)
-        except NotConnectedGraphException as e:
-            self.alert_popup(e.message)
+        self._lancer(self.grille.etapes_largeur(self.start, self.end))
 
     def launch_parcours_en_profondeur(self):
         """
@@ -523,11 +633,7 @@ class App(Tk):
         self.is_stopped_button_pressed = False
         self.clear_arrows()
         self.grille.init_grid()
-        try:
-            chemins = self.grille.parcours_profondeur(self.start, self.end)
-            self._display_results(chemins, self.start)
-        except NotConnectedGraphException as e:
-            self.alert_popup(e.message)
+        self._lancer(self.grille.etapes_profondeur(self.start, self.end))
 
     def launch_allerAToire(self):
         """
@@ -536,11 +642,7 @@ class App(Tk):
         self.is_stopped_button_pressed = False
         self.clear_arrows()
         self.grille.init_grid()
-        try:
-            chemins = self.grille.allerAToire(self.start, self.end)
-            self._display_results(chemins, self.start)
-        except NotConnectedGraphException as e:
-            self.alert_popup(e.message)
+        self._lancer(self.grille.etapes_allerAToire(self.start, self.end))
 
     def launch_dijkstra(self):
         """
@@ -549,11 +651,16 @@ class App(Tk):
         self.is_stopped_button_pressed = False
         self.clear_arrows()
         self.grille.init_grid()
-        try:
-            chemins = self.grille.parcours_dijkstra(self.start, self.end)
-            self._display_results(chemins, self.start)
-        except NotConnectedGraphException as e:
-            self.alert_popup(e.message)
+        self._lancer(self.grille.etapes_dijkstra(self.start, self.end))
+
+    def launch_dial(self):
+        """
+        Lance la variante de Dijkstra à file de Dial pour trouver le chemin optimal entre le départ et l'objectif.
+        """
+        self.is_stopped_button_pressed = False
+        self.clear_arrows()
+        self.grille.init_grid()
+        self._lancer(self.grille.etapes_dial(self.start, self.end))
 
     def launch_bellman_ford(self):
         """
@@ -562,11 +669,7 @@ class App(Tk):
         self.is_stopped_button_pressed = False
         self.clear_arrows()
         self.grille.init_grid()
-        try:
-            chemins = self.grille.bellman_ford(self.start, self.end)
-            self._display_results(chemins, self.start)
-        except NotConnectedGraphException as e:
-            self.alert_popup(e.message)
+        self._lancer(self.grille.etapes_bellman_ford(self.start, self.end))
 
     def alert_popup(self, text):
         """
@@ -577,47 +680,96 @@ class App(Tk):
         """
         messagebox.showerror("Erreur d'exécution", text)
 
-    def _display_results(self, chemins, start):
+    def _lancer(self, etapes):
+        """
+        Calcule la trace d'une recherche dans un fil séparé pour que l'interface reste réactive.
+        Le bouton « Stopper l'exécution » déclenche son jeton d'annulation.
+
+        Args:
+            etapes (Iterator[Evenement]): Les événements de la recherche.
+        """
+        self.annulation.set()
+        self.annulation = Event()
+        resultat = {}
+        calcul = Thread(target=self._calculer, args=(self.grille.limiter(etapes, annulation=self.annulation), resultat),
+                        daemon=True)
+        calcul.start()
+        self.calcul = calcul
+        self.after(50, self._attendre_calcul, calcul, resultat)
+
+    def _calcul_en_cours(self) -> bool:
+        """
+        Indique si une recherche tourne encore sur la grille : ses poids ne doivent alors pas être modifiés.
+
+        Returns:
+            bool: True tant que le fil de calcul n'est pas terminé.
+        """
+        return self.calcul is not None and self.calcul.is_alive()
+
+    @staticmethod
+    def _calculer(etapes, resultat):
+        """
+        Consomme les événements d'une recherche, dans le fil de calcul.
+
+        Args:
+            etapes (Iterator[Evenement]): Les événements de la recherche.
+            resultat (dict): Reçoit la trace ("trace") ou l'exception levée ("erreur").
+        """
+        try:
+            resultat["trace"] = Grille.tracer(etapes)
+        except Exception as e:
+            resultat["erreur"] = e
+
+    def _attendre_calcul(self, calcul, resultat):
+        """
+        Attend la fin du calcul sans bloquer l'interface, puis affiche la trace ou l'erreur.
+
+        Args:
+            calcul (Thread): Le fil de calcul.
+            resultat (dict): Le résultat rempli par _calculer.
+        """
+        if calcul.is_alive():
+            self.after(50, self._attendre_calcul, calcul, resultat)
+        elif "erreur" in resultat:
+            self.alert_popup(str(resultat["erreur"]) or type(resultat["erreur"]).__name__)
+        elif resultat["trace"].statut != LIMITE_ANNULATION:
+            self._display_results(resultat["trace"])
+
+    def _display_results(self, trace):
         """
         Affiche les résultats d'un algorithme sous forme de flèches.
 
         Args:
-            chemins (list): La liste des chemins calculés par l'algorithme.
-            start (Sommet): Le sommet de départ.
+            trace (Trace): La trace compacte de la recherche (arêtes explorées et chemin, en cellules).
         """
-        self.chemins = chemins[:]
-        disp_queue = []
-        for sommet in chemins[0].keys():
-            for voisin in chemins[0][sommet]:
-                disp_queue.append((sommet, voisin))
-        self._progressive_display_all(disp_queue, chemins, start)
+        self.chemins = trace
+        self._progressive_display_all(trace, 0)
 
-    def _progressive_display_all(self, chemin: list[tuple], chemins, start):
+    def _progressive_display_all(self, trace, indice: int):
         """
-        Affiche progressivement les chemins entre les sommets.
+        Affiche progressivement les arêtes explorées, dans l'ordre de la trace.
 
         Args:
-            chemin (list[tuple]): La liste des arêtes à afficher.
-            chemins (dict): Dictionnaire des chemins.
-            start (Sommet): Le sommet de départ.
+            trace (Trace): La trace compacte de la recherche.
+            indice (int): L'indice de la prochaine arête à afficher.
         """
-        if len(chemin) > 0 and not self.is_stopped_button_pressed:
-            sommet, suivant = chemin.pop(0)
-            self.paint_path(sommet, suivant, "#757575")
-            self.after(int(self.speed.get()), self._progressive_display_all, chemin, chemins, start)
+        if indice < len(trace.enfants) and not self.is_stopped_button_pressed:
+            self.paint_path(self.grille.sommet(trace.parents[indice]), self.grille.sommet(trace.enfants[indice]),
+                            "#757575")
+            self.after(int(self.speed.get()), self._progressive_display_all, trace, indice + 1)
         else:
-            self._progressive_display_best(chemins[1], start)
+            self._progressive_display_best(trace.solution, 0)
 
-    def _progressive_display_best(self, chemin, sommet):
+    def _progressive_display_best(self, chemin, indice: int):
         """
         Affiche progressivement le meilleur chemin.
 
         Args:
-            chemin (dict): Le dictionnaire représentant le chemin optimal.
-            sommet (Sommet): Le sommet actuel.
+            chemin (array): Les cellules du chemin optimal, du départ à l'arrivée.
+            indice (int): L'indice de la cellule actuelle dans le chemin.
         """
-        if sommet in chemin.keys() and not self.is_stopped_button_pressed:
+        if indice + 1 < len(chemin) and not self.is_stopped_button_pressed:
+            sommet = self.grille.sommet(chemin[indice])
             self.sum_weight += sommet.weight
-            suivant = chemin[sommet]
-            self.paint_path(sommet, suivant, RED)
-            self.after(int(self.speed.get()), self._progressive_display_best, chemin, suivant)
\ No newline at end of file
+            self.paint_path(sommet, self.grille.sommet(chemin[indice + 1]), RED)
+            self.after(int(self.speed.get()), self._progressive_display_best, chemin, indice + 1)
\ No newline at end of file
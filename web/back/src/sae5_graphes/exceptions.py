@@ -7,3 +7,8 @@ class NotConnectedGraphException(Exception):
     def __init__(self):
         self.message = "Le Graphe est non connnexe"
         super().__init__(self.message)
+
+
+class DuplicateCancelTokenException(Exception):
+    def __init__(self):
+        super().__init__("Jeton d'annulation déjà utilisé par une recherche en cours")
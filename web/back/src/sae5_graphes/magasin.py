@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Condition, Lock
+from typing import Callable, Iterator
+
+
+class VerrouLectureEcriture:
+    """
+    Verrou lecteurs/rédacteur : plusieurs lectures simultanées, ou une seule écriture.
+    Un rédacteur en attente bloque les nouveaux lecteurs pour ne pas être affamé.
+    """
+
+    def __init__(self) -> None:
+        self._condition = Condition(Lock())
+        self._lecteurs: int = 0
+        self._redacteur: bool = False
+        self._redacteurs_en_attente: int = 0
+
+    @contextmanager
+    def lecture(self) -> Iterator[None]:
+        """
+        Tient le verrou en lecture le temps du bloc with.
+        """
+        with self._condition:
+            while self._redacteur or self._redacteurs_en_attente:
+                self._condition.wait()
+            self._lecteurs += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._lecteurs -= 1
+                if not self._lecteurs:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def ecriture(self) -> Iterator[None]:
+        """
+        Tient le verrou en écriture, seul, le temps du bloc with.
+        """
+        with self._condition:
+            self._redacteurs_en_attente += 1
+            while self._redacteur or self._lecteurs:
+                self._condition.wait()
+            self._redacteurs_en_attente -= 1
+            self._redacteur = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._redacteur = False
+                self._condition.notify_all()
+
+
+class MagasinGrilles:
+    """
+    Grilles indexées par identifiant de session, chacune avec son verrou lecteurs/rédacteur.
+    Au-delà de la capacité, la grille utilisée le moins récemment est oubliée.
+
+    Args:
+        fabrique (Callable[[], Grille]): Crée la grille d'une session inconnue.
+        capacite (int): Le nombre maximal de grilles gardées.
+    """
+
+    def __init__(self, fabrique: Callable[[], "Grille"], capacite: int = 64) -> None:
+        self.fabrique = fabrique
+        self.capacite = capacite
+        self._grilles: OrderedDict[str, tuple["Grille", VerrouLectureEcriture]] = OrderedDict()
+        self._verrou = Lock()
+
+    def __len__(self) -> int:
+        return len(self._grilles)
+
+    def obtenir(self, identifiant: str) -> tuple["Grille", VerrouLectureEcriture]:
+        """
+        Retourne la grille d'une session et son verrou, en la créant si besoin.
+
+        Args:
+            identifiant (str): L'identifiant de la session.
+
+        Returns:
+            tuple: Un tuple (grille, verrou).
+        """
+        with self._verrou:
+            if identifiant in self._grilles:
+                self._grilles.move_to_end(identifiant)
+                return self._grilles[identifiant]
+            return self._ranger(identifiant, self.fabrique())
+
+    def remplacer(self, identifiant: str, grille: "Grille") -> tuple["Grille", VerrouLectureEcriture]:
+        """
+        Associe une nouvelle grille à une session. Les requêtes en cours sur l'ancienne grille la gardent
+        jusqu'à leur fin.
+
+        Args:
+            identifiant (str): L'identifiant de la session.
+            grille (Grille): La nouvelle grille.
+
+        Returns:
+            tuple: Un tuple (grille, verrou).
+        """
+        with self._verrou:
+            return self._ranger(identifiant, grille)
+
+    def _ranger(self, identifiant: str, grille: "Grille") -> tuple["Grille", VerrouLectureEcriture]:
+        """
+        Range une grille avec un nouveau verrou et oublie les plus anciennes au-delà de la capacité.
+        L'appelant tient le verrou du magasin.
+        """
+        entree = (grille, VerrouLectureEcriture())
+        self._grilles[identifiant] = entree
+        self._grilles.move_to_end(identifiant)
+        while len(self._grilles) > self.capacite:
+            self._grilles.popitem(last=False)
+        return entree
@@ -1,31 +1,135 @@
+import mmap
+import os
+import struct
 import sys
-from typing import Union
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import count, groupby, repeat
+from heapq import heappop, heappush
+from typing import BinaryIO, Callable, Generator, Iterator, NamedTuple, Optional, Union
 from exceptions import *
 import random
 
+INFINI: int = sys.maxsize  # Distance d'une cellule non atteinte
+DIAL_POIDS_MAX: int = 1000  # Au-delà, la file à seaux de Dial laisse la place au tas binaire
+ARBRES_MAX: int = 8  # Nombre d'arbres de plus courts chemins gardés en cache par grille
+ALGORITHMES_LOT: tuple[str, ...] = ("bfs", "dijkstra", "dial", "a_star", "bidirectional_dijkstra", "bidirectional_a_star")
+LOT_MIN_PARALLELE: int = 32  # En dessous, un lot est traité dans le processus courant
+
+FICHIER_MAGIQUE: bytes = b"SAEG"  # Signature des fichiers de grille
+FICHIER_VERSION: int = 1  # Version du format de fichier
+FICHIER_ENTETE: struct.Struct = struct.Struct("<4sHHIIq")  # Signature, version, octets par poids, hauteur, largeur, mur
+
+POIDS_UINT16: str = "uint16"  # Poids bruts en entiers non signés 16 bits petit-boutistes
+POIDS_UINT32: str = "uint32"  # Poids bruts en entiers non signés 32 bits petit-boutistes
+POIDS_RLE: str = "rle"  # Plages (longueur, poids) en paires d'entiers non signés 32 bits petit-boutistes
+FORMATS_POIDS: dict[str, str] = {POIDS_UINT16: "H", POIDS_UINT32: "I", POIDS_RLE: "I"}  # Format -> type de array
+
+EXPANSION: str = "expand"  # Une cellule est visitée (fixée, ou atteinte pour la première fois selon l'algorithme)
+RELACHEMENT: str = "relax"  # La distance provisoire d'une cellule baisse
+TROUVE: str = "found"  # L'arrivée est atteinte, l'événement porte le chemin
+FIN: str = "done"  # Dernier événement d'une recherche
+INTERROMPU: str = "interrupted"  # Une limite a arrêté la recherche, l'événement porte la limite atteinte
+PREPARATION: str = "prepare"  # Un précalcul (composantes, repères) avance, les limites peuvent être vérifiées
+PREPARATION_LOT: int = 4096  # Nombre de cellules traitées par un précalcul entre deux événements PREPARATION
+
+LIMITE_EXPANSIONS: str = "max_expansions"  # Le nombre maximal d'expansions est atteint
+LIMITE_DELAI: str = "deadline"  # Le délai est écoulé
+LIMITE_ANNULATION: str = "cancelled"  # Le jeton d'annulation a été déclenché
+LIMITE_PAS: str = "max_steps"  # Aucun marcheur aléatoire n'est arrivé en pas_max pas
+
+
+class Evenement(NamedTuple):
+    """
+    Événement produit au fil de l'exploration par les générateurs etapes_* de Grille.
+
+    Attributes:
+        genre (str): EXPANSION, RELACHEMENT, TROUVE, INTERROMPU, PREPARATION ou FIN.
+        cellule (int): La cellule concernée, -1 pour FIN et PREPARATION.
+        parent (int): La cellule depuis laquelle elle est atteinte, -1 si aucune.
+        distance (int): La distance connue de la cellule, -1 si l'algorithme n'en calcule pas.
+        chemin (list[int] | None): Pour TROUVE, les cellules du chemin du départ à l'arrivée.
+        statut (str | None): Pour INTERROMPU, la limite atteinte.
+    """
+    genre: str
+    cellule: int = -1
+    parent: int = -1
+    distance: int = -1
+    chemin: Optional[list[int]] = None
+    statut: Optional[str] = None
+
+
+class Trace(NamedTuple):
+    """
+    Trace compacte d'une recherche : l'ordre d'exploration en deux tableaux parallèles d'entiers 32 bits et le
+    chemin en identifiants de cellules (x * hauteur + y).
+
+    Attributes:
+        parents (array): Pour chaque expansion, la cellule depuis laquelle la cellule est atteinte.
+        enfants (array): Pour chaque expansion, la cellule atteinte.
+        solution (array): Les cellules du chemin, du départ à l'arrivée, vide si la recherche a été interrompue.
+        statut (str): TROUVE, ou la limite qui a interrompu la recherche.
+    """
+    parents: array
+    enfants: array
+    solution: array
+    statut: str = TROUVE
+
 
 class Sommet:
     """
     Représente un sommet dans un graphe, avec un poids et des coordonnées dans un espace 2D.
 
+    Un sommet obtenu depuis une Grille n'est qu'une vue : son poids est lu et écrit directement
+    dans le tampon de poids de la grille.
+
     Attributes:
         weight (int): Le poids du sommet dans le graphe.
         x (int): La coordonnée en abscisse (ligne).
         y (int): La coordonnée en ordonnée (colonne).
         visited (bool): Indicateur si le sommet a été visité lors d'une recherche.
+        grille (Grille | None): La grille dont le sommet est une vue, None pour un sommet autonome.
 
     Args:
-        weight (int): Le poids du sommet.
+        weight (int): Le poids du sommet (ignoré pour une vue, qui lit le tampon de la grille).
         x (int): Coordonnée x (ligne).
         y (int): Coordonnée y (colonne).
+        grille (Grille | None): La grille dont le sommet est une vue.
     """
 
-    def __init__(self, weight: int, x: int, y: int) -> None:
-        self.weight: int = weight
+    def __init__(self, weight: int, x: int, y: int, grille: Optional["Grille"] = None) -> None:
         self.x: int = x  # La ligne
         self.y: int = y  # La colonne
+        self.grille: Optional[Grille] = grille
+        self._weight: int = weight
         self.visited = False
 
+    @property
+    def weight(self) -> int:
+        if self.grille is None:
+            return self._weight
+        return self.grille.weights[self.cellule]
+
+    @weight.setter
+    def weight(self, weight: int) -> None:
+        if self.grille is None:
+            self._weight = weight
+        else:
+            self.grille.set_weight(self.x, self.y, weight)
+
+    @property
+    def cellule(self) -> int:
+        """
+        Retourne l'identifiant entier de la cellule du sommet dans sa grille.
+
+        Returns:
+            int: L'indice de la cellule dans le tampon de poids (ordre ligne par ligne).
+        """
+        return self.x * self.grille.height + self.y
+
     def __eq__(self, other: object) -> bool:
         """
         Compare deux sommets pour savoir s'ils ont les mêmes coordonnées.
@@ -68,14 +172,108 @@ class Sommet:
         return f"({self.x}, {self.y})"
 
 
+@lru_cache(maxsize=4)
+def table_adjacence(height: int, width: int) -> tuple[array, array]:
+    """
+    Construit la table d'adjacence compressée (CSR) d'une grille hexagonale de dimensions données.
+    Les voisins de la cellule c sont voisins[offsets[c]:offsets[c + 1]]. La table ne dépend que des
+    dimensions : elle est construite une seule fois par taille de grille et partagée entre les grilles.
+
+    Args:
+        height (int): Hauteur de la grille.
+        width (int): Largeur de la grille.
+
+    Returns:
+        tuple: Un tuple (offsets, voisins) de tableaux d'entiers.
+    """
+    offsets = array("i", [0]) * (width * height + 1)
+    voisins = array("i")
+    ajouter = voisins.append
+    for x in range(width):
+        for y in range(height):
+            cellule = x * height + y
+            # Les colonnes impaires sont décalées vers le bas, les paires vers le haut.
+            ligne_angle = x + 1 if y % 2 else x - 1
+            if x > 0:
+                ajouter(cellule - height)
+            if 0 <= ligne_angle < width:
+                if y > 0:
+                    ajouter(ligne_angle * height + y - 1)
+                if y + 1 < height:
+                    ajouter(ligne_angle * height + y + 1)
+            if y > 0:
+                ajouter(cellule - 1)
+            if y + 1 < height:
+                ajouter(cellule + 1)
+            if x + 1 < width:
+                ajouter(cellule + height)
+            offsets[cellule + 1] = len(voisins)
+    return offsets, voisins
+
+
+class _VueLigne:
+    """
+    Vue sur une ligne de la grille, indexable comme une liste de sommets.
+
+    Args:
+        grille (Grille): La grille observée.
+        x (int): L'indice de la ligne.
+    """
+
+    def __init__(self, grille: "Grille", x: int) -> None:
+        self.grille = grille
+        self.x = x
+
+    def __len__(self) -> int:
+        return self.grille.height
+
+    def __getitem__(self, y: int) -> Sommet:
+        y = range(self.grille.height)[y]  # Lève IndexError comme une liste
+        return Sommet(0, self.x, y, self.grille)
+
+    def __iter__(self):
+        for y in range(self.grille.height):
+            yield Sommet(0, self.x, y, self.grille)
+
+
+class _VueTableau:
+    """
+    Vue 2D sur la grille, compatible avec l'ancien tableau `list[list[Sommet]]`.
+
+    Args:
+        grille (Grille): La grille observée.
+    """
+
+    def __init__(self, grille: "Grille") -> None:
+        self.grille = grille
+
+    def __len__(self) -> int:
+        return self.grille.width
+
+    def __getitem__(self, x: int) -> _VueLigne:
+        x = range(self.grille.width)[x]  # Lève IndexError comme une liste
+        return _VueLigne(self.grille, x)
+
+    def __iter__(self):
+        for x in range(self.grille.width):
+            yield _VueLigne(self.grille, x)
+
+
 class Grille:
     """
     Représente une grille de sommets organisés dans un tableau 2D, utilisée pour effectuer des algorithmes de recherche de chemin.
 
+    Les poids sont stockés dans un tampon contigu indexé par cellule (cellule = x * height + y).
+    Les algorithmes travaillent sur ces identifiants entiers, les objets Sommet ne sont créés qu'en entrée
+    et en sortie des méthodes publiques.
+
     Attributes:
         height (int): La hauteur de la grille (nombre de lignes).
         width (int): La largeur de la grille (nombre de colonnes).
-        tab (list[list[Sommet]]): Un tableau 2D contenant les sommets de la grille.
+        weights (array): Le poids de chaque cellule, en ordre ligne par ligne.
+        version (int): Compteur incrémenté à chaque changement de poids, pour invalider les précalculs.
+        generation (int): Numéro unique de la grille dans le processus, distinct pour chaque grille créée.
+        tab (_VueTableau): Une vue 2D sur les sommets de la grille, indexable par tab[x][y].
         WALL (int): Valeur représentant un mur dans la grille.
 
     Args:
@@ -83,323 +281,772 @@ class Grille:
         width (int): Largeur de la grille.
     """
 
+    _generations: Iterator[int] = count(1)  # Numérote les grilles créées
+
     def __init__(self, height: int, width: int) -> None:
         self.height: int = height
         self.width: int = width
         self.WALL: int = 10000  # Un très grand nombre représentant un mur.
-        self.tab: list[list[Sommet]] = \
-            [[Sommet(1, x, y) for y in range(height)] for x in range(width)]
+        self.weights: array = array("q", [1]) * (width * height)
+        self.tab: _VueTableau = _VueTableau(self)
+        self.generation: int = next(Grille._generations)
+        self.version: int = 0  # Incrémentée à chaque changement de poids
+        self._version_murs: int = 0  # Incrémentée à chaque ajout ou retrait de mur
+        self._compte_poids: dict[int, int] = {1: width * height}  # Nombre de cellules par poids
+        self._etiquettes: Optional[array] = None  # Étiquette de composante connexe de chaque cellule, -1 pour un mur
+        self._parents_composantes: list[int] = []  # Union-find sur les étiquettes
+        self._abonnes: list[Callable[[int], None]] = []  # Appelés avec la cellule à chaque changement de poids
+        self._planificateur: Optional[PlanificateurIncremental] = None
+        self._hierarchie: Optional[HierarchieClusters] = None
+        self._reperes: Optional[tuple[int, list[int], list[array]]] = None  # (version, repères, distances depuis chacun)
+        self._arbres: OrderedDict[tuple[int, int], tuple[array, array]] = OrderedDict()  # (version, départ) -> arbre
+        self._adjacence_sans_murs: Optional[tuple] = None
+
+    @property
+    def empreinte(self) -> tuple[int, int]:
+        """
+        Identifie l'état de la grille sans parcourir les poids : le couple (generation, version) change à chaque
+        changement de poids, et toute nouvelle grille (nouvelles dimensions, import) a sa propre génération.
+
+        Returns:
+            tuple[int, int]: Le couple (generation, version).
+        """
+        return self.generation, self.version
 
     def __str__(self) -> str:
         out: str = ""
-        for ligne in self.tab:
-            out += (" ".join(str(sommet.weight) for sommet in ligne)) + "\n"
+        for x in range(self.width):
+            debut = x * self.height
+            out += (" ".join(str(weight) for weight in self.weights[debut:debut + self.height])) + "\n"
         return out
 
+    def copie(self) -> "Grille":
+        """
+        Retourne une copie indépendante de la grille, avec les mêmes poids et la même version. L'index des
+        composantes et les tables de repères sont repris, les planificateurs LPA* et HPA* repartent de zéro.
+
+        Returns:
+            Grille: La copie.
+        """
+        copie = Grille(self.height, self.width)
+        copie.WALL = self.WALL
+        copie.weights = array("q", self.weights)
+        copie.version = self.version
+        copie._version_murs = self._version_murs
+        copie._compte_poids = dict(self._compte_poids)
+        if self._etiquettes is not None:
+            copie._etiquettes = array("i", self._etiquettes)
+            copie._parents_composantes = list(self._parents_composantes)
+        copie._reperes = self._reperes  # Tables jamais modifiées en place, remplacées à la version suivante
+        copie._arbres = OrderedDict(self._arbres)
+        copie._adjacence_sans_murs = self._adjacence_sans_murs
+        return copie
+
     def init_grid(self):
         """
-        Réinitialise la grille en marquant tous les sommets comme non visités.
-        Cette méthode permet de préparer la grille pour une nouvelle exécution d'algorithmes de recherche.
+        Réinitialise la grille pour une nouvelle exécution d'algorithmes de recherche.
+        L'état de visite est propre à chaque recherche, il n'y a donc plus rien à parcourir ici :
+        la méthode est conservée pour les interfaces qui l'appellent avant chaque algorithme.
         """
-        for i in range(len(self.tab)):
-            for j in range(len(self.tab[i])):
-                self.tab[i][j].visited = False
 
-    def get_neighbors(self, s: Sommet) -> set[Sommet]:
+    def cellule(self, x: int, y: int) -> int:
         """
-        Retourne les voisins d'un sommet donné.
+        Retourne l'identifiant de cellule correspondant à des coordonnées.
 
         Args:
-            s (Sommet): Le sommet pour lequel obtenir les voisins.
+            x (int): La ligne.
+            y (int): La colonne.
 
         Returns:
-            set[Sommet]: Un ensemble de voisins du sommet s.
+            int: L'indice de la cellule dans le tampon de poids.
         """
-        neighbors: set[Sommet] = set()
-        for i in range(s.x - 1, s.x + 2):
-            for j in range(s.y - 1, s.y + 2):
-                if 0 <= i < self.width and 0 <= j < self.height and (i != s.x or j != s.y):  # in Grille && !current
-                    if i != s.x and j != s.y:  # Une case angle
-                        if s.y % 2:  # Colone impaire
-                            if i == s.x + 1:
-                                neighbors.add(self.tab[i][j])
-                        else:  # Colone paire
-                            if i == s.x - 1:
-                                neighbors.add(self.tab[i][j])
-                    else:  # Une case coté direct
-                        neighbors.add(self.tab[i][j])
-
-        return neighbors
+        return x * self.height + y
 
-    def get_nbr_wall(self) -> int:
+    def sommet(self, cellule: int) -> Sommet:
         """
-        Calcule et retourne le nombre total de murs dans la grille.
+        Retourne la vue Sommet d'une cellule.
+
+        Args:
+            cellule (int): L'identifiant de la cellule.
 
         Returns:
-            int: Le nombre total de murs.
+            Sommet: Le sommet adossé à la grille.
         """
-        nbr_wall: int = 0
-        for ligne in self.tab:  # Parcourt chaque ligne (liste de sommets)
-            for sommet in ligne:  # Parcourt chaque sommet de la ligne
-                if sommet.weight == self.WALL:
-                    nbr_wall += 1
-        return nbr_wall
-    def parcours_profondeur(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        x, y = divmod(cellule, self.height)
+        return Sommet(0, x, y, self)
+
+    def set_weight(self, x: int, y: int, weight: int) -> None:
         """
-        Effectue un parcours en profondeur du graphe pour trouver un chemin entre le sommet de départ et d'arrivée.
-        Cette méthode parcourt récursivement le graphe et backtrack lorsqu'elle atteint une impasse.
+        Modifie le poids d'une cellule.
 
         Args:
-            start (Sommet): Le sommet de départ.
-            end (Sommet): Le sommet d'arrivée.
+            x (int): La ligne.
+            y (int): La colonne.
+            weight (int): Le nouveau poids.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("Coordonnées hors de la grille")
+        cellule = x * self.height + y
+        ancien = self.weights[cellule]
+        if ancien == weight:
+            return
+        self._compte_poids[ancien] -= 1
+        if not self._compte_poids[ancien]:
+            del self._compte_poids[ancien]
+        self._compte_poids[weight] = self._compte_poids.get(weight, 0) + 1
+        self.weights[cellule] = weight
+        self.version += 1
+        if (ancien == self.WALL) != (weight == self.WALL):
+            self._version_murs += 1
+            if self._etiquettes is not None:
+                self._maj_composantes(cellule, weight == self.WALL)
+        for abonne in self._abonnes:
+            abonne(cellule)
+
+    def modifier_poids(self, changements: list[tuple[int, int, int]] = (),
+                       rectangles: list[tuple[int, int, int, int, int]] = ()) -> int:
+        """
+        Applique un lot de modifications de poids : les rectangles sont remplis d'abord, puis les cellules
+        isolées sont modifiées. Chaque cellule passe par set_weight, qui tient à jour la version, les composantes
+        connexes et les abonnés ; au-delà d'un quart de la grille, les poids sont remplacés d'un bloc.
+        Tout le lot est vérifié avant la première modification.
+
+        Args:
+            changements (list[tuple[int, int, int]]): Des triplets (x, y, poids).
+            rectangles (list[tuple[int, int, int, int, int]]): Des quintuplets (x1, y1, x2, y2, poids),
+                coins inclus, remplis avec le poids.
 
         Returns:
-            tuple: Un tuple contenant deux dictionnaires :
-                - Le premier dictionnaire contient les sommets visités et leurs voisins.
-                - Le second dictionnaire contient les prédécesseurs pour chaque sommet sur le chemin.
+            int: Le nombre de cellules dont le poids a changé.
+
+        Raises:
+            IndexError: Si une coordonnée est hors de la grille.
+            BadWeightException: Si un poids est hors de [1, WALL].
+        """
+        for x, y, weight in changements:
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError("Coordonnées hors de la grille")
+            if not 1 <= weight <= self.WALL:
+                raise BadWeightException()
+        zones = []
+        for x1, y1, x2, y2, weight in rectangles:
+            if not (0 <= x1 < self.width and 0 <= x2 < self.width and 0 <= y1 < self.height and 0 <= y2 < self.height):
+                raise IndexError("Coordonnées hors de la grille")
+            if not 1 <= weight <= self.WALL:
+                raise BadWeightException()
+            zones.append((min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2), weight))
+
+        height = self.height
+        taille = len(changements) + sum((xmax - xmin + 1) * (ymax - ymin + 1) for xmin, xmax, ymin, ymax, _ in zones)
+        if taille > len(self.weights) // 4:
+            weights = array("q", self.weights)
+            for xmin, xmax, ymin, ymax, weight in zones:
+                bande = array("q", [weight]) * (ymax - ymin + 1)
+                for x in range(xmin, xmax + 1):
+                    weights[x * height + ymin:x * height + ymax + 1] = bande
+            for x, y, weight in changements:
+                weights[x * height + y] = weight
+            modifiees = sum(1 for ancien, nouveau in zip(self.weights, weights) if ancien != nouveau)
+            if modifiees:
+                self._remplacer_poids(weights)
+            return modifiees
+
+        version = self.version
+        for xmin, xmax, ymin, ymax, weight in zones:
+            for x in range(xmin, xmax + 1):
+                for y in range(ymin, ymax + 1):
+                    self.set_weight(x, y, weight)
+        for x, y, weight in changements:
+            self.set_weight(x, y, weight)
+        return self.version - version
+
+    def _remplacer_poids(self, weights: array) -> None:
         """
-        visited = {}
-        self.parcours_profondeur_recursive(start, end, visited)
+        Remplace tous les poids d'un coup et invalide les index et précalculs qui en dépendent.
 
-        if len(visited) != (self.height * self.width) - self.get_nbr_wall() and end not in visited:
-            raise NotConnectedGraphException()
+        Args:
+            weights (array): Les nouveaux poids, dans l'ordre des cellules.
+        """
+        if len(weights) != len(self.weights):
+            raise ValueError("Le nombre de poids ne correspond pas à la taille de la grille")
+        self.weights[:] = weights
+        self._compte_poids = dict(Counter(self.weights))
+        self.version += 1
+        self._version_murs += 1
+        self._etiquettes = None
+        self._parents_composantes = []
+        self._abonnes.clear()
+        self._planificateur = None
+        self._hierarchie = None
+
+    def poids_en_octets(self, format: str) -> bytes:
+        """
+        Encode les poids dans l'ordre des cellules (colonne par colonne, comme le tableau JSON) dans un format
+        compact : entiers bruts (POIDS_UINT16, POIDS_UINT32) ou plages de poids identiques (POIDS_RLE).
 
-        solution: dict[Sommet, Sommet] = {}
-        courant = end
-        antecedent = None
+        Args:
+            format (str): L'un des formats de FORMATS_POIDS.
 
-        while courant != start:
-            for sommet in visited:
-                if courant in visited[sommet]:
-                    antecedent = courant
-                    courant = sommet
-            solution[courant] = antecedent
-        return visited, solution
+        Returns:
+            bytes: Les poids encodés, petit-boutistes.
 
-    def parcours_profondeur_recursive(self, s: Sommet, end: Sommet, visited: dict[Sommet, set[Sommet]], ):
+        Raises:
+            ValueError: Si le format est inconnu ou ne peut pas représenter un des poids.
         """
-        Méthode récursive pour le parcours en profondeur.
+        if format not in FORMATS_POIDS:
+            raise ValueError(f"Format de poids inconnu : {format}")
+        typecode = FORMATS_POIDS[format]
+        if min(self.weights) < 0 or max(self.weights) >= 1 << (8 * array(typecode).itemsize):
+            raise ValueError(f"Un poids de la grille dépasse le format {format}")
+        if format == POIDS_RLE:
+            paquet = array(typecode)
+            for weight, plage in groupby(self.weights):
+                paquet.append(sum(1 for _ in plage))
+                paquet.append(weight)
+        else:
+            paquet = array(typecode, self.weights)
+        if sys.byteorder != "little":
+            paquet.byteswap()
+        return paquet.tobytes()
+
+    def poids_depuis_octets(self, donnees, format: str) -> int:
+        """
+        Remplace tous les poids par ceux encodés avec poids_en_octets. Les poids sont vérifiés d'un bloc
+        (entre 1 et WALL) avant d'être écrits.
 
         Args:
-            s (Sommet): Le sommet actuellement exploré.
-            end (Sommet): Le sommet de fin.
-            visited (dict): Dictionnaire des sommets visités et leurs voisins.
+            donnees (bytes): Les poids encodés.
+            format (str): L'un des formats de FORMATS_POIDS.
 
         Returns:
-            bool: Retourne True si un chemin vers le sommet d'arrivée a été trouvé, sinon False.
+            int: Le nombre de cellules dont le poids a changé.
+
+        Raises:
+            ValueError: Si le format est inconnu ou si les données ne correspondent pas à la taille de la grille.
+            BadWeightException: Si un poids est hors de [1, WALL].
         """
-        s.visited = True
-        if s not in visited:
-            visited[s] = set()
+        if format not in FORMATS_POIDS:
+            raise ValueError(f"Format de poids inconnu : {format}")
+        paquet = array(FORMATS_POIDS[format])
+        if len(donnees) % paquet.itemsize:
+            raise ValueError("Données de poids tronquées")
+        paquet.frombytes(donnees)
+        if sys.byteorder != "little":
+            paquet.byteswap()
+
+        if format == POIDS_RLE:
+            if len(paquet) % 2:
+                raise ValueError("Données de poids tronquées")
+            longueurs, valeurs = paquet[0::2], paquet[1::2]
+            if sum(longueurs) != len(self.weights):
+                raise ValueError("Le nombre de poids ne correspond pas à la taille de la grille")
+            weights = array("q")
+            for longueur, weight in zip(longueurs, valeurs):
+                weights += array("q", [weight]) * longueur
+        else:
+            weights = array("q", paquet)
+        return self.remplacer_poids(weights)
+
+    def remplacer_poids(self, weights: array) -> int:
+        """
+        Remplace tous les poids, après les avoir vérifiés d'un bloc (entre 1 et WALL). Comme pour modifier_poids,
+        les cellules changées passent par set_weight (composantes, LPA* et HPA* mis à jour incrémentalement) ;
+        au-delà d'un quart de la grille, les poids sont remplacés d'un bloc et les précalculs invalidés.
 
-        for neighbor in self.get_neighbors(s):
-            if not neighbor.visited and neighbor.weight != self.WALL:
-                visited[s].add(neighbor)
-                if self.parcours_profondeur_recursive(neighbor, end, visited):
-                    return True
-        return False
+        Args:
+            weights (array): Les nouveaux poids, dans l'ordre des cellules.
 
-    def parcours_dijkstra(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        Returns:
+            int: Le nombre de cellules dont le poids a changé.
+
+        Raises:
+            ValueError: Si le nombre de poids ne correspond pas à la taille de la grille.
+            BadWeightException: Si un poids est hors de [1, WALL].
         """
-        Implémente l'algorithme de Dijkstra pour trouver le chemin le plus court entre deux sommets.
+        if len(weights) != len(self.weights):
+            raise ValueError("Le nombre de poids ne correspond pas à la taille de la grille")
+        if min(weights) < 1 or max(weights) > self.WALL:
+            raise BadWeightException()
+        if weights == self.weights:
+            return 0
+        modifiees = [cellule for cellule, (ancien, nouveau) in enumerate(zip(self.weights, weights))
+                     if ancien != nouveau]
+        if len(modifiees) > len(self.weights) // 4:
+            self._remplacer_poids(weights)
+        else:
+            for cellule in modifiees:
+                self.set_weight(*divmod(cellule, self.height), weights[cellule])
+        return len(modifiees)
+
+    def save(self, fichier: Union[str, os.PathLike, BinaryIO]) -> None:
+        """
+        Enregistre la grille au format binaire : un en-tête (signature, version du format, dimensions, valeur
+        des murs) suivi des poids bruts en entiers 64 bits petit-boutistes, dans l'ordre des cellules.
 
         Args:
-            start (Sommet): Le sommet de départ.
-            end (Sommet): Le sommet d'arrivée.
+            fichier (str | PathLike | BinaryIO): Le chemin du fichier, ou un fichier binaire ouvert en écriture.
+        """
+        if isinstance(fichier, (str, os.PathLike)):
+            with open(fichier, "wb") as sortie:
+                self.save(sortie)
+            return
+        fichier.write(FICHIER_ENTETE.pack(FICHIER_MAGIQUE, FICHIER_VERSION, self.weights.itemsize,
+                                          self.height, self.width, self.WALL))
+        if sys.byteorder == "little":
+            fichier.write(memoryview(self.weights))
+        else:
+            weights = array("q", self.weights)
+            weights.byteswap()
+            fichier.write(memoryview(weights))
+
+    @classmethod
+    def load(cls, chemin: Union[str, os.PathLike]) -> "Grille":
+        """
+        Ouvre une grille enregistrée par save. Le fichier est projeté en mémoire avec mmap et les poids sont
+        copiés d'un bloc dans le tampon de la grille, sans analyse.
+
+        Args:
+            chemin (str | PathLike): Le chemin du fichier.
 
         Returns:
-            tuple: Un tuple contenant deux dictionnaires :
-                - Le premier dictionnaire contient tous les résultats intermédiaires des sommets visités.
-                - Le second dictionnaire contient le chemin le plus court du sommet de départ au sommet d'arrivée.
+            Grille: La grille lue.
+
+        Raises:
+            ValueError: Si le fichier n'est pas une grille valide.
         """
-        queue: list[tuple[Sommet, int, Union[Sommet, None]]] = [(start, 0, start)]
-        visited: list[tuple[Sommet, int, Union[Sommet, None]]] = []
-
-        while len(queue) > 0:
-            current: tuple[Sommet, int, Sommet] = queue.pop(0)
-            visited.append(current)
-            current[0].visited = True
-            for neighbor in self.get_neighbors(current[0]):
-                if not neighbor.visited and neighbor.weight != self.WALL:
-                    is_in_queue = False
-                    for t in queue:
-                        if t[0] == neighbor:
-                            is_in_queue = True
-                            if current[1] + neighbor.weight < t[1]:
-                                queue.remove(t)
-                                queue.append((neighbor, current[1] + neighbor.weight, current[0]))
-                    if not is_in_queue:
-                        queue.append((neighbor, current[1] + neighbor.weight, current[0]))
-
-                queue.sort(key=lambda t: t[1])
-
-        dico_all_result = self.get_all_result_dict(visited)
-
-        back: list[tuple[Sommet, int, Sommet]] = []
-        found_end = False
-        for t in visited:
-            if t[0].x == end.x and t[0].y == end.y:
-                back.append(t)
-                visited.remove(t)
-                found_end = True
-
-        if not found_end:
-            raise NotConnectedGraphException()
+        with open(chemin, "rb") as fichier:
+            if os.fstat(fichier.fileno()).st_size < FICHIER_ENTETE.size:
+                raise ValueError("Fichier de grille invalide : en-tête incomplet")
+            with mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as projection:
+                return cls.depuis_octets(projection)
+
+    @classmethod
+    def depuis_octets(cls, donnees) -> "Grille":
+        """
+        Construit une grille depuis le contenu d'un fichier de grille.
 
-        while back[-1][0].x != start.x or back[-1][0].y != start.y:
-            for t in visited:
-                if t[0].x == back[-1][2].x and t[0].y == back[-1][2].y:
-                    back.append(t)
-                    visited.remove(t)
+        Args:
+            donnees (bytes | mmap): Le contenu du fichier, en-tête compris.
 
-        result: list[Sommet] = []
-        for i in range(len(back) - 1, -1, -1):
-            result.append(back[i][0])
+        Returns:
+            Grille: La grille lue. Les murs du fichier prennent la valeur de mur de cette grille.
 
-        dico_result: dict[Sommet, Sommet] = dict()
-        for i in range(len(result)-1):
-            dico_result[result[i]] = result[i+1]
+        Raises:
+            ValueError: Si les données ne sont pas une grille valide ou si un poids est hors de [1, WALL].
+        """
+        with memoryview(donnees) as vue:
+            if len(vue) < FICHIER_ENTETE.size:
+                raise ValueError("Fichier de grille invalide : en-tête incomplet")
+            magique, version, taille_poids, height, width, wall = FICHIER_ENTETE.unpack_from(vue)
+            if magique != FICHIER_MAGIQUE:
+                raise ValueError("Fichier de grille invalide : signature inconnue")
+            if version != FICHIER_VERSION or taille_poids != 8:
+                raise ValueError(f"Version de fichier de grille non prise en charge : {version}")
+            if height < 1 or width < 1 or len(vue) != FICHIER_ENTETE.size + height * width * taille_poids:
+                raise ValueError("Fichier de grille invalide : taille incohérente avec les dimensions")
+            weights = array("q")
+            weights.frombytes(vue[FICHIER_ENTETE.size:])
+        if sys.byteorder != "little":
+            weights.byteswap()
+
+        grille = cls(height, width)
+        if wall != grille.WALL:
+            for cellule, weight in enumerate(weights):
+                if weight == wall:
+                    weights[cellule] = grille.WALL
+        if min(weights) < 1 or max(weights) > grille.WALL:
+            raise ValueError(f"Fichier de grille invalide : poids hors de [1, {grille.WALL}]")
+        grille._remplacer_poids(weights)
+        return grille
+
+    def poids_extremes(self) -> tuple[int, int]:
+        """
+        Retourne le plus petit et le plus grand poids hors murs présents dans la grille.
 
-        return dico_all_result, dico_result
+        Returns:
+            tuple: Un tuple (poids minimum, poids maximum), (1, 1) si la grille ne contient que des murs.
+        """
+        poids = [weight for weight in self._compte_poids if weight != self.WALL]
+        if not poids:
+            return 1, 1
+        return min(poids), max(poids)
 
-    @staticmethod
-    def get_all_result_dict(visited: list[tuple[Sommet, int, Union[Sommet, None]]]) -> dict[Sommet, set[Sommet]]:
+    def adjacence(self, sans_murs: bool = False) -> tuple[array, array]:
         """
-        Génère un dictionnaire des résultats de tous les sommets visités, associant chaque sommet à ses voisins.
+        Retourne la table d'adjacence compressée de la grille.
 
         Args:
-            visited (list): Liste des tuples contenant le sommet, la distance et son prédécesseur.
+            sans_murs (bool): Si True, retourne une variante où les murs n'ont ni voisins ni arêtes entrantes.
+                Elle est filtrée d'un bloc avec NumPy depuis la table partagée, et refiltrée après chaque ajout
+                ou retrait de mur.
 
         Returns:
-            dict: Un dictionnaire où chaque clé est un sommet et chaque valeur est un ensemble de ses voisins.
+            tuple: Un tuple (offsets, voisins), les voisins de c étant voisins[offsets[c]:offsets[c + 1]].
         """
-        result: dict[Sommet, set[Sommet]] = {}
-        for t in visited:
-            if t[0] != t[2]:
+        offsets, voisins = table_adjacence(self.height, self.width)
+        if not sans_murs:
+            return offsets, voisins
+
+        cle = (self.height, self.width, self._version_murs)
+        if self._adjacence_sans_murs is None or self._adjacence_sans_murs[0] != cle:
+            import numpy as np
+
+            nbr_cellules = len(offsets) - 1
+            debuts = np.frombuffer(offsets, dtype=np.int32)
+            arrivees = np.frombuffer(voisins, dtype=np.int32)
+            libres = np.frombuffer(self.weights, dtype=np.int64) != self.WALL
+            sources = np.repeat(np.arange(nbr_cellules, dtype=np.int32), np.diff(debuts))
+            gardees = libres[sources] & libres[arrivees]
+            offsets_filtres = array("i", [0])
+            offsets_filtres.frombytes(np.cumsum(np.bincount(sources[gardees], minlength=nbr_cellules),
+                                                dtype=np.int32).tobytes())
+            voisins_filtres = array("i")
+            voisins_filtres.frombytes(arrivees[gardees].tobytes())
+            self._adjacence_sans_murs = (cle, (offsets_filtres, voisins_filtres))
+        return self._adjacence_sans_murs[1]
+
+    def _anneau(self, cellule: int) -> list[int]:
+        """
+        Retourne les six positions voisines d'une cellule dans l'ordre circulaire autour de l'hexagone.
+        Deux positions consécutives de l'anneau sont voisines entre elles.
 
-                if t[2] in result.keys():
-                    result[t[2]].add(t[0])
-                else:
-                    result[t[2]] = {t[0]}
-        return result
+        Args:
+            cellule (int): L'identifiant de la cellule.
 
-    def parcours_largeur(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        Returns:
+            list[int]: Les six cellules voisines, -1 pour une position hors de la grille.
         """
-        Implémente l'algorithme de parcours en largeur pour trouver le chemin le plus court entre deux sommets.
+        x, y = divmod(cellule, self.height)
+        if y % 2:  # Colone impaire
+            positions = ((x - 1, y), (x, y + 1), (x + 1, y + 1), (x + 1, y), (x + 1, y - 1), (x, y - 1))
+        else:  # Colone paire
+            positions = ((x - 1, y), (x - 1, y + 1), (x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y - 1))
+        return [i * self.height + j if 0 <= i < self.width and 0 <= j < self.height else -1 for i, j in positions]
+
+    def _racine(self, etiquette: int) -> int:
+        """
+        Retourne le représentant d'une étiquette de composante dans l'union-find (avec compression de chemin).
 
         Args:
-            start (Sommet): Le sommet de départ.
-            end (Sommet): Le sommet d'arrivée.
+            etiquette (int): L'étiquette brute d'une cellule.
 
         Returns:
-            tuple: Un tuple contenant deux dictionnaires :
-                - Le premier dictionnaire contient les sommets visités et leurs voisins atteignables.
-                - Le second dictionnaire contient les prédécesseurs pour chaque sommet sur le chemin.
+            int: L'étiquette représentante de sa composante.
+        """
+        parents = self._parents_composantes
+        while parents[etiquette] != etiquette:
+            parents[etiquette] = parents[parents[etiquette]]
+            etiquette = parents[etiquette]
+        return etiquette
+
+    def _construire_composantes(self) -> None:
+        """
+        Exécute _etapes_composantes jusqu'au bout.
+        """
+        self._executer(self._etapes_composantes())
+
+    def _etapes_composantes(self) -> Generator[Evenement, None, None]:
+        """
+        Étiquette toutes les composantes connexes de cellules hors murs.
+        L'index n'est publié qu'une fois complet, des lecteurs concurrents ne voient donc jamais un index partiel,
+        et une recherche interrompue pendant la construction ne laisse rien derrière elle.
+
+        Yields:
+            Evenement: Un événement PREPARATION toutes les PREPARATION_LOT cellules étiquetées.
         """
-        queue: list[tuple[Sommet, int, Union[Sommet, None]]] = [(start, 0, start)]
-        visited: list[tuple[Sommet, int, Union[Sommet, None]]] = []
-        is_end_reached = False
-        while len(queue) > 0 and not is_end_reached:
-            current: tuple[Sommet, int, Sommet] = queue.pop(0)
-            if current[0].x == end.x and current[0].y == end.y:
-                is_end_reached = True
-                visited.append(current)
-                current[0].visited = True
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+        etiquettes = array("i", [-1]) * (self.width * self.height)
+        parents: list[int] = []
+        compte = 0
+        for cellule in range(self.width * self.height):
+            if etiquettes[cellule] != -1 or weights[cellule] == wall:
+                continue
+            etiquette = len(parents)
+            parents.append(etiquette)
+            etiquettes[cellule] = etiquette
+            pile = [cellule]
+            while pile:
+                courant = pile.pop()
+                compte += 1
+                if compte % PREPARATION_LOT == 0:
+                    yield Evenement(PREPARATION)
+                for i in range(offsets[courant], offsets[courant + 1]):
+                    voisin = voisins[i]
+                    if etiquettes[voisin] == -1 and weights[voisin] != wall:
+                        etiquettes[voisin] = etiquette
+                        pile.append(voisin)
+        self._parents_composantes = parents
+        self._etiquettes = etiquettes
+
+    def _maj_composantes(self, cellule: int, devient_mur: bool) -> None:
+        """
+        Met à jour les composantes connexes après qu'une cellule est devenue un mur ou a cessé d'en être un.
+
+        Un mur retiré fusionne les composantes de ses voisins (union-find). Un mur ajouté ne peut séparer
+        sa composante que si ses voisins libres forment plusieurs arcs disjoints autour de l'hexagone :
+        les arcs sont alors explorés en parallèle (_separer_arcs) et seule une partie détachée est ré-étiquetée.
+
+        Args:
+            cellule (int): La cellule modifiée.
+            devient_mur (bool): True si la cellule est devenue un mur.
+        """
+        etiquettes = self._etiquettes
+        parents = self._parents_composantes
+        anneau = self._anneau(cellule)
+        libres = [voisin != -1 and self.weights[voisin] != self.WALL for voisin in anneau]
+
+        if not devient_mur:
+            racines = {self._racine(etiquettes[voisin]) for voisin, libre in zip(anneau, libres) if libre}
+            if racines:
+                etiquette = racines.pop()
+                for racine in racines:
+                    parents[racine] = etiquette
             else:
-                visited.append(current)
-                current[0].visited = True
-                for neighbor in self.get_neighbors(current[0]):
-                    if not neighbor.visited and neighbor.weight != self.WALL:
-                        is_in_queue = False
-                        for t in queue:
-                            if t[0] == neighbor:
-                                is_in_queue = True
-                        if not is_in_queue:
-                            queue.append((neighbor, current[1] + neighbor.weight, current[0]))
-
-        dico_all_result = self.get_all_result_dict(visited)
-
-        back: list[tuple[Sommet, int, Sommet]] = []
-        found_end = False
-        for t in visited:
-            if t[0].x == end.x and t[0].y == end.y:
-                back.append(t)
-                visited.remove(t)
-                found_end = True
-
-        if not found_end:
+                etiquette = len(parents)
+                parents.append(etiquette)
+            etiquettes[cellule] = etiquette
+            return
+
+        etiquettes[cellule] = -1
+        debuts_arcs = [anneau[i] for i in range(6) if libres[i] and not libres[i - 1]]
+        if len(debuts_arcs) < 2:
+            return
+        self._separer_arcs(debuts_arcs)
+
+    def _separer_arcs(self, debuts_arcs: list[int]) -> None:
+        """
+        Après l'ajout d'un mur, explore en parallèle depuis chaque arc de voisins libres, une cellule par front
+        et par tour. Deux fronts qui se rencontrent fusionnent ; dès qu'il n'en reste qu'un, la composante n'est
+        pas coupée et l'exploration s'arrête. Un front épuisé seul est une partie détachée : seules ses cellules
+        reçoivent une nouvelle étiquette, la plus grande partie garde la sienne.
+
+        Args:
+            debuts_arcs (list[int]): Une cellule libre de chaque arc autour du nouveau mur.
+        """
+        etiquettes = self._etiquettes
+        parents = self._parents_composantes
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+
+        proprietaire = {debut: front for front, debut in enumerate(debuts_arcs)}  # Cellule -> front qui l'a atteinte
+        groupes = list(range(len(debuts_arcs)))  # Union-find des fronts qui se sont rencontrés
+        fronts = {front: (deque([debut]), [debut]) for front, debut in enumerate(debuts_arcs)}  # (file, cellules)
+
+        def groupe(front):
+            while groupes[front] != front:
+                front = groupes[front]
+            return front
+
+        while len(fronts) > 1:
+            for front in list(fronts):
+                if front not in fronts:
+                    continue
+                file, cellules = fronts[front]
+                if not file:
+                    etiquette = len(parents)
+                    parents.append(etiquette)
+                    for membre in cellules:
+                        etiquettes[membre] = etiquette
+                    del fronts[front]
+                    if len(fronts) == 1:
+                        return
+                    continue
+                courant = file.popleft()
+                for i in range(offsets[courant], offsets[courant + 1]):
+                    voisin = voisins[i]
+                    if weights[voisin] == wall:
+                        continue
+                    autre = proprietaire.get(voisin)
+                    if autre is None:
+                        proprietaire[voisin] = front
+                        file.append(voisin)
+                        cellules.append(voisin)
+                    elif groupe(autre) != front:
+                        autre = groupe(autre)
+                        file_autre, cellules_autre = fronts.pop(autre)
+                        file.extend(file_autre)
+                        cellules.extend(cellules_autre)
+                        groupes[autre] = front
+                        if len(fronts) == 1:
+                            return
+
+    def composante(self, cellule: int) -> int:
+        """
+        Retourne l'identifiant de la composante connexe d'une cellule.
+        L'index est construit au premier appel puis tenu à jour par set_weight.
+
+        Args:
+            cellule (int): L'identifiant de la cellule.
+
+        Returns:
+            int: L'identifiant de la composante, -1 pour un mur.
+        """
+        if self._etiquettes is None:
+            self._construire_composantes()
+        etiquette = self._etiquettes[cellule]
+        return -1 if etiquette == -1 else self._racine(etiquette)
+
+    def sont_connectees(self, a: int, b: int) -> bool:
+        """
+        Indique si deux cellules sont reliées par un chemin sans mur.
+
+        Args:
+            a (int): La première cellule.
+            b (int): La seconde cellule.
+
+        Returns:
+            bool: True si les deux cellules appartiennent à la même composante connexe.
+        """
+        composante = self.composante(a)
+        return composante != -1 and composante == self.composante(b)
+
+    def etiquettes_composantes(self) -> list[list[int]]:
+        """
+        Retourne l'étiquette de composante connexe de chaque cellule, numérotées de 0 au nombre de composantes.
+
+        Returns:
+            list[list[int]]: Un tableau 2D indexé comme tab, -1 pour les murs.
+        """
+        numeros: dict[int, int] = {-1: -1}
+        etiquettes = []
+        for x in range(self.width):
+            ligne = []
+            for y in range(self.height):
+                composante = self.composante(x * self.height + y)
+                if composante not in numeros:
+                    numeros[composante] = len(numeros) - 1
+                ligne.append(numeros[composante])
+            etiquettes.append(ligne)
+        return etiquettes
+
+    def _verifier_connexite(self, depart: int, arrivee: int) -> None:
+        """
+        Lève NotConnectedGraphException avant toute recherche si l'arrivée est inatteignable depuis le départ.
+
+        Args:
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée.
+        """
+        if not self.sont_connectees(depart, arrivee):
             raise NotConnectedGraphException()
 
-        while back[-1][0].x != start.x or back[-1][0].y != start.y:
-            for t in visited:
-                if t[0].x == back[-1][2].x and t[0].y == back[-1][2].y:
-                    back.append(t)
-                    visited.remove(t)
+    def get_neighbors(self, s: Sommet) -> set[Sommet]:
+        """
+        Retourne les voisins d'un sommet donné.
+
+        Args:
+            s (Sommet): Le sommet pour lequel obtenir les voisins.
 
-        result: list[Sommet] = []
-        for i in range(len(back) - 1, -1, -1):
-            result.append(back[i][0])
+        Returns:
+            set[Sommet]: Un ensemble de voisins du sommet s.
+        """
+        offsets, voisins = self.adjacence()
+        cellule = self.cellule(s.x, s.y)
+        return {self.sommet(voisin) for voisin in voisins[offsets[cellule]:offsets[cellule + 1]]}
 
-        dico_result: dict[Sommet, Sommet] = dict()
-        for i in range(len(result) - 1):
-            dico_result[result[i]] = result[i + 1]
+    def get_nbr_wall(self) -> int:
+        """
+        Calcule et retourne le nombre total de murs dans la grille.
 
-        return dico_all_result, dico_result
+        Returns:
+            int: Le nombre total de murs.
+        """
+        return self._compte_poids.get(self.WALL, 0)
 
-    def allerAToire(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+    def _vers_sommets(self, visited: dict[int, set[int]]) -> dict[Sommet, set[Sommet]]:
         """
-        Effectue un parcours aléatoire de la grille de start à end, en choisissant des voisins au hasard.
+        Convertit un dictionnaire de cellules visitées en dictionnaire de sommets.
 
         Args:
-            start (Sommet): Le sommet de départ.
-            end (Sommet): Le sommet d'arrivée.
+            visited (dict): Les cellules visitées et leurs voisins.
 
         Returns:
-            tuple: Un tuple contenant :
-                - Le premier dictionnaire contient les sommets et leurs voisins atteignables.
-                - Le second dictionnaire contient les prédécesseurs pour reconstruire le chemin parcouru.
+            dict: Les mêmes données exprimées en sommets.
         """
-        queue: list[Sommet] = [start]
-        reachable: dict[Sommet, set[Sommet]] = {start: set()}
-        path: dict[Sommet, Sommet] = dict()
-        visited: set[Sommet] = set()
-        known: set[Sommet] = set()
-        end_reached: bool = False
+        return {self.sommet(k): {self.sommet(v) for v in vs} for k, vs in visited.items()}
 
-        while queue and not end_reached:
-            current = queue.pop()
-            visited.add(current)
-            known = known.union(set(self.get_neighbors(current)))
+    def _solution_vers_sommets(self, solution: dict[int, int]) -> dict[Sommet, Sommet]:
+        """
+        Convertit un dictionnaire prédécesseur -> successeur de cellules en dictionnaire de sommets.
 
-            neighbors = self.get_neighbors(current)
+        Args:
+            solution (dict): Le chemin exprimé en cellules.
 
-            all_walls: bool = True
-            for s in known-visited:
-                if s.weight != self.WALL:
-                    all_walls = False
-            if all_walls:
-                raise NotConnectedGraphException()
+        Returns:
+            dict: Le même chemin exprimé en sommets.
+        """
+        return {self.sommet(k): self.sommet(v) for k, v in solution.items()}
+
+    def _profondeur(self, depart: int, arrivee: int = -1) -> tuple[array, list[int]]:
+        """
+        Exécute _etapes_profondeur jusqu'au bout.
+
+        Returns:
+            tuple: Un tuple (predecesseurs, ordre).
+        """
+        return self._executer(self._etapes_profondeur(depart, arrivee))
 
-            if neighbors:
-                not_walls = [neighbor for neighbor in neighbors if neighbor.weight != self.WALL]
-                if not_walls:
-                    neighbor = random.choice(not_walls)
-                    queue.append(neighbor)
-                    if current in reachable.keys():
-                        reachable[current].add(neighbor)
-                    else:
-                        reachable[current] = {neighbor}
-                    path[current] = neighbor
+    def _etapes_profondeur(self, depart: int, arrivee: int = -1) -> Generator[Evenement, None, tuple[array, list[int]]]:
+        """
+        Coeur du parcours en profondeur, avec une pile explicite plutôt que la récursion.
+        Chaque niveau de pile retient l'indice du prochain voisin à examiner dans la table d'adjacence,
+        ce qui reproduit exactement l'ordre de la version récursive sans consommer de frames Python.
 
-                    if neighbor.x == end.x and neighbor.y == end.y:
-                        end_reached = True
+        Args:
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée, la recherche s'arrête dès qu'elle est atteinte (-1 pour tout explorer).
 
-        return reachable, path
+        Yields:
+            Evenement: Un événement EXPANSION par cellule visitée.
 
-    def bellman_ford(self, start: Sommet, end: Sommet) -> tuple[
-        dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        Returns:
+            tuple: Un tuple (predecesseurs, ordre) où ordre liste les cellules dans l'ordre de leur visite.
         """
-        Implémente l'algorithme de Bellman-Ford pour déterminer les chemins les plus courts à partir d'un sommet source.
+        nbr_cellules = self.width * self.height
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+        predecesseurs = array("i", [-1]) * nbr_cellules
+        vus = bytearray(nbr_cellules)
+        ordre: list[int] = [depart]
+
+        vus[depart] = 1
+        yield Evenement(EXPANSION, depart)
+        if depart == arrivee:
+            return predecesseurs, ordre
+        pile: list[int] = [depart]
+        indices: list[int] = [offsets[depart]]
+        while pile:
+            courant = pile[-1]
+            i = indices[-1]
+            fin = offsets[courant + 1]
+            while i < fin:
+                voisin = voisins[i]
+                i += 1
+                if not vus[voisin] and weights[voisin] != wall:
+                    break
+            else:  # Plus aucun voisin à explorer : on remonte
+                pile.pop()
+                indices.pop()
+                continue
+            indices[-1] = i
+            vus[voisin] = 1
+            predecesseurs[voisin] = courant
+            ordre.append(voisin)
+            yield Evenement(EXPANSION, voisin, courant)
+            if voisin == arrivee:
+                break
+            pile.append(voisin)
+            indices.append(offsets[voisin])
+        return predecesseurs, ordre
+
+    def parcours_profondeur(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Effectue un parcours en profondeur du graphe pour trouver un chemin entre le sommet de départ et d'arrivée.
+        Cette méthode s'enfonce dans le graphe et backtrack lorsqu'elle atteint une impasse.
 
         Args:
             start (Sommet): Le sommet de départ.
@@ -407,112 +1054,2047 @@ class Grille:
 
         Returns:
             tuple: Un tuple contenant deux dictionnaires :
-                - Le premier dictionnaire contient les sommets et leurs voisins atteignables.
-                - Le second dictionnaire contient les prédécesseurs pour reconstruire le chemin le plus court.
+                - Le premier dictionnaire contient les sommets visités et leurs voisins.
+                - Le second dictionnaire contient les prédécesseurs pour chaque sommet sur le chemin.
         """
-        distances = {sommet: float('inf') for ligne in self.tab for sommet in ligne}
-        distances[start] = 0
-        predecessors = {sommet: None for ligne in self.tab for sommet in ligne}
-
-        visited_order = []
-
-        for _ in range(self.width * self.height - 1):
-            for ligne in self.tab:
-                for sommet in ligne:
-                    for neighbor in self.get_neighbors(sommet):
-                        if sommet.weight != self.WALL and neighbor.weight != self.WALL:
-                            new_distance = distances[sommet] + neighbor.weight
-                            if new_distance < distances[neighbor]:
-                                distances[neighbor] = new_distance
-                                predecessors[neighbor] = sommet
-                                if neighbor not in visited_order:
-                                    visited_order.append(neighbor)
-
-        reachable = {}
-        for sommet in visited_order:
-            pred = predecessors[sommet]
-            if pred:
-                if pred in reachable:
-                    reachable[pred].add(sommet)
-                else:
-                    reachable[pred] = {sommet}
-
-        shortest_path = {}
-        current = end
-        while current != start and predecessors[current] is not None:
-            shortest_path[predecessors[current]] = current
-            current = predecessors[current]
-
-        if current != start:
-            raise NotConnectedGraphException()
+        return self._consommer(self.etapes_profondeur(start, end))
 
-        return reachable, shortest_path
-
-    def heuristique_manhattan(self, end: Sommet) -> dict[Sommet:int]:
+    def etapes_profondeur(self, start: Sommet, end: Sommet) -> Iterator[Evenement]:
         """
-        Calcule la distance heuristique de Manhattan entre chaque sommet de la grille et le sommet d'arrivée.
+        Version pas à pas de parcours_profondeur.
 
         Args:
+            start (Sommet): Le sommet de départ.
             end (Sommet): Le sommet d'arrivée.
 
+        Yields:
+            Evenement: Un événement EXPANSION par cellule visitée, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        predecesseurs, _ = yield from self._etapes_profondeur(depart, arrivee)
+        atteinte = arrivee == depart or predecesseurs[arrivee] != -1
+        yield from self._fin(self._chemin(predecesseurs, depart, arrivee) if atteinte else [])
+
+    @staticmethod
+    def _executer(etapes: Generator):
+        """
+        Déroule un générateur d'étapes sans traiter ses événements.
+
+        Args:
+            etapes (Generator): Le générateur d'un coeur d'algorithme.
+
         Returns:
-            dict: Un dictionnaire où chaque clé est un sommet et la valeur est sa distance heuristique vers l'arrivée.
+            La valeur retournée par le générateur.
         """
-        distance_heuristique = {}
-        for ligne in self.tab:
-            for sommet in ligne:
-                if sommet.weight != self.WALL:
-                    distance = abs(end.x - sommet.x) + abs(end.y - sommet.y)
-                    distance_heuristique[sommet] = distance
-        return distance_heuristique
+        while True:
+            try:
+                next(etapes)
+            except StopIteration as fin:
+                return fin.value
 
-    def a_star(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+    @staticmethod
+    def _en_preparation(etapes: Generator) -> Generator[Evenement, None, object]:
+        """
+        Déroule le générateur d'un coeur d'algorithme utilisé comme précalcul : ses événements sont remplacés
+        par un événement PREPARATION toutes les PREPARATION_LOT étapes.
+
+        Args:
+            etapes (Generator): Le générateur d'un coeur d'algorithme.
+
+        Yields:
+            Evenement: Des événements PREPARATION.
+
+        Returns:
+            La valeur retournée par le générateur.
+        """
+        compte = 0
+        while True:
+            try:
+                next(etapes)
+            except StopIteration as fin:
+                return fin.value
+            compte += 1
+            if compte % PREPARATION_LOT == 0:
+                yield Evenement(PREPARATION)
+
+    @staticmethod
+    def _chemin(predecesseurs: array, depart: int, arrivee: int) -> list[int]:
+        """
+        Reconstruit le chemin de depart à arrivee en remontant le tableau des prédécesseurs.
+
+        Args:
+            predecesseurs (array): Le prédécesseur de chaque cellule, -1 si aucun.
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée.
+
+        Returns:
+            list: Les cellules du chemin, du départ à l'arrivée.
+        """
+        chemin = [arrivee]
+        while chemin[-1] != depart:
+            chemin.append(predecesseurs[chemin[-1]])
+        chemin.reverse()
+        return chemin
+
+    def _extremites(self, start: Sommet, end: Sommet) -> Generator[Evenement, None, tuple[int, int]]:
         """
-        Implémente l'algorithme A* pour trouver le chemin le plus court entre deux sommets, en utilisant une heuristique de Manhattan.
+        Retourne les cellules de départ et d'arrivée d'une recherche, après avoir vérifié qu'elles sont connectées.
+        L'index des composantes est construit au besoin, en produisant des événements PREPARATION.
 
         Args:
             start (Sommet): Le sommet de départ.
             end (Sommet): Le sommet d'arrivée.
 
+        Yields:
+            Evenement: Des événements PREPARATION pendant la construction de l'index des composantes.
+
         Returns:
-            tuple: Un tuple contenant deux dictionnaires :
-                - Le premier dictionnaire contient les sommets visités et leurs voisins atteignables.
-                - Le second dictionnaire contient les prédécesseurs pour reconstruire le chemin le plus court.
+            tuple: Un tuple (depart, arrivee) de cellules.
         """
-        heuristique_manhattan = self.heuristique_manhattan(end)  # Valeur heuriqtique de chaque sommet
-        cout_deplacement: dict[Sommet: int] = {start: 0}
-        cout_acces_total: dict[Sommet: int] = {
-            start: heuristique_manhattan[start]}  # heuristique manhattan + déplacement
-
-        queue: list[tuple[Sommet: int]] = [(start, cout_acces_total[start])]
-        predecesseur: dict[Sommet: Sommet] = {start: None}
-        chemin_parcouru: dict[Sommet, set[Sommet]] = {}
-
-        courant = queue.pop(0)[0]
-        courant.visited = True
-        while courant != end:
-            courant_voisin = self.get_neighbors(courant)
-            if courant not in chemin_parcouru:
-                chemin_parcouru[courant] = set()
-            for voisin in courant_voisin:
-                if voisin.weight == self.WALL or voisin.visited:
-                    continue
-                chemin_parcouru[courant].add(voisin)
-                voisin.visited = True
-                predecesseur[voisin] = courant
-                cout_deplacement[voisin] = cout_deplacement[courant] + voisin.weight
-                cout_acces_total[voisin] = heuristique_manhattan[voisin] + cout_deplacement[voisin]
-                queue.append((voisin, cout_acces_total[voisin]))
-                queue.sort(key=lambda x: x[1])
-            if len(queue) == 0:
-                raise NotConnectedGraphException()
-            courant = queue.pop(0)[0]
-        # Solution
-        solution: dict[Sommet, Sommet] = {}
-        courant = end
-
-        while courant != start:
-            courant_predecesseur = predecesseur[courant]
-            solution[courant_predecesseur] = courant
-            courant = predecesseur[courant]
-        return chemin_parcouru, solution
+        depart = self.cellule(start.x, start.y)
+        arrivee = self.cellule(end.x, end.y)
+        if self._etiquettes is None:
+            yield from self._etapes_composantes()
+        self._verifier_connexite(depart, arrivee)
+        return depart, arrivee
+
+    def _fin(self, chemin: list[int], cout: Optional[int] = None) -> Iterator[Evenement]:
+        """
+        Produit les derniers événements d'une recherche.
+
+        Args:
+            chemin (list[int]): Les cellules du chemin trouvé, vide si l'arrivée n'a pas été atteinte.
+            cout (int, optional): Le coût du chemin, par défaut la somme des poids des cellules après le départ.
+
+        Yields:
+            Evenement: TROUVE avec le chemin et son coût s'il existe, puis FIN.
+        """
+        if chemin:
+            if cout is None:
+                weights = self.weights
+                cout = sum(weights[cellule] for cellule in chemin[1:])
+            yield Evenement(TROUVE, chemin[-1], chemin[-2] if len(chemin) > 1 else -1, cout, chemin)
+        yield Evenement(FIN)
+
+    @staticmethod
+    def limiter(etapes: Iterator[Evenement], max_expansions: Optional[int] = None, delai: Optional[float] = None,
+                annulation=None) -> Iterator[Evenement]:
+        """
+        Borne une recherche pas à pas. Les limites sont vérifiées à chaque événement : dès que l'une est atteinte,
+        la recherche est fermée et un événement INTERROMPU est produit, suivi de FIN.
+
+        Args:
+            etapes (Iterator[Evenement]): Les événements d'un générateur etapes_*.
+            max_expansions (int, optional): Le nombre maximal d'événements EXPANSION.
+            delai (float, optional): La durée maximale de la recherche, en secondes.
+            annulation (threading.Event, optional): Un jeton d'annulation, déclenché par un autre fil avec set().
+
+        Yields:
+            Evenement: Les événements de la recherche, jusqu'à la première limite atteinte.
+        """
+        echeance = time.monotonic() + delai if delai is not None else None
+        expansions = 0
+        statut = None
+        for evenement in etapes:
+            if evenement.genre == EXPANSION:
+                expansions += 1
+                if max_expansions is not None and expansions > max_expansions:
+                    statut = LIMITE_EXPANSIONS
+            if statut is None and evenement.genre not in (TROUVE, FIN):
+                if annulation is not None and annulation.is_set():
+                    statut = LIMITE_ANNULATION
+                elif echeance is not None and time.monotonic() > echeance:
+                    statut = LIMITE_DELAI
+            if statut is not None:
+                etapes.close()
+                yield Evenement(INTERROMPU, statut=statut)
+                yield Evenement(FIN)
+                return
+            yield evenement
+
+    @staticmethod
+    def tracer(etapes: Iterator[Evenement]) -> Trace:
+        """
+        Consomme les événements d'un générateur etapes_* et les enregistre dans une trace compacte.
+
+        Args:
+            etapes (Iterator[Evenement]): Les événements de la recherche, éventuellement bornés par limiter.
+
+        Returns:
+            Trace: Les arêtes (parent, enfant) dans l'ordre d'exploration et le chemin trouvé, ou l'exploration
+                partielle et la limite atteinte si la recherche a été interrompue.
+
+        Raises:
+            NotConnectedGraphException: Si la recherche s'est terminée sans atteindre l'arrivée.
+        """
+        parents = array("i")
+        enfants = array("i")
+        chemin: Optional[list[int]] = None
+        statut = TROUVE
+        for evenement in etapes:
+            genre = evenement.genre
+            if genre == EXPANSION:
+                if evenement.parent != -1:
+                    parents.append(evenement.parent)
+                    enfants.append(evenement.cellule)
+            elif genre == TROUVE:
+                chemin = evenement.chemin
+            elif genre == INTERROMPU:
+                statut = evenement.statut
+        if statut != TROUVE:
+            return Trace(parents, enfants, array("i"), statut)
+        if chemin is None:
+            raise NotConnectedGraphException()
+        return Trace(parents, enfants, array("i", chemin))
+
+    def _consommer(self, etapes: Iterator[Evenement]) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Consomme les événements d'un générateur etapes_* et construit le résultat habituel des parcours.
+
+        Args:
+            etapes (Iterator[Evenement]): Les événements de la recherche.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire associe à chaque cellule développée les cellules atteintes depuis elle.
+                - Le second dictionnaire contient le chemin, prédécesseur -> successeur.
+        """
+        parents, enfants, chemin, _ = self.tracer(etapes)
+        visited: dict[int, set[int]] = {}
+        for parent, enfant in zip(parents, enfants):
+            if parent in visited:
+                visited[parent].add(enfant)
+            else:
+                visited[parent] = {enfant}
+        return self._vers_sommets(visited), self._solution_vers_sommets(dict(zip(chemin, chemin[1:])))
+
+    def _dijkstra(self, depart: int, arrivee: int = -1) -> tuple[array, array, list[int]]:
+        """
+        Exécute _etapes_dijkstra jusqu'au bout.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre).
+        """
+        return self._executer(self._etapes_dijkstra(depart, arrivee))
+
+    def _etapes_dijkstra(self, depart: int, arrivee: int = -1,
+                         relachements: bool = False) -> Generator[Evenement, None, tuple[array, array, list[int]]]:
+        """
+        Coeur de l'algorithme de Dijkstra : tas binaire avec suppression paresseuse et tableaux denses.
+
+        Args:
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée, la recherche s'arrête dès qu'elle est fixée (-1 pour tout explorer).
+            relachements (bool): Si True, produit aussi un événement RELACHEMENT à chaque distance améliorée.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fixée.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre) où ordre liste les cellules dans l'ordre où elles sont fixées.
+        """
+        nbr_cellules = self.width * self.height
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+        distances = array("q", [INFINI]) * nbr_cellules
+        predecesseurs = array("i", [-1]) * nbr_cellules
+        fixes = bytearray(nbr_cellules)
+        ordre: list[int] = []
+
+        distances[depart] = 0
+        tas: list[tuple[int, int]] = [(0, depart)]
+        while tas:
+            distance, courant = heappop(tas)
+            if fixes[courant]:
+                continue  # Entrée périmée du tas
+            fixes[courant] = 1
+            ordre.append(courant)
+            yield Evenement(EXPANSION, courant, predecesseurs[courant], distance)
+            if courant == arrivee:
+                break
+            for i in range(offsets[courant], offsets[courant + 1]):
+                voisin = voisins[i]
+                weight = weights[voisin]
+                if weight == wall or fixes[voisin]:
+                    continue
+                nouvelle_distance = distance + weight
+                if nouvelle_distance < distances[voisin]:
+                    distances[voisin] = nouvelle_distance
+                    predecesseurs[voisin] = courant
+                    heappush(tas, (nouvelle_distance, voisin))
+                    if relachements:
+                        yield Evenement(RELACHEMENT, voisin, courant, nouvelle_distance)
+        return distances, predecesseurs, ordre
+
+    def _dial(self, depart: int, arrivee: int = -1) -> tuple[array, array, list[int]]:
+        """
+        Exécute _etapes_dial jusqu'au bout.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre).
+        """
+        return self._executer(self._etapes_dial(depart, arrivee))
+
+    def _etapes_dial(self, depart: int, arrivee: int = -1,
+                     relachements: bool = False) -> Generator[Evenement, None, tuple[array, array, list[int]]]:
+        """
+        Variante de Dijkstra utilisant une file à seaux circulaire (algorithme de Dial).
+        Chaque seau regroupe les cellules d'une même distance, l'insertion et l'extraction sont en O(1).
+        Si les poids ne sont pas de petits entiers positifs, la recherche est déléguée au tas binaire.
+
+        Args:
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée, la recherche s'arrête dès qu'elle est fixée (-1 pour tout explorer).
+            relachements (bool): Si True, produit aussi un événement RELACHEMENT à chaque distance améliorée.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fixée.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre) identique à celui de _dijkstra.
+        """
+        poids_min, poids_max = self.poids_extremes()
+        if poids_min < 0 or poids_max > DIAL_POIDS_MAX:
+            return (yield from self._etapes_dijkstra(depart, arrivee, relachements))
+
+        nbr_cellules = self.width * self.height
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+        distances = array("q", [INFINI]) * nbr_cellules
+        predecesseurs = array("i", [-1]) * nbr_cellules
+        fixes = bytearray(nbr_cellules)
+        ordre: list[int] = []
+
+        # poids_max + 1 seaux suffisent : aucune distance en attente ne dépasse la courante de plus de poids_max.
+        nbr_seaux = poids_max + 1
+        seaux: list[list[int]] = [[] for _ in range(nbr_seaux)]
+        seaux[0].append(depart)
+        distances[depart] = 0
+        restants = 1
+        distance = 0
+        while restants:
+            seau = seaux[distance % nbr_seaux]
+            while seau:
+                courant = seau.pop()
+                restants -= 1
+                if fixes[courant] or distances[courant] != distance:
+                    continue  # Entrée périmée
+                fixes[courant] = 1
+                ordre.append(courant)
+                yield Evenement(EXPANSION, courant, predecesseurs[courant], distance)
+                if courant == arrivee:
+                    return distances, predecesseurs, ordre
+                for i in range(offsets[courant], offsets[courant + 1]):
+                    voisin = voisins[i]
+                    weight = weights[voisin]
+                    if weight == wall or fixes[voisin]:
+                        continue
+                    nouvelle_distance = distance + weight
+                    if nouvelle_distance < distances[voisin]:
+                        distances[voisin] = nouvelle_distance
+                        predecesseurs[voisin] = courant
+                        seaux[nouvelle_distance % nbr_seaux].append(voisin)
+                        restants += 1
+                        if relachements:
+                            yield Evenement(RELACHEMENT, voisin, courant, nouvelle_distance)
+            distance += 1
+        return distances, predecesseurs, ordre
+
+    def parcours_dijkstra(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Implémente l'algorithme de Dijkstra pour trouver le chemin le plus court entre deux sommets.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient tous les résultats intermédiaires des sommets visités.
+                - Le second dictionnaire contient le chemin le plus court du sommet de départ au sommet d'arrivée.
+        """
+        return self._consommer(self.etapes_dijkstra(start, end))
+
+    def etapes_dijkstra(self, start: Sommet, end: Sommet, relachements: bool = False) -> Iterator[Evenement]:
+        """
+        Version pas à pas de parcours_dijkstra.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            relachements (bool): Si True, produit aussi les événements RELACHEMENT.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fixée, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        distances, predecesseurs, _ = yield from self._etapes_dijkstra(depart, arrivee, relachements)
+        yield from self._fin(self._chemin(predecesseurs, depart, arrivee) if distances[arrivee] != INFINI else [])
+
+    def parcours_dial(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Calcule le chemin le plus court entre deux sommets avec la file à seaux de Dial,
+        adaptée à la petite palette de poids entiers de la grille.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient tous les résultats intermédiaires des sommets visités.
+                - Le second dictionnaire contient le chemin le plus court du sommet de départ au sommet d'arrivée.
+        """
+        return self._consommer(self.etapes_dial(start, end))
+
+    def etapes_dial(self, start: Sommet, end: Sommet, relachements: bool = False) -> Iterator[Evenement]:
+        """
+        Version pas à pas de parcours_dial.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            relachements (bool): Si True, produit aussi les événements RELACHEMENT.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fixée, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        distances, predecesseurs, _ = yield from self._etapes_dial(depart, arrivee, relachements)
+        yield from self._fin(self._chemin(predecesseurs, depart, arrivee) if distances[arrivee] != INFINI else [])
+
+    def distance_field(self, start: Sommet) -> tuple[array, array]:
+        """
+        Calcule l'arbre complet des plus courts chemins depuis un sommet. Les arbres sont gardés dans un cache LRU
+        indexé par (version de la grille, départ) : les requêtes suivantes depuis le même départ ne font que
+        remonter les prédécesseurs.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs) indexé par cellule, INFINI et -1 pour les cellules inatteignables.
+        """
+        return self._executer(self._etapes_champ(self.cellule(start.x, start.y)))
+
+    def _etapes_champ(self, depart: int) -> Generator[Evenement, None, tuple[array, array]]:
+        """
+        Version pas à pas de distance_field : l'algorithme de Dial produit des événements PREPARATION, et l'arbre
+        n'est mis en cache qu'une fois complet.
+
+        Args:
+            depart (int): La cellule de départ.
+
+        Yields:
+            Evenement: Des événements PREPARATION, aucun si l'arbre est déjà en cache.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs) indexé par cellule.
+        """
+        cle = (self.version, depart)
+        if cle in self._arbres:
+            self._arbres.move_to_end(cle)
+            return self._arbres[cle]
+
+        if self.weights[depart] == self.WALL:
+            distances = array("q", [INFINI]) * len(self.weights)
+            predecesseurs = array("i", [-1]) * len(self.weights)
+            distances[depart] = 0
+        else:
+            distances, predecesseurs, _ = yield from self._en_preparation(self._etapes_dial(depart))
+        for perime in [c for c in self._arbres if c[0] != self.version]:
+            del self._arbres[perime]  # Arbres d'une version précédente de la grille
+        self._arbres[cle] = (distances, predecesseurs)
+        while len(self._arbres) > ARBRES_MAX:
+            self._arbres.popitem(last=False)
+        return distances, predecesseurs
+
+    def chemin_depuis_champ(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Retourne le plus court chemin en remontant l'arbre de distance_field, calculé une seule fois par départ.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire est vide : aucune exploration n'est faite pour cette requête.
+                - Le second dictionnaire contient le chemin le plus court du sommet de départ au sommet d'arrivée.
+        """
+        return self._consommer(self.etapes_chemin_depuis_champ(start, end))
+
+    def etapes_chemin_depuis_champ(self, start: Sommet, end: Sommet) -> Iterator[Evenement]:
+        """
+        Version pas à pas de chemin_depuis_champ.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Yields:
+            Evenement: Des événements PREPARATION si l'arbre n'est pas encore calculé, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        distances, predecesseurs = yield from self._etapes_champ(depart)
+        yield from self._fin(self._chemin(predecesseurs, depart, arrivee) if distances[arrivee] != INFINI else [])
+
+    def _largeur(self, depart: int, arrivee: int = -1) -> tuple[array, list[int]]:
+        """
+        Exécute _etapes_largeur jusqu'au bout.
+
+        Returns:
+            tuple: Un tuple (predecesseurs, ordre).
+        """
+        return self._executer(self._etapes_largeur(depart, arrivee))
+
+    def _etapes_largeur(self, depart: int, arrivee: int = -1) -> Generator[Evenement, None, tuple[array, list[int]]]:
+        """
+        Coeur du parcours en largeur : file deque, cellules marquées dès leur mise en file et tableau des prédécesseurs.
+
+        Args:
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée, la recherche s'arrête dès qu'elle est découverte (-1 pour tout explorer).
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule découverte.
+
+        Returns:
+            tuple: Un tuple (predecesseurs, ordre) où ordre liste les cellules dans l'ordre de leur découverte.
+        """
+        nbr_cellules = self.width * self.height
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+        predecesseurs = array("i", [-1]) * nbr_cellules
+        vus = bytearray(nbr_cellules)
+        ordre: list[int] = [depart]
+
+        vus[depart] = 1
+        yield Evenement(EXPANSION, depart)
+        if depart == arrivee:
+            return predecesseurs, ordre
+        queue: deque[int] = deque((depart,))
+        while queue:
+            courant = queue.popleft()
+            for i in range(offsets[courant], offsets[courant + 1]):
+                voisin = voisins[i]
+                if vus[voisin] or weights[voisin] == wall:
+                    continue
+                vus[voisin] = 1
+                predecesseurs[voisin] = courant
+                ordre.append(voisin)
+                yield Evenement(EXPANSION, voisin, courant)
+                if voisin == arrivee:
+                    return predecesseurs, ordre
+                queue.append(voisin)
+        return predecesseurs, ordre
+
+    def parcours_largeur(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Implémente l'algorithme de parcours en largeur pour trouver le chemin le plus court entre deux sommets.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient les sommets visités et leurs voisins atteignables.
+                - Le second dictionnaire contient les prédécesseurs pour chaque sommet sur le chemin.
+        """
+        return self._consommer(self.etapes_largeur(start, end))
+
+    def etapes_largeur(self, start: Sommet, end: Sommet) -> Iterator[Evenement]:
+        """
+        Version pas à pas de parcours_largeur.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule découverte, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        predecesseurs, _ = yield from self._etapes_largeur(depart, arrivee)
+        atteinte = arrivee == depart or predecesseurs[arrivee] != -1
+        yield from self._fin(self._chemin(predecesseurs, depart, arrivee) if atteinte else [])
+
+    def _bidirectionnel(self, depart: int, arrivee: int,
+                        potentiel: Optional[Callable[[int], int]] = None) -> tuple[int, list[int]]:
+        """
+        Exécute _etapes_bidirectionnel jusqu'au bout.
+
+        Returns:
+            tuple: Un tuple (cout, chemin).
+        """
+        return self._executer(self._etapes_bidirectionnel(depart, arrivee, potentiel))
+
+    def _etapes_bidirectionnel(self, depart: int, arrivee: int, potentiel: Optional[Callable[[int], int]] = None,
+                               relachements: bool = False) -> Generator[Evenement, None, tuple[int, list[int]]]:
+        """
+        Coeur de la recherche bidirectionnelle : un front avant part du départ, un front arrière de l'arrivée,
+        et le côté dont le tas est le plus petit avance à chaque tour.
+
+        Sans potentiel c'est Dijkstra bidirectionnel. Avec un potentiel P(v) = pi_arrivee(v) - pi_depart(v)
+        (différence de deux heuristiques consistantes), les deux fronts travaillent sur les coûts réduits
+        2 * poids + P(v) - P(u), tous positifs : c'est A* bidirectionnel à potentiels moyens. Les clés sont
+        doublées pour rester entières.
+
+        La recherche s'arrête selon le critère classique : somme des sommets des deux tas >= meilleur chemin trouvé
+        (exprimé en coûts réduits).
+
+        Args:
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée.
+            potentiel (Callable | None): Le potentiel P, None pour Dijkstra bidirectionnel.
+            relachements (bool): Si True, produit aussi un événement RELACHEMENT à chaque distance améliorée.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fixée dans l'un ou l'autre front. Dans le front arrière,
+                le parent est la cellule suivante vers l'arrivée et la distance celle qui reste jusqu'à l'arrivée.
+
+        Returns:
+            tuple: Un tuple (cout, chemin) où chemin liste les cellules du départ à l'arrivée (vide si elles
+                ne sont pas connectées).
+        """
+        nbr_cellules = self.width * self.height
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+        if depart == arrivee:
+            return 0, [depart]
+        if weights[arrivee] == wall:
+            return INFINI, []
+        if potentiel is None:
+            potentiel = lambda cellule: 0
+
+        # Indice 0 : front avant depuis le départ, indice 1 : front arrière depuis l'arrivée.
+        distances = (array("q", [INFINI]) * nbr_cellules, array("q", [INFINI]) * nbr_cellules)
+        parents = (array("i", [-1]) * nbr_cellules, array("i", [-1]) * nbr_cellules)
+        fixes = (bytearray(nbr_cellules), bytearray(nbr_cellules))
+        signes = (1, -1)
+        decalages = (potentiel(depart), -potentiel(arrivee))
+        tas: tuple[list[tuple[int, int]], list[tuple[int, int]]] = ([(0, depart)], [(0, arrivee)])
+        distances[0][depart] = 0
+        distances[1][arrivee] = 0
+        borne_reduite = potentiel(arrivee) - potentiel(depart)
+        meilleur = INFINI
+        rencontre = -1
+
+        while tas[0] and tas[1]:
+            if tas[0][0][0] + tas[1][0][0] >= 2 * meilleur + borne_reduite:
+                break
+            sens = 0 if len(tas[0]) <= len(tas[1]) else 1
+            _, courant = heappop(tas[sens])
+            fixes_sens = fixes[sens]
+            if fixes_sens[courant]:
+                continue  # Entrée périmée du tas
+            fixes_sens[courant] = 1
+            distances_sens = distances[sens]
+            parents_sens = parents[sens]
+            distances_autre = distances[1 - sens]
+            distance = distances_sens[courant]
+            yield Evenement(EXPANSION, courant, parents_sens[courant], distance)
+            signe = signes[sens]
+            decalage = decalages[sens]
+            for i in range(offsets[courant], offsets[courant + 1]):
+                voisin = voisins[i]
+                weight = weights[voisin]
+                if weight == wall or fixes_sens[voisin]:
+                    continue
+                # En arrière, l'arête parcourue est voisin -> courant, elle coûte le poids de courant.
+                nouvelle_distance = distance + (weights[courant] if sens else weight)
+                if nouvelle_distance < distances_sens[voisin]:
+                    distances_sens[voisin] = nouvelle_distance
+                    parents_sens[voisin] = courant
+                    heappush(tas[sens], (2 * nouvelle_distance + signe * potentiel(voisin) - decalage, voisin))
+                    if relachements:
+                        yield Evenement(RELACHEMENT, voisin, courant, nouvelle_distance)
+                    if distances_autre[voisin] != INFINI and nouvelle_distance + distances_autre[voisin] < meilleur:
+                        meilleur = nouvelle_distance + distances_autre[voisin]
+                        rencontre = voisin
+
+        if rencontre == -1:
+            return INFINI, []
+        chemin: list[int] = []
+        cellule = rencontre
+        while cellule != -1:
+            chemin.append(cellule)
+            cellule = parents[0][cellule]
+        chemin.reverse()
+        cellule = parents[1][rencontre]
+        while cellule != -1:
+            chemin.append(cellule)
+            cellule = parents[1][cellule]
+        return meilleur, chemin
+
+    def parcours_dijkstra_bidirectionnel(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Implémente Dijkstra bidirectionnel : deux fronts grandissent depuis le départ et l'arrivée jusqu'à se rencontrer.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient les sommets visités par les deux fronts et leurs voisins atteints.
+                - Le second dictionnaire contient le chemin le plus court du sommet de départ au sommet d'arrivée.
+        """
+        return self._consommer(self.etapes_dijkstra_bidirectionnel(start, end))
+
+    def etapes_dijkstra_bidirectionnel(self, start: Sommet, end: Sommet, relachements: bool = False) -> Iterator[Evenement]:
+        """
+        Version pas à pas de parcours_dijkstra_bidirectionnel.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            relachements (bool): Si True, produit aussi les événements RELACHEMENT.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fixée dans l'un des deux fronts, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        _, chemin = yield from self._etapes_bidirectionnel(depart, arrivee, None, relachements)
+        yield from self._fin(chemin)
+
+    def allerAToire(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Effectue un parcours aléatoire de la grille de start à end, en choisissant des voisins au hasard.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Returns:
+            tuple: Un tuple contenant :
+                - Le premier dictionnaire contient les sommets et leurs voisins atteignables.
+                - Le second dictionnaire contient le chemin parcouru, débarrassé de ses boucles.
+        """
+        return self._consommer(self.etapes_allerAToire(start, end))
+
+    def etapes_allerAToire(self, start: Sommet, end: Sommet) -> Iterator[Evenement]:
+        """
+        Version pas à pas de allerAToire.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Yields:
+            Evenement: Un événement EXPANSION par pas de la marche, puis TROUVE avec la marche sans ses boucles et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        offsets, voisins = self.adjacence()
+        queue: list[int] = [depart]
+        path: dict[int, int] = dict()
+        visited: set[int] = set()
+        known: set[int] = set()
+        unvisited_free: int = 0  # Cellules connues, non visitées et hors murs
+        end_reached: bool = depart == arrivee
+
+        while queue and not end_reached:
+            current = queue.pop()
+            if current not in visited:
+                visited.add(current)
+                if current in known:
+                    unvisited_free -= 1
+            neighbors = voisins[offsets[current]:offsets[current + 1]]
+            for neighbor in neighbors:
+                if neighbor not in known:
+                    known.add(neighbor)
+                    if neighbor not in visited and self.weights[neighbor] != self.WALL:
+                        unvisited_free += 1
+
+            if not unvisited_free:
+                raise NotConnectedGraphException()
+
+            not_walls = [neighbor for neighbor in neighbors if self.weights[neighbor] != self.WALL]
+            if not_walls:
+                neighbor = random.choice(not_walls)
+                queue.append(neighbor)
+                path[current] = neighbor
+                yield Evenement(EXPANSION, neighbor, current)
+
+                if neighbor == arrivee:
+                    end_reached = True
+
+        # En suivant la dernière sortie de chaque cellule depuis le départ, on obtient la marche sans ses boucles.
+        chemin = [depart]
+        while end_reached and chemin[-1] != arrivee:
+            chemin.append(path[chemin[-1]])
+        yield from self._fin(chemin if end_reached else [])
+
+    def marche_aleatoire_monte_carlo(self, start: Sommet, end: Sommet, marcheurs: int = 1000, pas_max: int = 10000,
+                                     graine: Optional[int] = None, delai: Optional[float] = None,
+                                     annulation=None) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet], dict]:
+        """
+        Lance plusieurs marches aléatoires en parallèle avec NumPy : à chaque pas, tous les marcheurs encore en route
+        avancent vers un voisin hors mur tiré au hasard, jusqu'à l'arrivée, jusqu'à pas_max pas, ou jusqu'à ce que
+        le délai soit écoulé ou le jeton d'annulation déclenché.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            marcheurs (int): Le nombre de marcheurs.
+            pas_max (int): Le nombre maximal de pas d'un marcheur.
+            graine (int, optional): La graine du générateur aléatoire, pour rejouer un tirage.
+            delai (float, optional): La durée maximale des marches, en secondes.
+            annulation (threading.Event, optional): Un jeton d'annulation, déclenché par un autre fil avec set().
+
+        Returns:
+            tuple: Un tuple contenant :
+                - Le premier dictionnaire contient les sommets de la marche représentative et les voisins choisis.
+                - Le second dictionnaire contient cette marche, prédécesseur -> successeur.
+                - Le troisième dictionnaire contient les statistiques du temps d'atteinte, en nombre de pas :
+                  taux de réussite, moyenne et percentiles 50, 90 et 99 des marcheurs arrivés, et statut : TROUVE
+                  si un marcheur est arrivé, sinon LIMITE_PAS, ou la limite qui a arrêté les marches avant pas_max.
+        """
+        import numpy as np
+
+        depart = self.cellule(start.x, start.y)
+        arrivee = self.cellule(end.x, end.y)
+        self._verifier_connexite(depart, arrivee)
+        table, degres = self._table_voisins_numpy()
+        generateur = np.random.default_rng(graine)
+
+        # Seuls les premiers marcheurs sont suivis pas à pas, pour choisir une marche représentative à afficher.
+        suivis = min(marcheurs, 64)
+        positions = np.full(marcheurs, depart, dtype=np.int32)
+        temps = np.full(marcheurs, -1, dtype=np.int64)
+        en_route = np.arange(marcheurs)
+        historique = np.empty((pas_max + 1, suivis), dtype=np.int32)  # Positions des marcheurs suivis à chaque pas
+        historique[0] = positions[:suivis]
+        if depart == arrivee:
+            temps[:] = 0
+            en_route = en_route[:0]
+        echeance = time.monotonic() + delai if delai is not None else None
+        statut = None
+        pas = 0
+        while len(en_route) and pas < pas_max:
+            if annulation is not None and annulation.is_set():
+                statut = LIMITE_ANNULATION
+                break
+            if echeance is not None and time.monotonic() > echeance:
+                statut = LIMITE_DELAI
+                break
+            pas += 1
+            courantes = positions[en_route]
+            choix = (generateur.random(len(en_route)) * degres[courantes]).astype(np.int32)
+            positions[en_route] = table[courantes, choix]
+            arrives = positions[en_route] == arrivee
+            temps[en_route[arrives]] = pas
+            en_route = en_route[~arrives]
+            historique[pas] = positions[:suivis]
+
+        reussis = temps[temps >= 0]
+        statistiques = {
+            "walkers": marcheurs,
+            "max_steps": pas_max,
+            "success_rate": len(reussis) / marcheurs,
+            "mean": float(reussis.mean()) if len(reussis) else None,
+            "percentiles": {str(p): float(np.percentile(reussis, p)) if len(reussis) else None for p in (50, 90, 99)},
+            "status": statut or (TROUVE if len(reussis) else LIMITE_PAS),
+        }
+
+        # Marche représentative : le marcheur suivi arrivé dont le temps est le plus proche de la médiane,
+        # à défaut le premier marcheur (marche interrompue à pas_max).
+        candidats = np.flatnonzero(temps[:suivis] >= 0)
+        if len(candidats):
+            representant = candidats[np.argmin(np.abs(temps[candidats] - np.median(reussis)))]
+            longueur = temps[representant]
+        else:
+            representant, longueur = 0, pas
+        marche = historique[:longueur + 1, representant].tolist()
+
+        reachable: dict[int, set[int]] = {}
+        path: dict[int, int] = {}
+        for current, neighbor in zip(marche, marche[1:]):
+            reachable.setdefault(current, set()).add(neighbor)
+            path[current] = neighbor
+        return self._vers_sommets(reachable), self._solution_vers_sommets(path), statistiques
+
+    def _bellman_ford_passes(self, depart: int) -> tuple[array, array, list[int]]:
+        """
+        Exécute _etapes_bellman_ford_passes jusqu'au bout.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre).
+        """
+        return self._executer(self._etapes_bellman_ford_passes(depart))
+
+    def _etapes_bellman_ford_passes(self, depart: int,
+                                  relachements: bool = False) -> Generator[Evenement, None, tuple[array, array, list[int]]]:
+        """
+        Bellman-Ford par passes complètes sur toutes les arêtes, arrêté dès qu'une passe ne relâche plus rien.
+
+        Args:
+            depart (int): La cellule de départ.
+            relachements (bool): Si True, produit aussi un événement RELACHEMENT à chaque distance améliorée ensuite.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule, à sa première atteinte.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre) où ordre liste les cellules dans l'ordre de leur première atteinte.
+        """
+        nbr_cellules = self.width * self.height
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+        distances = array("q", [INFINI]) * nbr_cellules
+        predecesseurs = array("i", [-1]) * nbr_cellules
+        ordre: list[int] = []
+
+        distances[depart] = 0
+        for _ in range(nbr_cellules - 1):
+            modifie = False
+            for cellule in range(nbr_cellules):
+                distance = distances[cellule]
+                if distance == INFINI or weights[cellule] == wall:
+                    continue
+                for i in range(offsets[cellule], offsets[cellule + 1]):
+                    voisin = voisins[i]
+                    weight = weights[voisin]
+                    if weight != wall and distance + weight < distances[voisin]:
+                        premiere = distances[voisin] == INFINI
+                        distances[voisin] = distance + weight
+                        predecesseurs[voisin] = cellule
+                        modifie = True
+                        if premiere:
+                            ordre.append(voisin)
+                            yield Evenement(EXPANSION, voisin, cellule, distance + weight)
+                        elif relachements:
+                            yield Evenement(RELACHEMENT, voisin, cellule, distance + weight)
+            if not modifie:
+                break
+        return distances, predecesseurs, ordre
+
+    def _bellman_ford_spfa(self, depart: int) -> tuple[array, array, list[int]]:
+        """
+        Exécute _etapes_bellman_ford_spfa jusqu'au bout.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre).
+        """
+        return self._executer(self._etapes_bellman_ford_spfa(depart))
+
+    def _etapes_bellman_ford_spfa(self, depart: int,
+                                  relachements: bool = False) -> Generator[Evenement, None, tuple[array, array, list[int]]]:
+        """
+        Variante à file de Bellman-Ford (SPFA) : seules les cellules dont la distance vient de baisser sont relâchées.
+
+        Args:
+            depart (int): La cellule de départ.
+            relachements (bool): Si True, produit aussi un événement RELACHEMENT à chaque distance améliorée ensuite.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule, à sa première atteinte.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre) où ordre liste les cellules dans l'ordre de leur première atteinte.
+        """
+        nbr_cellules = self.width * self.height
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+        distances = array("q", [INFINI]) * nbr_cellules
+        predecesseurs = array("i", [-1]) * nbr_cellules
+        en_file = bytearray(nbr_cellules)
+        ordre: list[int] = []
+
+        distances[depart] = 0
+        queue: deque[int] = deque((depart,))
+        en_file[depart] = 1
+        while queue:
+            cellule = queue.popleft()
+            en_file[cellule] = 0
+            distance = distances[cellule]
+            for i in range(offsets[cellule], offsets[cellule + 1]):
+                voisin = voisins[i]
+                weight = weights[voisin]
+                if weight != wall and distance + weight < distances[voisin]:
+                    premiere = distances[voisin] == INFINI
+                    distances[voisin] = distance + weight
+                    predecesseurs[voisin] = cellule
+                    if premiere:
+                        ordre.append(voisin)
+                        yield Evenement(EXPANSION, voisin, cellule, distance + weight)
+                    elif relachements:
+                        yield Evenement(RELACHEMENT, voisin, cellule, distance + weight)
+                    if not en_file[voisin]:
+                        en_file[voisin] = 1
+                        # Small Label First : une cellule plus proche que la tête de file passe devant.
+                        if queue and distance + weight < distances[queue[0]]:
+                            queue.appendleft(voisin)
+                        else:
+                            queue.append(voisin)
+        return distances, predecesseurs, ordre
+
+    def _table_voisins_numpy(self):
+        """
+        Construit la table des voisins hors murs complétée à 6 colonnes, pour les moteurs NumPy.
+        Les voisins de chaque cellule occupent ses premières colonnes, les cases vides valent le nombre de cellules.
+
+        Returns:
+            tuple: Un tuple (table, degres) de tableaux NumPy, la table ayant une ligne de plus pour la cellule fictive.
+        """
+        import numpy as np
+
+        nbr_cellules = self.width * self.height
+        offsets, voisins = self.adjacence(sans_murs=True)
+        offsets = np.frombuffer(offsets, dtype=np.int32)
+        voisins = np.frombuffer(voisins, dtype=np.int32)
+        degres = np.diff(offsets)
+        lignes = np.repeat(np.arange(nbr_cellules), degres)
+        colonnes = np.arange(len(voisins)) - np.repeat(offsets[:-1], degres)
+        table = np.full((nbr_cellules + 1, 6), nbr_cellules, dtype=np.int32)
+        table[lignes, colonnes] = voisins
+        return table, degres
+
+    def _bellman_ford_numpy(self, depart: int) -> tuple[array, array, list[int]]:
+        """
+        Exécute _etapes_bellman_ford_numpy jusqu'au bout.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre).
+        """
+        return self._executer(self._etapes_bellman_ford_numpy(depart))
+
+    def _etapes_bellman_ford_numpy(self, depart: int,
+                                  relachements: bool = False) -> Generator[Evenement, None, tuple[array, array, list[int]]]:
+        """
+        Bellman-Ford vectorisé avec NumPy : chaque passe relâche d'un coup toutes les arêtes des cellules
+        dont la distance a baissé, sous forme d'opérations sur la table d'adjacence. S'arrête dès qu'une passe
+        ne laisse plus aucune cellule en attente.
+
+        Args:
+            depart (int): La cellule de départ.
+            relachements (bool): Si True, produit aussi un événement RELACHEMENT à chaque distance améliorée ensuite.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule, à sa première atteinte.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre) où ordre liste les cellules dans l'ordre de leur première atteinte.
+        """
+        import numpy as np
+
+        nbr_cellules = self.width * self.height
+        infini = np.int64(1 << 61)  # Assez grand pour ne jamais déborder en additionnant deux infinis
+        # Les cases vides de la table pointent vers une cellule fictive à l'infini.
+        table, _ = self._table_voisins_numpy()
+
+        weights = np.frombuffer(self.weights, dtype=np.int64).copy()
+        weights[weights == self.WALL] = infini
+        distances = np.full(nbr_cellules + 1, infini, dtype=np.int64)
+        predecesseurs = np.full(nbr_cellules, -1, dtype=np.int32)
+        distances[depart] = 0
+        ordre: list[int] = []
+
+        # Les cellules en attente ont une distance qui a baissé et doivent encore relâcher leurs voisins.
+        # Chaque passe ne traite que celles dont la distance est sous un seuil (fenêtre de largeur poids_max),
+        # ce qui évite de propager des distances encore provisoires à travers toute la grille.
+        largeur_fenetre = self.poids_extremes()[1]
+        attente = np.array([depart])
+        while len(attente):
+            distances_attente = distances[attente]
+            selection = distances_attente <= distances_attente.min() + largeur_fenetre
+            actives = attente[selection]
+
+            # Les cellules à réévaluer sont les voisines des cellules actives (la table est symétrique).
+            cibles = np.unique(table[actives].ravel())
+            cibles = cibles[cibles < nbr_cellules]
+            entrants = table[cibles]
+            meilleur = np.argmin(distances[entrants], axis=1)
+            source = entrants[np.arange(len(cibles)), meilleur]
+            candidats = np.minimum(distances[source] + weights[cibles], infini)
+            ameliores = candidats < distances[cibles]
+            modifies = cibles[ameliores]
+            premieres = (distances[modifies] == infini).tolist()
+            distances[modifies] = candidats[ameliores]
+            predecesseurs[modifies] = source[ameliores]
+            for cellule, parent, distance, premiere in zip(modifies.tolist(), source[ameliores].tolist(),
+                                                          candidats[ameliores].tolist(), premieres):
+                if premiere:
+                    ordre.append(cellule)
+                    yield Evenement(EXPANSION, cellule, parent, distance)
+                elif relachements:
+                    yield Evenement(RELACHEMENT, cellule, parent, distance)
+            attente = np.union1d(attente[~selection], modifies)
+
+        distances = distances[:nbr_cellules]
+        distances[distances == infini] = INFINI
+        return array("q", distances.tobytes()), array("i", predecesseurs.tobytes()), ordre
+
+    def bellman_ford(self, start: Sommet, end: Sommet, mode: str = "spfa") -> tuple[
+        dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Implémente l'algorithme de Bellman-Ford pour déterminer les chemins les plus courts à partir d'un sommet source.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            mode (str): "spfa" (file des cellules modifiées), "passes" (passes complètes avec arrêt anticipé)
+                ou "numpy" (passes vectorisées, nécessite NumPy).
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient les sommets et leurs voisins atteignables.
+                - Le second dictionnaire contient les prédécesseurs pour reconstruire le chemin le plus court.
+        """
+        return self._consommer(self.etapes_bellman_ford(start, end, mode))
+
+    def etapes_bellman_ford(self, start: Sommet, end: Sommet, mode: str = "spfa",
+                            relachements: bool = False) -> Iterator[Evenement]:
+        """
+        Version pas à pas de bellman_ford.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            mode (str): Le moteur, comme pour bellman_ford.
+            relachements (bool): Si True, produit aussi les événements RELACHEMENT.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule à sa première atteinte, puis TROUVE et FIN.
+        """
+        moteurs = {
+            "spfa": self._etapes_bellman_ford_spfa,
+            "passes": self._etapes_bellman_ford_passes,
+            "numpy": self._etapes_bellman_ford_numpy,
+        }
+        if mode not in moteurs:
+            raise ValueError(f"Mode de Bellman-Ford inconnu : {mode}")
+
+        depart, arrivee = yield from self._extremites(start, end)
+        distances, predecesseurs, _ = yield from moteurs[mode](depart, relachements)
+        yield from self._fin(self._chemin(predecesseurs, depart, arrivee) if distances[arrivee] != INFINI else [])
+
+    def distance_hexagonale(self, a: int, b: int) -> int:
+        """
+        Calcule le nombre minimal de pas entre deux cellules sur la grille hexagonale, murs ignorés.
+        Les coordonnées décalées (colonnes impaires décalées vers le bas) sont converties en coordonnées cubiques.
+
+        Args:
+            a (int): La première cellule.
+            b (int): La seconde cellule.
+
+        Returns:
+            int: La distance hexagonale entre les deux cellules.
+        """
+        xa, ya = divmod(a, self.height)
+        xb, yb = divmod(b, self.height)
+        dq = yb - ya
+        dr = (xb - (yb - (yb & 1)) // 2) - (xa - (ya - (ya & 1)) // 2)
+        return max(abs(dq), abs(dr), abs(dq + dr))
+
+    def _a_star(self, depart: int, arrivee: int, heuristique: Callable[[int], int]) -> tuple[array, array, list[int]]:
+        """
+        Exécute _etapes_a_star jusqu'au bout.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre).
+        """
+        return self._executer(self._etapes_a_star(depart, arrivee, heuristique))
+
+    def _etapes_a_star(self, depart: int, arrivee: int, heuristique: Callable[[int], int],
+                       relachements: bool = False) -> Generator[Evenement, None, tuple[array, array, list[int]]]:
+        """
+        Coeur de l'algorithme A* : tas binaire pour les cellules ouvertes et bitmap des cellules fermées.
+        L'heuristique n'est évaluée que pour les cellules effectivement atteintes, et doit être consistante.
+
+        Args:
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée.
+            heuristique (Callable): Estimation minorante du coût restant depuis une cellule jusqu'à l'arrivée.
+            relachements (bool): Si True, produit aussi un événement RELACHEMENT à chaque distance améliorée.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fermée.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs, ordre) où ordre liste les cellules dans l'ordre où elles sont fermées.
+        """
+        nbr_cellules = self.width * self.height
+        offsets, voisins = self.adjacence()
+        weights = self.weights
+        wall = self.WALL
+        distances = array("q", [INFINI]) * nbr_cellules
+        predecesseurs = array("i", [-1]) * nbr_cellules
+        fermes = bytearray(nbr_cellules)
+        ordre: list[int] = []
+
+        distances[depart] = 0
+        # À f égal, la cellule la plus avancée (distance parcourue la plus grande) passe en premier.
+        tas: list[tuple[int, int, int]] = [(heuristique(depart), 0, depart)]
+        while tas:
+            _, distance, courant = heappop(tas)
+            if fermes[courant]:
+                continue  # Entrée périmée du tas
+            fermes[courant] = 1
+            ordre.append(courant)
+            distance = -distance
+            yield Evenement(EXPANSION, courant, predecesseurs[courant], distance)
+            if courant == arrivee:
+                break
+            for i in range(offsets[courant], offsets[courant + 1]):
+                voisin = voisins[i]
+                weight = weights[voisin]
+                if weight == wall or fermes[voisin]:
+                    continue
+                nouvelle_distance = distance + weight
+                if nouvelle_distance < distances[voisin]:
+                    distances[voisin] = nouvelle_distance
+                    predecesseurs[voisin] = courant
+                    heappush(tas, (nouvelle_distance + heuristique(voisin), -nouvelle_distance, voisin))
+                    if relachements:
+                        yield Evenement(RELACHEMENT, voisin, courant, nouvelle_distance)
+        return distances, predecesseurs, ordre
+
+    def a_star(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Implémente l'algorithme A* pour trouver le chemin le plus court entre deux sommets.
+        L'heuristique est la distance hexagonale multipliée par le plus petit poids de la grille :
+        elle ne surestime jamais le coût restant, le chemin trouvé est donc optimal.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient les sommets visités et leurs voisins atteignables.
+                - Le second dictionnaire contient les prédécesseurs pour reconstruire le chemin le plus court.
+        """
+        return self._consommer(self.etapes_a_star(start, end))
+
+    def etapes_a_star(self, start: Sommet, end: Sommet, relachements: bool = False) -> Iterator[Evenement]:
+        """
+        Version pas à pas de a_star.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            relachements (bool): Si True, produit aussi les événements RELACHEMENT.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fermée, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        poids_min = max(self.poids_extremes()[0], 0)
+        distances, predecesseurs, _ = yield from self._etapes_a_star(
+            depart, arrivee, lambda cellule: poids_min * self.distance_hexagonale(cellule, arrivee), relachements)
+        yield from self._fin(self._chemin(predecesseurs, depart, arrivee) if distances[arrivee] != INFINI else [])
+
+    def preparer_reperes(self, nbr_reperes: int = 8) -> list[int]:
+        """
+        Choisit des repères (landmarks) par sélection du point le plus éloigné et calcule les distances depuis chacun.
+        Les tables sont conservées jusqu'au prochain changement de poids de la grille.
+
+        Args:
+            nbr_reperes (int): Le nombre de repères à placer.
+
+        Returns:
+            list: Les cellules choisies comme repères.
+        """
+        return self._executer(self._etapes_reperes(nbr_reperes))
+
+    def _etapes_reperes(self, nbr_reperes: int) -> Generator[Evenement, None, list[int]]:
+        """
+        Version pas à pas de preparer_reperes : les Dijkstra depuis chaque repère produisent des événements
+        PREPARATION, et les tables ne sont enregistrées qu'une fois toutes calculées.
+
+        Args:
+            nbr_reperes (int): Le nombre de repères à placer.
+
+        Yields:
+            Evenement: Des événements PREPARATION.
+
+        Returns:
+            list: Les cellules choisies comme repères.
+        """
+        if self._reperes is not None and self._reperes[0] == self.version and len(self._reperes[1]) == nbr_reperes:
+            return self._reperes[1]
+
+        weights = self.weights
+        wall = self.WALL
+        libre = next((c for c in range(len(weights)) if weights[c] != wall), -1)
+        reperes: list[int] = []
+        tables: list[array] = []
+        if libre != -1:
+            # Le premier repère est la cellule la plus éloignée d'une cellule libre quelconque,
+            # les suivants maximisent la distance au repère le plus proche.
+            proximite, _, _ = yield from self._en_preparation(self._etapes_dijkstra(libre))
+            while len(reperes) < nbr_reperes:
+                distance, repere = max((d, c) for c, d in enumerate(proximite) if d != INFINI)
+                if reperes and distance == 0:
+                    break  # Toutes les cellules atteintes sont déjà des repères
+                distances, _, _ = yield from self._en_preparation(self._etapes_dijkstra(repere))
+                reperes.append(repere)
+                # Stockage compact : entiers 32 bits tant que les distances le permettent, -1 si inatteignable
+                maximum = max((d for d in distances if d != INFINI), default=0)
+                tables.append(array("i" if maximum < 2 ** 31 else "q", (-1 if d == INFINI else d for d in distances)))
+                proximite = array("q", map(min, proximite, distances)) if len(reperes) > 1 else distances
+        self._reperes = (self.version, reperes, tables)
+        return reperes
+
+    def a_star_reperes(self, start: Sommet, end: Sommet,
+                       nbr_reperes: int = 8) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Implémente A* avec l'heuristique ALT : l'inégalité triangulaire appliquée aux distances vers des repères
+        donne une borne inférieure bien plus serrée que la distance hexagonale quand des murs ou des zones de
+        poids élevé imposent des détours. Le chemin trouvé reste optimal.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            nbr_reperes (int): Le nombre de repères utilisés, calculés à la première requête puis réutilisés.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient les sommets visités et leurs voisins atteignables.
+                - Le second dictionnaire contient les prédécesseurs pour reconstruire le chemin le plus court.
+        """
+        return self._consommer(self.etapes_a_star_reperes(start, end, nbr_reperes))
+
+    def etapes_a_star_reperes(self, start: Sommet, end: Sommet, nbr_reperes: int = 8,
+                              relachements: bool = False) -> Iterator[Evenement]:
+        """
+        Version pas à pas de a_star_reperes.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            nbr_reperes (int): Le nombre de repères utilisés.
+            relachements (bool): Si True, produit aussi les événements RELACHEMENT.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fermée, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        yield from self._etapes_reperes(nbr_reperes)
+        weights = self.weights
+        poids_arrivee = weights[arrivee]
+        # Seuls les repères de la composante de l'arrivée donnent une borne
+        bornes = [(table, table[arrivee]) for table in self._reperes[2] if table[arrivee] != -1]
+        poids_min = max(self.poids_extremes()[0], 0)
+
+        def heuristique(cellule: int) -> int:
+            # d(v, t) >= d(L, t) - d(L, v), et d(v, t) >= d(v, L) - d(t, L) avec d(v, L) = d(L, v) - w(v) + w(L)
+            h = poids_min * self.distance_hexagonale(cellule, arrivee)
+            poids_ecart = poids_arrivee - weights[cellule]
+            for table, vers_arrivee in bornes:
+                ecart = vers_arrivee - table[cellule]
+                if ecart > h:
+                    h = ecart
+                if poids_ecart - ecart > h:
+                    h = poids_ecart - ecart
+            return h
+
+        distances, predecesseurs, _ = yield from self._etapes_a_star(depart, arrivee, heuristique, relachements)
+        yield from self._fin(self._chemin(predecesseurs, depart, arrivee) if distances[arrivee] != INFINI else [])
+
+    def a_star_bidirectionnel(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Implémente A* bidirectionnel avec la même heuristique hexagonale que a_star, appliquée vers chaque extrémité.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient les sommets visités par les deux fronts et leurs voisins atteints.
+                - Le second dictionnaire contient le chemin le plus court du sommet de départ au sommet d'arrivée.
+        """
+        return self._consommer(self.etapes_a_star_bidirectionnel(start, end))
+
+    def etapes_a_star_bidirectionnel(self, start: Sommet, end: Sommet, relachements: bool = False) -> Iterator[Evenement]:
+        """
+        Version pas à pas de a_star_bidirectionnel.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            relachements (bool): Si True, produit aussi les événements RELACHEMENT.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule fixée dans l'un des deux fronts, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        poids_min = max(self.poids_extremes()[0], 0)
+        _, chemin = yield from self._etapes_bidirectionnel(
+            depart, arrivee,
+            lambda cellule: poids_min * (self.distance_hexagonale(cellule, arrivee) - self.distance_hexagonale(cellule, depart)),
+            relachements)
+        yield from self._fin(chemin)
+
+    def _mesurer(self, depart: int, arrivee: int, algorithme: str) -> tuple[int, int]:
+        """
+        Calcule le coût et le nombre de pas du chemin trouvé par un algorithme, sans construire de Sommet.
+
+        Args:
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée.
+            algorithme (str): Le nom de l'algorithme, parmi ALGORITHMES_LOT.
+
+        Returns:
+            tuple: Un tuple (coût, nombre de pas), (-1, -1) si l'arrivée est inatteignable.
+        """
+        if not self.sont_connectees(depart, arrivee):
+            return -1, -1
+        if algorithme in ("bidirectional_dijkstra", "bidirectional_a_star"):
+            potentiel = None
+            if algorithme == "bidirectional_a_star":
+                poids_min = max(self.poids_extremes()[0], 0)
+                potentiel = lambda cellule: poids_min * (self.distance_hexagonale(cellule, arrivee)
+                                                         - self.distance_hexagonale(cellule, depart))
+            cout, chemin = self._bidirectionnel(depart, arrivee, potentiel)
+            return cout, len(chemin) - 1
+
+        if algorithme == "bfs":
+            predecesseurs, _ = self._largeur(depart, arrivee)
+        elif algorithme == "dijkstra":
+            _, predecesseurs, _ = self._dijkstra(depart, arrivee)
+        elif algorithme == "dial":
+            _, predecesseurs, _ = self._dial(depart, arrivee)
+        elif algorithme == "a_star":
+            poids_min = max(self.poids_extremes()[0], 0)
+            _, predecesseurs, _ = self._a_star(
+                depart, arrivee, lambda cellule: poids_min * self.distance_hexagonale(cellule, arrivee))
+        else:
+            raise ValueError(f"Algorithme inconnu : {algorithme}")
+        cout = longueur = 0
+        courant = arrivee
+        while courant != depart:
+            cout += self.weights[courant]
+            longueur += 1
+            courant = predecesseurs[courant]
+        return cout, longueur
+
+    def lot(self, paires: list[tuple[int, int]], algorithme: str = "dijkstra",
+            processus: Optional[int] = None) -> tuple[array, array]:
+        """
+        Résout un lot de requêtes départ/arrivée en parallèle sur un pool de processus.
+        La grille n'est envoyée qu'une fois à chaque processus, pas à chaque requête.
+
+        Args:
+            paires (list): Les couples (cellule de départ, cellule d'arrivée).
+            algorithme (str): Le nom de l'algorithme, parmi ALGORITHMES_LOT.
+            processus (int, optional): Le nombre de processus, par défaut le nombre de cœurs.
+
+        Returns:
+            tuple: Un tuple (couts, longueurs) de tableaux alignés sur les paires, -1 si l'arrivée est inatteignable.
+        """
+        if algorithme not in ALGORITHMES_LOT:
+            raise ValueError(f"Algorithme inconnu : {algorithme}")
+        processus = processus or os.cpu_count() or 1
+        if processus == 1 or len(paires) < LOT_MIN_PARALLELE:
+            resultats = [self._mesurer(depart, arrivee, algorithme) for depart, arrivee in paires]
+        else:
+            with ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_lot,
+                                     initargs=(self.height, self.width, self.weights)) as pool:
+                resultats = list(pool.map(_mesurer_lot, repeat(algorithme), paires,
+                                          chunksize=max(1, len(paires) // (4 * processus))))
+        return array("q", (cout for cout, _ in resultats)), array("i", (longueur for _, longueur in resultats))
+
+    def lpa_star(self, start: Sommet, end: Sommet) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Calcule le chemin le plus court avec LPA* (Lifelong Planning A*). L'état de la recherche est conservé
+        sur la grille entre deux appels pour le même couple départ/arrivée : après quelques modifications de poids,
+        seules les cellules concernées sont réparées au lieu de tout recalculer.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient les sommets (ré)évalués lors de cet appel et leurs voisins atteints.
+                - Le second dictionnaire contient le chemin le plus court du sommet de départ au sommet d'arrivée.
+        """
+        return self._consommer(self.etapes_lpa_star(start, end))
+
+    def etapes_lpa_star(self, start: Sommet, end: Sommet) -> Iterator[Evenement]:
+        """
+        Version pas à pas de lpa_star.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule (ré)évaluée lors de cet appel, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        planificateur = self._planificateur
+        if planificateur is None or (planificateur.depart, planificateur.arrivee) != (depart, arrivee):
+            if planificateur is not None:
+                self._abonnes.remove(planificateur.signaler)
+            planificateur = PlanificateurIncremental(self, depart, arrivee)
+            self._abonnes.append(planificateur.signaler)
+            self._planificateur = planificateur
+
+        chemin = yield from planificateur.resoudre()
+        yield from self._fin(chemin, planificateur.g[arrivee] if chemin else None)
+
+    def hpa_star(self, start: Sommet, end: Sommet, raffiner: bool = True,
+                 taille_cluster: int = 16) -> tuple[dict[Sommet, set[Sommet]], dict[Sommet, Sommet]]:
+        """
+        Calcule un chemin avec HPA* : la grille est découpée en clusters, la recherche se fait sur le graphe abstrait
+        des entrées entre clusters, puis seuls les clusters traversés sont raffinés. Les coûts internes d'un cluster
+        sont calculés à la première utilisation et conservés tant qu'aucun poids du cluster ne change.
+        Le chemin obtenu est quasi optimal (les entrées ne sont qu'un sous-ensemble des cellules de bordure).
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            raffiner (bool): Si True, retourne le chemin complet cellule par cellule, sinon seulement la suite
+                des entrées traversées.
+            taille_cluster (int): Le côté d'un cluster, en cellules.
+
+        Returns:
+            tuple: Un tuple contenant deux dictionnaires :
+                - Le premier dictionnaire contient les nœuds abstraits explorés et leurs successeurs.
+                - Le second dictionnaire contient le chemin du sommet de départ au sommet d'arrivée.
+        """
+        return self._consommer(self.etapes_hpa_star(start, end, raffiner, taille_cluster))
+
+    def etapes_hpa_star(self, start: Sommet, end: Sommet, raffiner: bool = True,
+                        taille_cluster: int = 16) -> Iterator[Evenement]:
+        """
+        Version pas à pas de hpa_star.
+
+        Args:
+            start (Sommet): Le sommet de départ.
+            end (Sommet): Le sommet d'arrivée.
+            raffiner (bool): Si True, le chemin de TROUVE est complet, sinon il ne contient que les entrées traversées.
+            taille_cluster (int): Le côté d'un cluster, en cellules.
+
+        Yields:
+            Evenement: Un événement EXPANSION par nœud abstrait fermé, puis TROUVE et FIN.
+        """
+        depart, arrivee = yield from self._extremites(start, end)
+        hierarchie = self._hierarchie
+        if hierarchie is None or hierarchie.taille != taille_cluster:
+            if hierarchie is not None:
+                self._abonnes.remove(hierarchie.signaler)
+            hierarchie = HierarchieClusters(self, taille_cluster)
+            self._abonnes.append(hierarchie.signaler)
+            self._hierarchie = hierarchie
+
+        chemin, cout = yield from hierarchie.rechercher(depart, arrivee)
+        if chemin and raffiner:
+            chemin = hierarchie.raffiner(chemin)
+        yield from self._fin(chemin, cout if chemin else None)
+
+
+_grille_lot: Optional[Grille] = None  # Copie de la grille dans un processus du pool de lot
+
+
+def _initialiser_lot(height: int, width: int, weights: array) -> None:
+    """
+    Reconstruit la grille une fois au démarrage d'un processus du pool de Grille.lot.
+
+    Args:
+        height (int): Hauteur de la grille.
+        width (int): Largeur de la grille.
+        weights (array): Les poids de la grille.
+    """
+    global _grille_lot
+    _grille_lot = Grille(height, width)
+    _grille_lot._remplacer_poids(weights)
+
+
+def _mesurer_lot(algorithme: str, paire: tuple[int, int]) -> tuple[int, int]:
+    """
+    Traite une requête d'un lot dans un processus du pool.
+
+    Args:
+        algorithme (str): Le nom de l'algorithme.
+        paire (tuple): La cellule de départ et la cellule d'arrivée.
+
+    Returns:
+        tuple: Un tuple (coût, nombre de pas).
+    """
+    return _grille_lot._mesurer(paire[0], paire[1], algorithme)
+
+
+class PlanificateurIncremental:
+    """
+    Recherche de plus court chemin incrémentale (Lifelong Planning A*) entre deux cellules fixes d'une grille.
+
+    Chaque cellule garde g (distance connue) et rhs (distance déduite de ses voisins). Une modification de poids
+    ne touche que le rhs de la cellule modifiée, et seules les cellules rendues incohérentes (g != rhs)
+    repassent par la file de priorité au prochain appel de resoudre.
+
+    Attributes:
+        grille (Grille): La grille sur laquelle porte la recherche.
+        depart (int): La cellule de départ.
+        arrivee (int): La cellule d'arrivée.
+        poids_min (int): Le poids minimum utilisé par l'heuristique hexagonale.
+
+    Args:
+        grille (Grille): La grille sur laquelle porte la recherche.
+        depart (int): La cellule de départ.
+        arrivee (int): La cellule d'arrivée.
+    """
+
+    def __init__(self, grille: Grille, depart: int, arrivee: int) -> None:
+        self.grille: Grille = grille
+        self.depart: int = depart
+        self.arrivee: int = arrivee
+        self._reinitialiser()
+
+    def _reinitialiser(self) -> None:
+        """
+        Repart d'un état vide : seule la cellule de départ est dans la file.
+        """
+        nbr_cellules = self.grille.width * self.grille.height
+        self.poids_min: int = max(self.grille.poids_extremes()[0], 0)
+        self.g: array = array("q", [INFINI]) * nbr_cellules
+        self.rhs: array = array("q", [INFINI]) * nbr_cellules
+        self._cles: dict[int, tuple[int, int]] = {}  # Clé courante de chaque cellule présente dans la file
+        self._tas: list[tuple[tuple[int, int], int]] = []
+        self._modifiees: set[int] = set()
+        self.rhs[self.depart] = 0
+        self._inserer(self.depart)
+
+    def signaler(self, cellule: int) -> None:
+        """
+        Enregistre qu'une cellule a changé de poids, elle sera prise en compte au prochain appel de resoudre.
+
+        Args:
+            cellule (int): La cellule modifiée.
+        """
+        self._modifiees.add(cellule)
+
+    def _cle(self, cellule: int) -> tuple[int, int]:
+        minimum = min(self.g[cellule], self.rhs[cellule])
+        return minimum + self.poids_min * self.grille.distance_hexagonale(cellule, self.arrivee), minimum
+
+    def _inserer(self, cellule: int) -> None:
+        cle = self._cle(cellule)
+        self._cles[cellule] = cle
+        heappush(self._tas, (cle, cellule))
+
+    def _meilleur_voisin(self, cellule: int) -> tuple[int, int]:
+        """
+        Retourne le voisin de plus petit g, par lequel passe le meilleur chemin connu vers la cellule.
+
+        Args:
+            cellule (int): La cellule considérée.
+
+        Returns:
+            tuple: Un tuple (voisin, g du voisin), (-1, INFINI) si aucun voisin n'est atteint.
+        """
+        offsets, voisins = self.grille.adjacence()
+        g = self.g
+        meilleur, distance = -1, INFINI
+        for i in range(offsets[cellule], offsets[cellule + 1]):
+            voisin = voisins[i]
+            if g[voisin] < distance:
+                meilleur, distance = voisin, g[voisin]
+        return meilleur, distance
+
+    def _maj_cellule(self, cellule: int) -> None:
+        """
+        Recalcule le rhs d'une cellule et la (re)place dans la file si elle est incohérente.
+
+        Args:
+            cellule (int): La cellule à mettre à jour.
+        """
+        if cellule != self.depart:
+            weight = self.grille.weights[cellule]
+            _, distance = self._meilleur_voisin(cellule)
+            # Toutes les arêtes entrant dans une cellule coûtent son poids, un mur n'en reçoit aucune.
+            self.rhs[cellule] = INFINI if weight == self.grille.WALL or distance == INFINI else distance + weight
+        self._cles.pop(cellule, None)
+        if self.g[cellule] != self.rhs[cellule]:
+            self._inserer(cellule)
+
+    def _sommet_file(self) -> Optional[tuple[tuple[int, int], int]]:
+        tas = self._tas
+        while tas and self._cles.get(tas[0][1]) != tas[0][0]:
+            heappop(tas)  # Entrée périmée
+        return tas[0] if tas else None
+
+    def resoudre(self) -> Generator[Evenement, None, list[int]]:
+        """
+        Applique les modifications signalées puis répare les distances jusqu'à ce que l'arrivée soit cohérente.
+
+        Yields:
+            Evenement: Un événement EXPANSION par cellule dont la distance est fixée lors de cet appel.
+
+        Returns:
+            list: Les cellules du départ à l'arrivée, vide si elles ne sont pas connectées.
+        """
+        if self.grille.poids_extremes()[0] < self.poids_min:
+            self._reinitialiser()  # L'heuristique pourrait surestimer : on repart de zéro
+        for cellule in self._modifiees:
+            self._maj_cellule(cellule)
+        self._modifiees.clear()
+
+        offsets, voisins = self.grille.adjacence()
+        g, rhs = self.g, self.rhs
+        arrivee = self.arrivee
+        while True:
+            sommet = self._sommet_file()
+            if sommet is None or (sommet[0] >= self._cle(arrivee) and rhs[arrivee] == g[arrivee]):
+                break
+            heappop(self._tas)
+            courant = sommet[1]
+            del self._cles[courant]
+            if g[courant] > rhs[courant]:
+                g[courant] = rhs[courant]
+                parent = self._meilleur_voisin(courant)[0] if courant != self.depart else -1
+                yield Evenement(EXPANSION, courant, parent, g[courant])
+            else:
+                g[courant] = INFINI
+                self._maj_cellule(courant)
+            for i in range(offsets[courant], offsets[courant + 1]):
+                self._maj_cellule(voisins[i])
+
+        if g[arrivee] == INFINI:
+            return []
+        chemin = [arrivee]
+        while chemin[-1] != self.depart:
+            chemin.append(self._meilleur_voisin(chemin[-1])[0])
+        chemin.reverse()
+        return chemin
+
+
+class HierarchieClusters:
+    """
+    Graphe abstrait de HPA* au-dessus d'une grille découpée en clusters carrés.
+
+    Sur chaque frontière entre deux clusters, les passages libres contigus forment une entrée ; chaque entrée est
+    représentée par un passage (son milieu, ou ses deux extrémités si elle est longue). Les arêtes internes d'un
+    cluster relient ses cellules d'entrée avec le coût exact du plus court chemin restant dans le cluster.
+    Tout est calculé à la demande et mis en cache : un changement de poids n'invalide que le cluster qui le
+    contient, et les frontières voisines seulement si une cellule de bordure devient ou cesse d'être un mur.
+
+    Attributes:
+        grille (Grille): La grille découpée.
+        taille (int): Le côté d'un cluster, en cellules.
+
+    Args:
+        grille (Grille): La grille découpée.
+        taille (int): Le côté d'un cluster, en cellules.
+    """
+
+    ENTREE_LONGUE: int = 6  # À partir de cette longueur, une entrée est représentée par ses deux extrémités
+
+    def __init__(self, grille: Grille, taille: int) -> None:
+        self.grille: Grille = grille
+        self.taille: int = taille
+        self._clusters_y: int = -(-grille.height // taille)  # Nombre de clusters par colonne de clusters
+        self._murs: bytearray = bytearray(w == grille.WALL for w in grille.weights)
+        self._frontieres: dict[tuple[int, int], list[tuple[int, int]]] = {}  # (A, B) avec A < B -> passages (a, b)
+        self._aretes: dict[int, dict[int, list[tuple[int, int]]]] = {}  # Cluster -> entrée -> [(entrée, coût)]
+        self._passages: dict[int, dict[int, list[int]]] = {}  # Cluster -> entrée -> cellules d'en face
+
+    def cluster(self, cellule: int) -> int:
+        """
+        Retourne l'indice du cluster contenant une cellule.
+
+        Args:
+            cellule (int): La cellule.
+
+        Returns:
+            int: L'indice du cluster.
+        """
+        x, y = divmod(cellule, self.grille.height)
+        return (x // self.taille) * self._clusters_y + y // self.taille
+
+    def _bornes(self, cluster: int) -> tuple[int, int, int, int]:
+        """
+        Retourne l'étendue d'un cluster.
+
+        Args:
+            cluster (int): L'indice du cluster.
+
+        Returns:
+            tuple: Un tuple (x0, y0, x1, y1), bornes de fin exclues.
+        """
+        cx, cy = divmod(cluster, self._clusters_y)
+        x0, y0 = cx * self.taille, cy * self.taille
+        return x0, y0, min(x0 + self.taille, self.grille.width), min(y0 + self.taille, self.grille.height)
+
+    def _libres(self, cluster: int) -> set[int]:
+        """
+        Retourne les cellules d'un cluster qui ne sont pas des murs.
+
+        Args:
+            cluster (int): L'indice du cluster.
+
+        Returns:
+            set: Les cellules libres du cluster.
+        """
+        height, weights, wall = self.grille.height, self.grille.weights, self.grille.WALL
+        x0, y0, x1, y1 = self._bornes(cluster)
+        return {c for x in range(x0, x1) for c in range(x * height + y0, x * height + y1) if weights[c] != wall}
+
+    def _bordure(self, cluster: int) -> list[int]:
+        """
+        Retourne les cellules situées sur le bord d'un cluster.
+
+        Args:
+            cluster (int): L'indice du cluster.
+
+        Returns:
+            list: Les cellules du bord, chacune une seule fois.
+        """
+        height = self.grille.height
+        x0, y0, x1, y1 = self._bornes(cluster)
+        bord = set()
+        for x in range(x0, x1):
+            bord.add(x * height + y0)
+            bord.add(x * height + y1 - 1)
+        for y in range(y0, y1):
+            bord.add(x0 * height + y)
+            bord.add((x1 - 1) * height + y)
+        return sorted(bord)
+
+    def signaler(self, cellule: int) -> None:
+        """
+        Invalide le cache du cluster contenant une cellule dont le poids a changé, ainsi que les frontières
+        concernées si la cellule est devenue ou a cessé d'être un mur.
+
+        Args:
+            cellule (int): La cellule modifiée.
+        """
+        cluster = self.cluster(cellule)
+        self._aretes.pop(cluster, None)
+        self._passages.pop(cluster, None)
+        mur = self.grille.weights[cellule] == self.grille.WALL
+        if mur == self._murs[cellule]:
+            return
+        self._murs[cellule] = mur
+        offsets, voisins = self.grille.adjacence()
+        for i in range(offsets[cellule], offsets[cellule + 1]):
+            autre = self.cluster(voisins[i])
+            if autre != cluster:
+                self._frontieres.pop((min(cluster, autre), max(cluster, autre)), None)
+                self._aretes.pop(autre, None)
+                self._passages.pop(autre, None)
+
+    def _frontiere(self, a: int, b: int) -> list[tuple[int, int]]:
+        """
+        Retourne les passages retenus entre deux clusters voisins, calculés depuis le cluster d'indice le plus petit
+        pour que les deux côtés voient les mêmes.
+
+        Args:
+            a (int): Le cluster d'indice le plus petit.
+            b (int): L'autre cluster.
+
+        Returns:
+            list: Les passages (cellule de a, cellule de b).
+        """
+        if (a, b) in self._frontieres:
+            return self._frontieres[(a, b)]
+        grille = self.grille
+        weights, wall = grille.weights, grille.WALL
+        offsets, voisins = grille.adjacence()
+        libres = []
+        for cellule in self._bordure(a):
+            if weights[cellule] == wall:
+                continue
+            for i in range(offsets[cellule], offsets[cellule + 1]):
+                voisin = voisins[i]
+                if weights[voisin] != wall and self.cluster(voisin) == b:
+                    libres.append((cellule, voisin))
+
+        # Regroupe les passages contigus le long de la frontière en entrées
+        entrees: list[list[tuple[int, int]]] = []
+        for passage in libres:
+            if entrees and any(grille.distance_hexagonale(passage[0], p[0]) <= 1
+                               and grille.distance_hexagonale(passage[1], p[1]) <= 1 for p in entrees[-1]):
+                entrees[-1].append(passage)
+            else:
+                entrees.append([passage])
+        retenus = []
+        for entree in entrees:
+            if len(entree) >= self.ENTREE_LONGUE:
+                retenus.extend((entree[0], entree[-1]))
+            else:
+                retenus.append(entree[len(entree) // 2])
+        self._frontieres[(a, b)] = retenus
+        return retenus
+
+    def _dijkstra_local(self, source: int, inverse: bool = False, cible: int = -1,
+                        libres: Optional[set[int]] = None) -> tuple[dict[int, int], dict[int, int]]:
+        """
+        Dijkstra restreint au cluster de la source.
+
+        Args:
+            source (int): La cellule source.
+            inverse (bool): Si True, calcule les distances vers la source plutôt que depuis elle.
+            cible (int): Arrête la recherche dès que cette cellule est fixée.
+            libres (set, optional): Les cellules libres du cluster, si elles sont déjà connues.
+
+        Returns:
+            tuple: Un tuple (distances, predecesseurs) limité aux cellules atteintes du cluster.
+        """
+        weights = self.grille.weights
+        offsets, voisins = self.grille.adjacence()
+        if libres is None:
+            libres = self._libres(self.cluster(source))
+        distances = {source: 0}
+        predecesseurs: dict[int, int] = {}
+        fixees = set()
+        tas = [(0, source)]
+        while tas:
+            distance, courant = heappop(tas)
+            if courant in fixees:
+                continue
+            fixees.add(courant)
+            if courant == cible:
+                break
+            # Une arête u -> v coûte le poids de v : en sens inverse, on paie le poids de la cellule quittée.
+            cout_inverse = distance + weights[courant]
+            for i in range(offsets[courant], offsets[courant + 1]):
+                voisin = voisins[i]
+                if voisin in fixees or voisin not in libres:
+                    continue
+                nouvelle = cout_inverse if inverse else distance + weights[voisin]
+                if nouvelle < distances.get(voisin, INFINI):
+                    distances[voisin] = nouvelle
+                    predecesseurs[voisin] = courant
+                    heappush(tas, (nouvelle, voisin))
+        return distances, predecesseurs
+
+    def _construire(self, cluster: int) -> None:
+        """
+        Calcule les entrées d'un cluster, leurs passages vers les clusters voisins et les arêtes internes.
+
+        Args:
+            cluster (int): L'indice du cluster.
+        """
+        cx, cy = divmod(cluster, self._clusters_y)
+        clusters_x = -(-self.grille.width // self.taille)
+        passages: dict[int, list[int]] = {}
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if (dx or dy) and 0 <= cx + dx < clusters_x and 0 <= cy + dy < self._clusters_y:
+                    autre = (cx + dx) * self._clusters_y + cy + dy
+                    for a, b in self._frontiere(min(cluster, autre), max(cluster, autre)):
+                        interne, externe = (a, b) if autre > cluster else (b, a)
+                        passages.setdefault(interne, []).append(externe)
+
+        aretes: dict[int, list[tuple[int, int]]] = {}
+        libres = self._libres(cluster)
+        for entree in passages:
+            distances, _ = self._dijkstra_local(entree, libres=libres)
+            aretes[entree] = [(autre, distances[autre]) for autre in passages
+                              if autre != entree and autre in distances]
+        self._passages[cluster] = passages
+        self._aretes[cluster] = aretes
+
+    def _successeurs(self, cellule: int) -> list[tuple[int, int]]:
+        """
+        Retourne les arêtes abstraites sortant d'une cellule : arêtes internes puis passages (aucune si la cellule
+        n'est pas une entrée de son cluster).
+
+        Args:
+            cellule (int): La cellule.
+
+        Returns:
+            list: Les couples (successeur, coût).
+        """
+        cluster = self.cluster(cellule)
+        if cluster not in self._aretes:
+            self._construire(cluster)
+        weights = self.grille.weights
+        successeurs = list(self._aretes[cluster].get(cellule, ()))
+        successeurs.extend((autre, weights[autre]) for autre in self._passages[cluster].get(cellule, ()))
+        return successeurs
+
+    def rechercher(self, depart: int, arrivee: int) -> Generator[Evenement, None, tuple[list[int], int]]:
+        """
+        Cherche un chemin sur le graphe abstrait, le départ et l'arrivée y étant reliés aux entrées de leur cluster.
+
+        Args:
+            depart (int): La cellule de départ.
+            arrivee (int): La cellule d'arrivée.
+
+        Yields:
+            Evenement: Un événement EXPANSION par nœud abstrait fermé.
+
+        Returns:
+            tuple: Un tuple (chemin, cout) où chemin est la suite des nœuds abstraits du départ à l'arrivée
+                (vide si aucun chemin n'existe).
+        """
+        grille = self.grille
+        cluster_depart, cluster_arrivee = self.cluster(depart), self.cluster(arrivee)
+        for cluster in (cluster_depart, cluster_arrivee):
+            if cluster not in self._aretes:
+                self._construire(cluster)
+
+        depuis_depart, _ = self._dijkstra_local(depart)
+        vers_arrivee, _ = self._dijkstra_local(arrivee, inverse=True)
+        aretes_depart = [(e, depuis_depart[e]) for e in self._passages[cluster_depart] if e in depuis_depart]
+        if arrivee in depuis_depart:
+            aretes_depart.append((arrivee, depuis_depart[arrivee]))
+        sorties = {e: vers_arrivee[e] for e in self._passages[cluster_arrivee] if e in vers_arrivee}
+
+        poids_min = max(grille.poids_extremes()[0], 0)
+        distances = {depart: 0}
+        parents: dict[int, int] = {}
+        fermes = set()
+        tas = [(poids_min * grille.distance_hexagonale(depart, arrivee), 0, depart)]
+        while tas:
+            _, distance, courant = heappop(tas)
+            if courant in fermes:
+                continue
+            fermes.add(courant)
+            yield Evenement(EXPANSION, courant, parents.get(courant, -1), distance)
+            if courant == arrivee:
+                break
+            successeurs = self._successeurs(courant)
+            if courant == depart:
+                successeurs.extend(aretes_depart)
+            if courant in sorties:
+                successeurs.append((arrivee, sorties[courant]))
+            for voisin, cout in successeurs:
+                nouvelle = distance + cout
+                if voisin not in fermes and nouvelle < distances.get(voisin, INFINI):
+                    distances[voisin] = nouvelle
+                    parents[voisin] = courant
+                    heappush(tas, (nouvelle + poids_min * grille.distance_hexagonale(voisin, arrivee), nouvelle, voisin))
+
+        if arrivee not in fermes:
+            return [], INFINI
+        chemin = [arrivee]
+        while chemin[-1] != depart:
+            chemin.append(parents[chemin[-1]])
+        chemin.reverse()
+        return chemin, distances[arrivee]
+
+    def raffiner(self, chemin_abstrait: list[int]) -> list[int]:
+        """
+        Remplace chaque arête interne d'un chemin abstrait par le plus court chemin correspondant dans son cluster.
+
+        Args:
+            chemin_abstrait (list): Les nœuds abstraits du départ à l'arrivée.
+
+        Returns:
+            list: Les cellules du chemin complet.
+        """
+        chemin = [chemin_abstrait[0]]
+        for a, b in zip(chemin_abstrait, chemin_abstrait[1:]):
+            if self.cluster(a) != self.cluster(b):
+                chemin.append(b)  # Passage entre deux clusters voisins
+                continue
+            _, predecesseurs = self._dijkstra_local(a, cible=b)
+            morceau = [b]
+            while morceau[-1] != a:
+                morceau.append(predecesseurs[morceau[-1]])
+            chemin.extend(reversed(morceau[:-1]))
+        return chemin
@@ -1,18 +1,93 @@
+import hashlib
+import io
+import os
+from array import array
+from contextlib import contextmanager
+from json import dumps
+from threading import Event
+from typing import Literal, Optional
+
 from pydantic import Field
 from flask_cors import CORS
 
-from flask import Flask, request, jsonify
-from pydantic import BaseModel
+from flask import Flask, g, request, jsonify
+from pydantic import BaseModel, ConfigDict
 from spectree import SpecTree, Response
 from sae5_graphes import models
+from sae5_graphes.magasin import MagasinGrilles
 from exceptions import *
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=["ETag", "X-Grid-Height", "X-Grid-Width"])
 api = SpecTree('flask')
 
-# La grille de base est 20x20
-grille = models.Grille(5, 5)
+# Une grille par session (en-tête X-Grid-Id), la grille de base est 5x5
+magasin = MagasinGrilles(lambda: models.Grille(5, 5))
+
+
+def session():
+    """
+    Identifiant de la session de la requête, "default" sans en-tête X-Grid-Id.
+    """
+    return request.headers.get("X-Grid-Id", "default")
+
+
+@contextmanager
+def grille_session(ecriture=False):
+    """
+    Donne la grille de la session, verrouillée en lecture (plusieurs requêtes à la fois) ou en écriture
+    (seule) le temps du bloc with. L'empreinte de la grille lue est retenue pour l'ETag de la réponse.
+    """
+    grille, verrou = magasin.obtenir(session())
+    with verrou.ecriture() if ecriture else verrou.lecture():
+        g.empreinte_grille = grille.empreinte
+        yield grille
+
+
+# Clé des ETag, tirée à chaque démarrage : un ETag émis par un autre processus ne correspond jamais
+CLE_ETAG = os.urandom(16)
+
+
+def etag(empreinte):
+    """
+    ETag d'une réponse : l'empreinte de la grille et la requête (méthode, route, paramètres, Accept, corps).
+    """
+    generation, version = empreinte
+    hachage = hashlib.blake2b(key=CLE_ETAG, digest_size=12)
+    hachage.update(f"{generation}.{version} {request.method} {request.full_path} "
+                   f"{request.headers.get('Accept', '')}\n".encode())
+    hachage.update(request.get_data())
+    return hachage.hexdigest()
+
+
+@app.before_request
+def reponse_inchangee():
+    """
+    Répond 304 à un GET ou POST dont l'en-tête If-None-Match porte l'ETag actuel, sans verrouiller ni lire
+    la grille : seule son empreinte est comparée. If-None-Match: * est toujours satisfait par un GET (304),
+    jamais par un POST (412).
+    """
+    if request.method in ("GET", "POST") and request.if_none_match:
+        if request.method == "POST" and request.if_none_match.star_tag:
+            return jsonify({"error": "If-None-Match: * n'est pas applicable à une requête POST"}), 412
+        grille, _ = magasin.obtenir(session())
+        valeur = etag(grille.empreinte)
+        if request.if_none_match.contains_weak(valeur):
+            reponse = app.response_class(status=304)
+            reponse.set_etag(valeur)
+            return reponse
+
+
+@app.after_request
+def ajouter_etag(reponse):
+    """
+    Ajoute l'ETag aux réponses 200 des GET et POST qui ont lu la grille de la session. Les diffusions
+    d'événements n'en ont pas : elles sont suivies en direct et jamais mises en cache.
+    """
+    if (request.method in ("GET", "POST") and reponse.status_code == 200 and not reponse.is_streamed
+            and "empreinte_grille" in g):
+        reponse.set_etag(etag(g.empreinte_grille))
+    return reponse
 
 
 class GridSize(BaseModel):
@@ -25,6 +100,21 @@ class GridWeights(BaseModel):
                                   description="Liste des poids de la grille")
 
 
+class GridWeightChanges(BaseModel):
+    changes: list[tuple[int, int, int]] = Field([], title="Modifications ponctuelles",
+                                                description="Liste de (x, y, poids)")
+    rectangles: list[tuple[int, int, int, int, int]] = Field([], title="Remplissages de rectangles",
+                                                             description="Liste de (x1, y1, x2, y2, poids), coins inclus")
+
+
+# Types MIME des formats compacts de /grid/weights (poids dans l'ordre des cellules, colonne par colonne)
+FORMATS_MIME = {
+    "application/x-grid-uint16": models.POIDS_UINT16,
+    "application/x-grid-uint32": models.POIDS_UINT32,
+    "application/x-grid-rle": models.POIDS_RLE,
+}
+
+
 # ---- Actions sur la grille ---- #
 @app.route('/grid/dimensions', methods=['GET'])
 @api.validate(tags=["Grille"])
@@ -33,10 +123,11 @@ def get_grid_dimensions():
     Obtenir la grille entière sous de dimensions Hauteur-Largeur.
     """
     try:
-        response = {
-            "height": grille.height,
-            "width": grille.width
-        }
+        with grille_session() as grille:
+            response = {
+                "height": grille.height,
+                "width": grille.width
+            }
         if response:
             return jsonify(response), 200
         else:
@@ -58,9 +149,8 @@ def edit_grid(json: GridSize):
         if json.height < 2 or json.width < 2:
             return jsonify({"error": "La grille a une taille trop petite"}), 400
 
-        # [Requête back-end] - MAJ de la grille
-        global grille
-        grille = models.Grille(json.height, json.width)
+        # [Requête back-end] - MAJ de la grille de la session
+        grille, _ = magasin.remplacer(session(), models.Grille(json.height, json.width))
         return jsonify({"height": grille.height, "width": grille.width}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -71,13 +161,25 @@ def edit_grid(json: GridSize):
 def get_grid_weights():
     """
     Obtenir la grille des poids sous forme de tableau 2D.
+    Avec un en-tête Accept application/x-grid-uint16, application/x-grid-uint32 ou application/x-grid-rle,
+    les poids sont envoyés en binaire et les dimensions dans les en-têtes X-Grid-Height et X-Grid-Width.
     """
+    vary = {"Vary": "Accept"}
     try:
-        grid_repr = [[sommet.weight for sommet in row] for row in grille.tab]
+        mimetype = request.accept_mimetypes.best_match(["application/json", *FORMATS_MIME])
+        if mimetype in FORMATS_MIME:
+            with grille_session() as grille:
+                donnees = grille.poids_en_octets(FORMATS_MIME[mimetype])
+                headers = {"X-Grid-Height": str(grille.height), "X-Grid-Width": str(grille.width), **vary}
+            return app.response_class(donnees, mimetype=mimetype, headers=headers), 200
+        with grille_session() as grille:
+            grid_repr = [grille.weights[x * grille.height:(x + 1) * grille.height].tolist() for x in range(grille.width)]
         if grid_repr:
-            return jsonify(grid_repr), 200
+            return jsonify(grid_repr), 200, vary
         else:
-            return jsonify({"error": "Le poids de la grille n'ont pas pu être déterminés"}), 404
+            return jsonify({"error": "Le poids de la grille n'ont pas pu être déterminés"}), 404, vary
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 406, vary
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -87,38 +189,240 @@ def get_grid_weights():
 def update_grid_weights(json: GridWeights):
     """
     Mise à jour des poids de plusieurs sommets spécifiques de la grille.
+    Un corps application/x-grid-uint16, application/x-grid-uint32 ou application/x-grid-rle remplace tous les
+    poids sans validation cellule par cellule : les poids sont vérifiés d'un bloc.
     """
+    if request.mimetype in FORMATS_MIME:
+        try:
+            with grille_session(ecriture=True) as grille:
+                changed = grille.poids_depuis_octets(request.get_data(), FORMATS_MIME[request.mimetype])
+                return jsonify({"changed": changed, "version": grille.version}), 200
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except BadWeightException as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
     try:
-        columns = len(json.grid)
-        rows = len(json.grid[0])
+        with grille_session(ecriture=True) as grille:
+            # Même disposition que GET /grid/weights : une liste par x, de hauteur éléments chacune
+            if len(json.grid) != grille.width or any(len(ligne) != grille.height for ligne in json.grid):
+                return jsonify({"error": "La grille a une taille different de la requête"}), 400
 
-        if columns != grille.height or rows != grille.width:
-            return jsonify({"error": "La grille a une taille different de la requête"}), 400
-
-        for col in range(columns):
-            for row in range(rows):
-                grille.tab[col][row].weight = json.grid[col][row]
+            weights = array("q")
+            for ligne in json.grid:
+                weights.extend(ligne)
+            grille.remplacer_poids(weights)
 
         return jsonify({"message": "Tous les poids de la grille ont été mis à jour avec succès"}), 200
+    except BadWeightException as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/grid/weights', methods=['PATCH'])
+@api.validate(tags=["Grille"], json=GridWeightChanges)
+def patch_grid_weights(json: GridWeightChanges):
+    """
+    Modifier seulement quelques poids : les rectangles sont remplis d'abord, puis les cellules isolées.
+    Renvoie le nombre de cellules modifiées et la nouvelle version de la grille.
+    """
+    try:
+        with grille_session(ecriture=True) as grille:
+            changed = grille.modifier_poids(json.changes, json.rectangles)
+            return jsonify({"changed": changed, "version": grille.version}), 200
+    except IndexError as e:
+        return jsonify({"error": str(e)}), 400
+    except BadWeightException as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/grid/export', methods=['GET'])
+@api.validate(tags=["Grille"])
+def export_grid():
+    """
+    Télécharger la grille au format binaire : en-tête (signature, version, dimensions, valeur des murs)
+    puis poids bruts en entiers 64 bits petit-boutistes.
+    """
+    try:
+        buffer = io.BytesIO()
+        with grille_session() as grille:
+            grille.save(buffer)
+        return app.response_class(buffer.getvalue(), mimetype="application/octet-stream",
+                                  headers={"Content-Disposition": "attachment; filename=grille.saeg"}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/grid/import', methods=['PUT'])
+@api.validate(tags=["Grille"])
+def import_grid():
+    """
+    Remplacer la grille par un fichier binaire obtenu avec /grid/export, envoyé brut dans le corps de la requête.
+    """
+    try:
+        nouvelle = models.Grille.depuis_octets(request.get_data())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if nouvelle.height > 1000 or nouvelle.width > 1000:
+        return jsonify({"error": "La grille a une taille trop grande"}), 400
+    if nouvelle.height < 2 or nouvelle.width < 2:
+        return jsonify({"error": "La grille a une taille trop petite"}), 400
+
+    grille, _ = magasin.remplacer(session(), nouvelle)
+    return jsonify({"height": grille.height, "width": grille.width}), 200
+
+
+@app.route('/grid/components', methods=['GET'])
+@api.validate(tags=["Grille"])
+def get_grid_components():
+    """
+    Obtenir l'étiquette de composante connexe de chaque sommet (-1 pour un mur).
+    """
+    try:
+        with grille_session() as grille:
+            labels = grille.etiquettes_composantes()
+        count = max((label for row in labels for label in row), default=-1) + 1
+        return jsonify({"count": count, "labels": labels}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+class StartPoint(BaseModel):
+    # Les limites de recherche (max_expansions, deadline_ms, cancel_token) ne s'appliquent pas : refusées
+    model_config = ConfigDict(extra="forbid")
+
+    start_x: int = Field(19, title="X du sommet de départ")
+    start_y: int = Field(0, title="Y du sommet de départ")
+
+
 class StartEndPoints(BaseModel):
     start_x: int = Field(19, title="X du sommet de départ")
     start_y: int = Field(0, title="Y du sommet de départ")
     end_x: int = Field(0, title="X du sommet de fin")
     end_y: int = Field(19, title="Y du sommet de fin")
+    compact: bool = Field(False, title="Trace compacte",
+                          description="True pour renvoyer les arêtes explorées (parents, children) et la solution "
+                                      "en identifiants de cellules x * hauteur + y")
+    max_expansions: Optional[int] = Field(None, ge=1, title="Nombre maximal d'expansions")
+    deadline_ms: Optional[int] = Field(None, ge=1, title="Délai maximal en millisecondes")
+    cancel_token: Optional[str] = Field(None, title="Jeton d'annulation",
+                                        description="Permet d'interrompre la recherche via /algorithm/cancel")
+    stream: Optional[Literal["ndjson", "sse"]] = Field(None, title="Diffusion des événements",
+                                                       description="ndjson ou sse pour recevoir les événements de la "
+                                                                   "recherche au fil de l'eau, terminés par le chemin")
+
+
+class CancelToken(BaseModel):
+    cancel_token: str = Field(..., title="Jeton d'annulation d'une recherche en cours")
+
+
+class BellmanFordPoints(StartEndPoints):
+    mode: Literal["spfa", "passes", "numpy"] = Field("spfa", title="Moteur de Bellman-Ford",
+                                                     description="spfa (file), passes (passes complètes) ou numpy (passes vectorisées)")
+
+
+class HpaStarPoints(StartEndPoints):
+    raffiner: bool = Field(True, title="Chemin complet",
+                           description="True pour le chemin cellule par cellule, False pour la suite des entrées entre clusters")
+    taille_cluster: int = Field(16, ge=2, title="Côté d'un cluster, en cellules")
+
+
+class ReperesPoints(StartEndPoints):
+    nbr_reperes: int = Field(8, ge=1, le=64, title="Nombre de repères",
+                             description="Les distances aux repères sont recalculées après chaque modification de la grille")
+
+
+class RandomWalkPoints(StartEndPoints):
+    marcheurs: Optional[int] = Field(None, ge=1, le=100000, title="Nombre de marcheurs",
+                                     description="Si renseigné, lance des marches en parallèle et renvoie des statistiques")
+    pas_max: int = Field(10000, ge=1, le=100000, title="Nombre maximal de pas d'un marcheur")
+    graine: Optional[int] = Field(None, title="Graine du générateur aléatoire")
 
 
-def execute_algorithm_common(start, end, algorithm_func):
+LOT_MAX_PAIRES = 10000  # Nombre maximal de requêtes dans un lot
+
+
+class BatchPairs(BaseModel):
+    # Les limites de recherche (max_expansions, deadline_ms, cancel_token) ne s'appliquent pas : refusées
+    model_config = ConfigDict(extra="forbid")
+
+    pairs: list[tuple[int, int, int, int]] = Field([(19, 0, 0, 19)], max_length=LOT_MAX_PAIRES,
+                                                   title="Requêtes du lot",
+                                                   description="Liste de (start_x, start_y, end_x, end_y)")
+    algorithm: Literal["bfs", "dijkstra", "dial", "a_star", "bidirectional_dijkstra", "bidirectional_a_star"] = \
+        Field("dijkstra", title="Algorithme appliqué à chaque requête")
+    workers: Optional[int] = Field(None, ge=1, le=os.cpu_count() or 1, title="Nombre de processus",
+                                   description="Entre 1 et le nombre de cœurs, par défaut le nombre de cœurs")
+
+
+# Jetons des recherches en cours, déclenchés par /algorithm/cancel
+annulations: dict[tuple[str, str], Event] = {}  # (session, jeton) -> Event
+
+
+def trace_json(grille, trace, compact=False):
+    """
+    Sérialise une trace de recherche, telle quelle si compact, sinon au format visited / solution par sommets.
+    Le statut vaut "found", ou la limite atteinte pour une exploration partielle.
+    """
+    if compact:
+        return {"status": trace.statut, "height": grille.height, "parents": trace.parents.tolist(),
+                "children": trace.enfants.tolist(), "solution": trace.solution.tolist()}
+    height, weights, noms = grille.height, grille.weights, {}
+
+    def nom(cellule):
+        if cellule not in noms:
+            x, y = divmod(cellule, height)
+            noms[cellule] = f"{weights[cellule]} | [{x}, {y}]"
+        return noms[cellule]
+
+    visited = {}
+    for parent, enfant in zip(trace.parents, trace.enfants):
+        voisins = visited.setdefault(nom(parent), [])
+        if nom(enfant) not in voisins:
+            voisins.append(nom(enfant))
+    solution = trace.solution
+    return {"status": trace.statut, "visited": visited,
+            "solution": {nom(a): nom(b) for a, b in zip(solution, solution[1:])}}
+
+
+@contextmanager
+def jeton_annulation(limites, identifiant):
+    """
+    Donne l'Event d'annulation d'une requête, enregistré sous (session, cancel_token) le temps du bloc with.
+    Lève DuplicateCancelTokenException si une recherche en cours de la session utilise déjà ce jeton.
+    """
+    annulation = Event()
+    cle = (identifiant, limites.cancel_token)
+    if limites.cancel_token is not None and annulations.setdefault(cle, annulation) is not annulation:
+        raise DuplicateCancelTokenException()
+    try:
+        yield annulation
+    finally:
+        if limites.cancel_token is not None:
+            del annulations[cle]
+
+
+@contextmanager
+def recherche_bornee(grille, etapes, limites, identifiant):
+    """
+    Borne une recherche par les limites de la requête ; son jeton d'annulation est enregistré le temps du bloc with.
+    """
+    with jeton_annulation(limites, identifiant) as annulation:
+        yield grille.limiter(etapes, limites.max_expansions,
+                             limites.deadline_ms / 1000 if limites.deadline_ms is not None else None, annulation)
+
+
+def execute_algorithm_common(grille, start, end, algorithm_func, compact=False, limites=None):
+    limites = limites or StartEndPoints()
     try:
-        grille.init_grid()
-        result = algorithm_func(start, end)
-        return jsonify({
-            "visited": {str(k): [str(v) for v in vs] for k, vs in result[0].items()},
-            "solution": {str(k): str(v) for k, v in result[1].items()}
-        }), 200
+        with recherche_bornee(grille, algorithm_func(grille, start, end), limites, session()) as etapes:
+            return jsonify(trace_json(grille, grille.tracer(etapes), compact)), 200
+    except DuplicateCancelTokenException as e:
+        return jsonify({"error": str(e)}), 409
     except NotConnectedGraphException as e:
         return jsonify({"error": "Le graphe n'est pas connexe", "details": str(e)}), 400
     except IndexError as e:
@@ -127,55 +431,267 @@ def execute_algorithm_common(start, end, algorithm_func):
         return jsonify({"error": "Une erreur est survenue", "details": str(e)}), 500
 
 
-from functools import wraps
+STREAM_LOT = 256  # Nombre d'événements regroupés par morceau envoyé
+
+
+def evenement_json(evenement):
+    """
+    Représentation JSON d'un événement de recherche, les cellules étant des identifiants x * hauteur + y.
+    """
+    if evenement.genre == models.TROUVE:
+        return {"event": evenement.genre, "distance": evenement.distance, "path": evenement.chemin}
+    if evenement.genre == models.INTERROMPU:
+        return {"event": evenement.genre, "status": evenement.statut}
+    if evenement.genre in (models.FIN, models.PREPARATION):
+        return {"event": evenement.genre}
+    return {"event": evenement.genre, "cell": evenement.cellule, "parent": evenement.parent,
+            "distance": evenement.distance}
+
+
+def stream_algorithm(grille, start, end, algorithm_func, limites):
+    """
+    Diffuse les événements d'une recherche en NDJSON (un objet par ligne) ou en Server-Sent Events.
+    Le premier message donne les dimensions de la grille, le dernier est "done". La recherche tourne sur une
+    copie de la grille de la session : aucun verrou n'est tenu pendant que le client lit la diffusion.
+    """
+    if limites.stream == "sse":
+        def encoder(message):
+            return f"event: {message['event']}\ndata: {dumps(message)}\n\n"
+        mimetype = "text/event-stream"
+    else:
+        def encoder(message):
+            return dumps(message) + "\n"
+        mimetype = "application/x-ndjson"
+
+    identifiant = session()  # Le générateur est lu hors du contexte de la requête
+
+    def generer():
+        yield encoder({"event": "start", "height": grille.height, "width": grille.width})
+        morceau = []
+        try:
+            with recherche_bornee(grille, algorithm_func(grille, start, end), limites, identifiant) as etapes:
+                for evenement in etapes:
+                    morceau.append(encoder(evenement_json(evenement)))
+                    if len(morceau) >= STREAM_LOT or evenement.genre != models.EXPANSION:
+                        yield "".join(morceau)
+                        morceau = []
+        except DuplicateCancelTokenException as e:
+            morceau.append(encoder({"event": "error", "error": str(e)}))
+            morceau.append(encoder({"event": models.FIN}))
+        except NotConnectedGraphException as e:
+            morceau.append(encoder({"event": "error", "error": "Le graphe n'est pas connexe", "details": str(e)}))
+            morceau.append(encoder({"event": models.FIN}))
+        except Exception as e:
+            morceau.append(encoder({"event": "error", "error": "Une erreur est survenue", "details": str(e)}))
+            morceau.append(encoder({"event": models.FIN}))
+        if morceau:
+            yield "".join(morceau)
+
+    # Un générateur plutôt qu'un objet Response, que spectree lirait en entier avant de le renvoyer
+    return generer(), 200, {"Content-Type": mimetype, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+from functools import partial, wraps
 
 # Fonction générique pour gérer les routes d'algorithmes
-def algorithm_route(algorithm_func):
+# Les champs du schéma qui s'ajoutent à StartEndPoints sont passés en options à l'algorithme.
+# La recherche tient la grille de la session en lecture, sauf si l'algorithme modifie ses précalculs (ecriture).
+# Une diffusion (stream) travaille sur une copie de la grille, pour ne pas garder le verrou pendant la lecture du client :
+# elle est refusée (diffusion=False) aux algorithmes dont l'état incrémental, conservé dans la grille, serait perdu avec la copie.
+def algorithm_route(algorithm_func, schema=StartEndPoints, ecriture=False, diffusion=True):
     @wraps(algorithm_func)
-    @api.validate(tags=["Algorithmes"], json=StartEndPoints)
     def wrapper():
         data = request.get_json()
-        json = StartEndPoints(**data)
-        try:
-            start = grille.tab[json.start_x][json.start_y]
-            end = grille.tab[json.end_x][json.end_y]
-        except IndexError:
-            return jsonify({"error": "Coordonnées hors de la grille"}), 400
-        return execute_algorithm_common(start, end, algorithm_func)
+        json = schema(**data)
+        if json.stream is not None and not diffusion:
+            return jsonify({"error": "Cet algorithme conserve son état dans la grille et ne peut pas être diffusé"}), 400
+        if json.stream is not None:
+            # La copie est prise sous le verrou de lecture, la diffusion se fait ensuite sans verrou
+            with grille_session() as grille:
+                copie = grille.copie()
+            try:
+                start = copie.tab[json.start_x][json.start_y]
+                end = copie.tab[json.end_x][json.end_y]
+            except IndexError:
+                return jsonify({"error": "Coordonnées hors de la grille"}), 400
+            options = json.model_dump(exclude=set(StartEndPoints.model_fields))
+            return stream_algorithm(copie, start, end, partial(algorithm_func, **options), json)
+        with grille_session(ecriture) as grille:
+            try:
+                start = grille.tab[json.start_x][json.start_y]
+                end = grille.tab[json.end_x][json.end_y]
+            except IndexError:
+                return jsonify({"error": "Coordonnées hors de la grille"}), 400
+            options = json.model_dump(exclude=set(StartEndPoints.model_fields))
+            return execute_algorithm_common(grille, start, end, partial(algorithm_func, **options), json.compact, json)
     return wrapper
 
 # Routes spécifiques pour chaque algorithme
 @app.route('/algorithm/dfs', methods=['POST'])
 @api.validate(tags=["Algorithmes"], json=StartEndPoints)
 def dfs():
-    return algorithm_route(grille.parcours_profondeur)()
+    return algorithm_route(models.Grille.etapes_profondeur)()
 
 @app.route('/algorithm/bfs', methods=['POST'])
 @api.validate(tags=["Algorithmes"], json=StartEndPoints)
 def bfs():
-    return algorithm_route(grille.parcours_largeur)()
+    return algorithm_route(models.Grille.etapes_largeur)()
 
 @app.route('/algorithm/dijkstra', methods=['POST'])
 @api.validate(tags=["Algorithmes"], json=StartEndPoints)
 def dijkstra():
-    return algorithm_route(grille.parcours_dijkstra)()
+    return algorithm_route(models.Grille.etapes_dijkstra)()
 
-@app.route('/algorithm/bellman_ford', methods=['POST'])
+@app.route('/algorithm/dial', methods=['POST'])
 @api.validate(tags=["Algorithmes"], json=StartEndPoints)
+def dial():
+    return algorithm_route(models.Grille.etapes_dial)()
+
+@app.route('/algorithm/bellman_ford', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=BellmanFordPoints)
 def bellman_ford():
-    return algorithm_route(grille.bellman_ford)()
+    return algorithm_route(models.Grille.etapes_bellman_ford, BellmanFordPoints)()
 
 @app.route('/algorithm/a_star', methods=['POST'])
 @api.validate(tags=["Algorithmes"], json=StartEndPoints)
 def a_star():
-    return algorithm_route(grille.a_star)()
+    return algorithm_route(models.Grille.etapes_a_star)()
 
-@app.route('/algorithm/random_walk', methods=['POST'])
+@app.route('/algorithm/bidirectional_dijkstra', methods=['POST'])
 @api.validate(tags=["Algorithmes"], json=StartEndPoints)
-def random_walk():
-    return algorithm_route(grille.allerAToire)()
+def bidirectional_dijkstra():
+    return algorithm_route(models.Grille.etapes_dijkstra_bidirectionnel)()
+
+@app.route('/algorithm/bidirectional_a_star', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=StartEndPoints)
+def bidirectional_a_star():
+    return algorithm_route(models.Grille.etapes_a_star_bidirectionnel)()
+
+@app.route('/algorithm/lpa_star', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=StartEndPoints)
+def lpa_star():
+    """
+    LPA* : le planificateur est conservé dans la grille et réparé après chaque modification de poids.
+    Le champ stream est refusé (400), la diffusion travaillant sur une copie de la grille.
+    """
+    return algorithm_route(models.Grille.etapes_lpa_star, ecriture=True, diffusion=False)()
+
+@app.route('/algorithm/hpa_star', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=HpaStarPoints)
+def hpa_star():
+    """
+    HPA* : la hiérarchie des clusters est conservée dans la grille et reconstruite cluster par cluster.
+    Le champ stream est refusé (400), la diffusion travaillant sur une copie de la grille.
+    """
+    return algorithm_route(models.Grille.etapes_hpa_star, HpaStarPoints, ecriture=True, diffusion=False)()
+
+@app.route('/algorithm/a_star_landmarks', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=ReperesPoints)
+def a_star_landmarks():
+    return algorithm_route(models.Grille.etapes_a_star_reperes, ReperesPoints)()
+
+@app.route('/algorithm/cancel', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=CancelToken)
+def cancel(json: CancelToken):
+    """
+    Interrompre la recherche en cours de la session portant ce jeton : elle renvoie alors son exploration
+    partielle avec le statut "cancelled".
+    """
+    annulation = annulations.get((session(), json.cancel_token))
+    if annulation is None:
+        return jsonify({"error": "Aucune recherche en cours avec ce jeton"}), 404
+    annulation.set()
+    return jsonify({"cancelled": json.cancel_token}), 200
+
+@app.route('/algorithm/distance_field', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=StartPoint)
+def distance_field(json: StartPoint):
+    """
+    Obtenir les distances et prédécesseurs de toutes les cellules depuis un départ, sous forme de tableaux 2D.
+    Un prédécesseur est l'identifiant x * hauteur + y de la cellule précédente, -1 pour le départ,
+    les murs et les cellules inatteignables (distance -1).
+    """
+    with grille_session(ecriture=True) as grille:
+        try:
+            start = grille.tab[json.start_x][json.start_y]
+        except IndexError:
+            return jsonify({"error": "Coordonnées hors de la grille"}), 400
+        try:
+            distances, predecesseurs = grille.distance_field(start)
+            height = grille.height
+            return jsonify({
+                "distances": [[-1 if d == models.INFINI else d for d in distances[x * height:(x + 1) * height]]
+                              for x in range(grille.width)],
+                "predecessors": [predecesseurs[x * height:(x + 1) * height].tolist() for x in range(grille.width)]
+            }), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+@app.route('/algorithm/distance_field/path', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=StartEndPoints)
+def distance_field_path():
+    return algorithm_route(models.Grille.etapes_chemin_depuis_champ, ecriture=True)()
+
+@app.route('/algorithm/batch', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=BatchPairs)
+def batch(json: BatchPairs):
+    """
+    Résoudre un lot de requêtes sur un pool de processus. Les coûts et les nombres de pas sont renvoyés
+    dans l'ordre des requêtes, -1 quand l'arrivée est inatteignable.
+    """
+    with grille_session() as grille:
+        if any(not (0 <= sx < grille.width and 0 <= ex < grille.width and 0 <= sy < grille.height and 0 <= ey < grille.height)
+               for sx, sy, ex, ey in json.pairs):
+            return jsonify({"error": "Coordonnées hors de la grille"}), 400
+        try:
+            paires = [(grille.cellule(sx, sy), grille.cellule(ex, ey)) for sx, sy, ex, ey in json.pairs]
+            costs, lengths = grille.lot(paires, json.algorithm, json.workers)
+            return jsonify({"costs": costs.tolist(), "lengths": lengths.tolist()}), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+@app.route('/algorithm/random_walk', methods=['POST'])
+@api.validate(tags=["Algorithmes"], json=RandomWalkPoints)
+def random_walk(json: RandomWalkPoints):
+    """
+    Marche aléatoire du départ à l'arrivée. Avec marcheurs, renvoie aussi les statistiques du temps d'atteinte
+    (taux de réussite, moyenne, percentiles) et une marche représentative ; les marches sont alors bornées par
+    pas_max, deadline_ms et cancel_token, max_expansions est refusé.
+    """
+    if json.marcheurs is None:
+        return algorithm_route(models.Grille.etapes_allerAToire)()
+    if json.max_expansions is not None:
+        return jsonify({"error": "max_expansions ne s'applique pas aux marcheurs, utiliser pas_max"}), 400
+    if json.stream is not None:
+        return jsonify({"error": "Les marches de plusieurs marcheurs ne peuvent pas être diffusées"}), 400
+    with grille_session() as grille:
+        try:
+            start = grille.tab[json.start_x][json.start_y]
+            end = grille.tab[json.end_x][json.end_y]
+        except IndexError:
+            return jsonify({"error": "Coordonnées hors de la grille"}), 400
+        try:
+            delai = json.deadline_ms / 1000 if json.deadline_ms is not None else None
+            with jeton_annulation(json, session()) as annulation:
+                visited, solution, statistics = grille.marche_aleatoire_monte_carlo(
+                    start, end, json.marcheurs, json.pas_max, json.graine, delai, annulation)
+            aretes = [(grille.cellule(k.x, k.y), grille.cellule(v.x, v.y)) for k, vs in visited.items() for v in vs]
+            chemin, vus = [start], {start}
+            while chemin[-1] in solution and solution[chemin[-1]] not in vus:
+                chemin.append(solution[chemin[-1]])
+                vus.add(chemin[-1])
+            trace = models.Trace(array("i", [parent for parent, _ in aretes]), array("i", [enfant for _, enfant in aretes]),
+                                 array("i", [grille.cellule(sommet.x, sommet.y) for sommet in chemin]),
+                                 statistics["status"])
+            return jsonify({**trace_json(grille, trace, json.compact), "statistics": statistics}), 200
+        except DuplicateCancelTokenException as e:
+            return jsonify({"error": str(e)}), 409
+        except NotConnectedGraphException as e:
+            return jsonify({"error": "Le graphe n'est pas connexe", "details": str(e)}), 400
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
 
 
 if __name__ == "__main__":
     api.register(app)
-    app.run(debug=True)
+    app.run(debug=True, threaded=True)
@@ -1,6 +1,16 @@
+import io
+import json
+import os
+import tempfile
+import threading
 import unittest
+from array import array
 
-from web.back.src.sae5_graphes.models import Grille
+from web.back.src.sae5_graphes.models import Grille, EXPANSION, RELACHEMENT, TROUVE, FIN, INTERROMPU, \
+    LIMITE_EXPANSIONS, LIMITE_DELAI, LIMITE_ANNULATION, LIMITE_PAS, POIDS_UINT16, POIDS_UINT32, POIDS_RLE
+from web.back.src.sae5_graphes.magasin import MagasinGrilles, VerrouLectureEcriture
+from sae5_graphes import routes
+from exceptions import BadWeightException, NotConnectedGraphException
 
 
 class TestGrille(unittest.TestCase):
@@ -43,12 +53,733 @@ class TestGrille(unittest.TestCase):
                 voisins = self.grille.get_neighbors(case["sommet"])
                 self.assertEqual(voisins, case["expected"])
 
+    def test_poids_vue_sommet(self):
+        """
+        Test de l'écriture d'un poids au travers d'une vue Sommet dans le tampon de la grille.
+        """
+        self.grille.tab[3][1].weight = 5
+        self.assertEqual(self.grille.weights[self.grille.cellule(3, 1)], 5)
+        self.assertEqual(self.grille.tab[3][1].weight, 5)
+        self.assertEqual(self.grille.sommet(self.grille.cellule(3, 1)), self.grille.tab[3][1])
+        with self.assertRaises(IndexError):
+            _ = self.grille.tab[5][0]
+
+    def test_adjacence_sans_murs(self):
+        """
+        Test de la variante de la table d'adjacence qui exclut les murs, et de son invalidation.
+        """
+        centre = self.grille.cellule(2, 2)
+        mur = self.grille.cellule(1, 2)
+        offsets, voisins = self.grille.adjacence()
+        self.assertIn(mur, voisins[offsets[centre]:offsets[centre + 1]])
+
+        self.grille.set_weight(1, 2, self.grille.WALL)
+        offsets, voisins = self.grille.adjacence(sans_murs=True)
+        self.assertNotIn(mur, voisins[offsets[centre]:offsets[centre + 1]])
+        self.assertEqual(offsets[mur], offsets[mur + 1])
+        self.grille.set_weight(3, 0, self.grille.WALL)
+        complets, tous = self.grille.adjacence()
+        offsets, voisins = self.grille.adjacence(sans_murs=True)
+        murs = {mur, self.grille.cellule(3, 0)}
+        for cellule in range(25):
+            attendus = [] if cellule in murs else [v for v in tous[complets[cellule]:complets[cellule + 1]] if v not in murs]
+            self.assertEqual(voisins[offsets[cellule]:offsets[cellule + 1]].tolist(), attendus)
+        self.grille.set_weight(3, 0, 1)
+
+        self.grille.set_weight(1, 2, 1)
+        offsets, voisins = self.grille.adjacence(sans_murs=True)
+        self.assertIn(mur, voisins[offsets[centre]:offsets[centre + 1]])
 
     def test_parcour_profondeur(self):
-        pass
+        """
+        Test du parcours en profondeur sur une grande grille, au-delà de la limite de récursion de Python.
+        """
+        grille = Grille(150, 150)
+        _, solution = grille.parcours_profondeur(grille.tab[0][0], grille.tab[149][149])
+
+        courant, pas = grille.tab[0][0], 0
+        while courant in solution:
+            courant = solution[courant]
+            pas += 1
+        self.assertEqual(courant, grille.tab[149][149])
+        self.assertEqual(pas, len(solution))
+
+    def test_parcours_largeur(self):
+        """
+        Test du parcours en largeur : le chemin trouvé a le nombre minimal de sauts, quels que soient les poids.
+        """
+        self.grille.set_weight(1, 0, 10)
+        self.grille.set_weight(2, 0, 10)
+        _, solution = self.grille.parcours_largeur(self.grille.tab[0][0], self.grille.tab[4][0])
+        self.assertEqual(len(solution), 4)
+
+        for y in range(5):
+            self.grille.set_weight(2, y, self.grille.WALL)
+        with self.assertRaises(NotConnectedGraphException):
+            self.grille.parcours_largeur(self.grille.tab[0][0], self.grille.tab[4][0])
 
     def test_parcours_naif(self):
         pass
 
     def test_parcours_dijkstra(self):
-        pass
+        """
+        Test du plus court chemin de Dijkstra autour d'un mur et avec des poids différents.
+        """
+        for x in range(4):
+            self.grille.set_weight(x, 2, self.grille.WALL)
+        self.grille.set_weight(4, 2, 10)
+        _, solution = self.grille.parcours_dijkstra(self.grille.tab[0][0], self.grille.tab[0][4])
+
+        courant, cout = self.grille.tab[0][0], 0
+        while courant in solution:
+            courant = solution[courant]
+            cout += courant.weight
+        self.assertEqual(courant, self.grille.tab[0][4])
+        self.assertEqual(cout, 19)
+
+    def test_parcours_dial(self):
+        """
+        Test de la file de Dial : mêmes distances que le tas binaire, et repli sur le tas pour de grands poids.
+        """
+        poids = [1, 3, 5, 10, self.grille.WALL]
+        for x in range(5):
+            for y in range(5):
+                self.grille.set_weight(x, y, poids[(x * 7 + y * 3) % 5])
+        self.grille.set_weight(0, 0, 1)
+        self.assertEqual(self.grille.poids_extremes(), (1, 10))
+
+        distances_tas, _, _ = self.grille._dijkstra(0)
+        distances_dial, _, _ = self.grille._dial(0)
+        self.assertEqual(distances_dial, distances_tas)
+
+        self.grille.set_weight(4, 4, 50000)
+        distances_tas, _, _ = self.grille._dijkstra(0)
+        distances_dial, _, _ = self.grille._dial(0)
+        self.assertEqual(distances_dial, distances_tas)
+
+    def test_bellman_ford_modes(self):
+        """
+        Test des trois moteurs de Bellman-Ford : mêmes distances que Dijkstra.
+        """
+        poids = [1, 3, 5, 10, self.grille.WALL]
+        for x in range(5):
+            for y in range(5):
+                self.grille.set_weight(x, y, poids[(x * 3 + y * 2) % 5])
+        self.grille.set_weight(0, 0, 1)
+
+        distances, _, _ = self.grille._dijkstra(0)
+        self.assertEqual(self.grille._bellman_ford_passes(0)[0], distances)
+        self.assertEqual(self.grille._bellman_ford_spfa(0)[0], distances)
+        self.assertEqual(self.grille._bellman_ford_numpy(0)[0], distances)
+
+    def test_a_star_optimal(self):
+        """
+        Test de A* : l'heuristique hexagonale est admissible, le coût trouvé est celui de Dijkstra.
+        """
+        poids = [1, 3, 5, 10, self.grille.WALL, 1]
+        for x in range(5):
+            for y in range(5):
+                self.grille.set_weight(x, y, poids[(x * 5 + y * 4) % 6])
+        self.grille.set_weight(0, 0, 1)
+        self.grille.set_weight(4, 4, 1)
+
+        depart, arrivee = self.grille.cellule(0, 0), self.grille.cellule(4, 4)
+        distances, _, _ = self.grille._dijkstra(depart)
+        _, solution = self.grille.a_star(self.grille.tab[0][0], self.grille.tab[4][4])
+        self.assertEqual(sum(suivant.weight for suivant in solution.values()), distances[arrivee])
+        self.assertEqual(self.grille.distance_hexagonale(depart, arrivee), 6)
+
+    def test_recherches_bidirectionnelles(self):
+        """
+        Test de Dijkstra et A* bidirectionnels : même coût que Dijkstra, et graphe non connexe détecté.
+        """
+        poids = [1, 3, 5, 10, self.grille.WALL, 1, 1]
+        for x in range(5):
+            for y in range(5):
+                self.grille.set_weight(x, y, poids[(x * 4 + y * 3) % 7])
+        self.grille.set_weight(0, 4, 1)
+        self.grille.set_weight(4, 0, 1)
+
+        depart, arrivee = self.grille.cellule(0, 4), self.grille.cellule(4, 0)
+        distances, _, _ = self.grille._dijkstra(depart)
+        for algorithme in (self.grille.parcours_dijkstra_bidirectionnel, self.grille.a_star_bidirectionnel):
+            with self.subTest(algorithme=algorithme.__name__):
+                _, solution = algorithme(self.grille.tab[0][4], self.grille.tab[4][0])
+                self.assertEqual(sum(suivant.weight for suivant in solution.values()), distances[arrivee])
+
+        for x in range(5):
+            self.grille.set_weight(x, 2, self.grille.WALL)
+        with self.assertRaises(NotConnectedGraphException):
+            self.grille.parcours_dijkstra_bidirectionnel(self.grille.tab[0][4], self.grille.tab[4][0])
+
+    def test_composantes_incrementales(self):
+        """
+        Test de l'index de composantes connexes : séparation par un mur puis fusion quand il est retiré, et murs
+        ajoutés un à un comparés à un index reconstruit.
+        """
+        gauche, droite = self.grille.cellule(2, 0), self.grille.cellule(2, 4)
+        self.assertTrue(self.grille.sont_connectees(gauche, droite))
+
+        for x in range(5):
+            self.grille.set_weight(x, 2, self.grille.WALL)
+        self.assertFalse(self.grille.sont_connectees(gauche, droite))
+        self.assertEqual(self.grille.composante(self.grille.cellule(0, 2)), -1)
+        with self.assertRaises(NotConnectedGraphException):
+            self.grille.a_star(self.grille.tab[2][0], self.grille.tab[2][4])
+
+        self.grille.set_weight(3, 2, 1)
+        self.assertTrue(self.grille.sont_connectees(gauche, droite))
+        self.assertEqual(max(max(ligne) for ligne in self.grille.etiquettes_composantes()), 0)
+
+        for x, y in ((1, 1), (3, 1), (3, 3), (4, 3), (2, 3), (4, 1)):
+            self.grille.set_weight(x, y, self.grille.WALL)
+            reference = Grille(5, 5)
+            reference.modifier_poids([(i, j, self.grille.tab[i][j].weight) for i in range(5) for j in range(5)])
+            self.assertEqual(self.grille.etiquettes_composantes(), reference.etiquettes_composantes())
+
+    def test_lpa_star_incremental(self):
+        """
+        Test de LPA* : même coût que Dijkstra après des modifications, et réparation locale après une petite modification.
+        """
+        grille = Grille(20, 20)
+        start, end = grille.tab[0][0], grille.tab[19][19]
+        visited, solution = grille.lpa_star(start, end)
+        self.assertEqual(sum(s.weight for s in solution.values()), grille.distance_hexagonale(0, 19 * 20 + 19))
+        premier = sum(len(v) for v in visited.values())
+
+        grille.set_weight(19, 18, 10)
+        for x in range(15):
+            grille.set_weight(x, 10, grille.WALL)
+        _, solution = grille.lpa_star(start, end)
+        _, reference = grille.parcours_dijkstra(start, end)
+        self.assertEqual(sum(s.weight for s in solution.values()), sum(s.weight for s in reference.values()))
+
+        grille.set_weight(5, 2, 7)
+        visited, _ = grille.lpa_star(start, end)
+        self.assertLess(sum(len(v) for v in visited.values()), premier)
+
+    def test_hpa_star(self):
+        """
+        Test de HPA* : chemin valide et proche de l'optimum, seul le cluster modifié est reconstruit.
+        """
+        grille = Grille(30, 30)
+        for x in range(25):
+            grille.set_weight(x, 12, grille.WALL)
+        start, end = grille.tab[0][0], grille.tab[29][29]
+        _, solution = grille.hpa_star(start, end, taille_cluster=8)
+        _, reference = grille.parcours_dijkstra(start, end)
+        cout = sum(s.weight for s in solution.values())
+        optimum = sum(s.weight for s in reference.values())
+        self.assertGreaterEqual(cout, optimum)
+        self.assertLessEqual(cout, optimum * 1.5)
+        for a, b in solution.items():
+            self.assertIn(b, grille.get_neighbors(a))
+
+        hierarchie = grille._hierarchie
+        construits = set(hierarchie._aretes)
+        grille.set_weight(4, 4, 5)
+        self.assertEqual(set(hierarchie._aretes), construits - {hierarchie.cluster(grille.cellule(4, 4))})
+
+        _, abstrait = grille.hpa_star(start, end, raffiner=False, taille_cluster=8)
+        self.assertLess(len(abstrait), len(solution))
+
+    def test_a_star_reperes(self):
+        """
+        Test de A* avec repères : chemin optimal, moins de sommets visités qu'A* derrière un mur, tables invalidées
+        après une modification.
+        """
+        grille = Grille(30, 30)
+        for x in range(27):
+            grille.set_weight(x, 15, grille.WALL)
+        start, end = grille.tab[5][5], grille.tab[5][25]
+        visited_reperes, solution = grille.a_star_reperes(start, end, nbr_reperes=4)
+        visited_a_star, reference = grille.a_star(start, end)
+        self.assertEqual(sum(s.weight for s in solution.values()), sum(s.weight for s in reference.values()))
+        self.assertLess(len(visited_reperes), len(visited_a_star))
+
+        reperes = grille.preparer_reperes(4)
+        self.assertEqual(len(reperes), 4)
+        self.assertIs(grille.preparer_reperes(4), reperes)
+        grille.set_weight(28, 15, grille.WALL)
+        self.assertIsNot(grille.preparer_reperes(4), reperes)
+        _, solution = grille.a_star_reperes(start, end, nbr_reperes=4)
+        _, reference = grille.parcours_dijkstra(start, end)
+        self.assertEqual(sum(s.weight for s in solution.values()), sum(s.weight for s in reference.values()))
+
+    def test_distance_field(self):
+        """
+        Test du champ de distances : mêmes distances que Dijkstra, arbre réutilisé puis invalidé par une modification.
+        """
+        self.grille.set_weight(2, 2, self.grille.WALL)
+        self.grille.set_weight(3, 1, 5)
+        start = self.grille.tab[0][0]
+        distances, predecesseurs = self.grille.distance_field(start)
+        for x in range(5):
+            for y in range(5):
+                cellule = self.grille.cellule(x, y)
+                if (x, y) == (2, 2):
+                    self.assertEqual(predecesseurs[cellule], -1)
+                elif (x, y) != (0, 0):
+                    _, solution = self.grille.parcours_dijkstra(start, self.grille.tab[x][y])
+                    self.assertEqual(distances[cellule], sum(s.weight for s in solution.values()))
+
+        self.assertIs(self.grille.distance_field(start)[0], distances)
+        _, solution = self.grille.chemin_depuis_champ(start, self.grille.tab[4][4])
+        self.assertEqual(sum(s.weight for s in solution.values()), distances[self.grille.cellule(4, 4)])
+        self.grille.set_weight(3, 1, 1)
+        self.assertIsNot(self.grille.distance_field(start)[0], distances)
+
+    def test_lot(self):
+        """
+        Test du traitement par lot : mêmes coûts en parallèle qu'en séquentiel, -1 pour une arrivée inatteignable.
+        """
+        for x in range(5):
+            self.grille.set_weight(x, 2, self.grille.WALL)
+        self.grille.set_weight(4, 2, 3)
+        self.grille.set_weight(1, 1, 10)
+        paires = [(self.grille.cellule(x, 0), self.grille.cellule(4 - x, 4)) for x in range(5)] * 8
+        paires.append((self.grille.cellule(0, 0), self.grille.cellule(0, 2)))
+        couts, longueurs = self.grille.lot(paires, "dijkstra", processus=1)
+        for (depart, arrivee), cout in zip(paires[:5], couts):
+            _, solution = self.grille.parcours_dijkstra(self.grille.sommet(depart), self.grille.sommet(arrivee))
+            self.assertEqual(cout, sum(s.weight for s in solution.values()))
+        self.assertEqual((couts[-1], longueurs[-1]), (-1, -1))
+        self.assertEqual(self.grille.lot(paires, "dijkstra", processus=2), (couts, longueurs))
+
+    def test_marche_aleatoire_monte_carlo(self):
+        """
+        Test des marches aléatoires parallèles : statistiques cohérentes, marche représentative valide et statut
+        de la limite atteinte.
+        """
+        visited, solution, statistiques = self.grille.marche_aleatoire_monte_carlo(
+            self.grille.tab[0][0], self.grille.tab[4][4], marcheurs=200, pas_max=5000, graine=0)
+        self.assertEqual(statistiques["success_rate"], 1.0)
+        self.assertEqual(statistiques["status"], TROUVE)
+        self.assertGreaterEqual(statistiques["mean"], 4)
+        self.assertLessEqual(statistiques["percentiles"]["50"], statistiques["percentiles"]["99"])
+        self.assertIn(self.grille.tab[4][4], solution.values())
+        for a, b in solution.items():
+            self.assertIn(b, self.grille.get_neighbors(a))
+
+        _, _, statistiques = self.grille.marche_aleatoire_monte_carlo(
+            self.grille.tab[0][0], self.grille.tab[4][4], marcheurs=50, pas_max=2, graine=0)
+        self.assertEqual(statistiques["success_rate"], 0.0)
+        self.assertIsNone(statistiques["mean"])
+        self.assertEqual(statistiques["status"], LIMITE_PAS)
+
+        annulation = threading.Event()
+        annulation.set()
+        _, _, statistiques = self.grille.marche_aleatoire_monte_carlo(
+            self.grille.tab[0][0], self.grille.tab[4][4], marcheurs=50, graine=0, annulation=annulation)
+        self.assertEqual(statistiques["status"], LIMITE_ANNULATION)
+        _, _, statistiques = self.grille.marche_aleatoire_monte_carlo(
+            self.grille.tab[0][0], self.grille.tab[4][4], marcheurs=50, graine=0, delai=0)
+        self.assertEqual(statistiques["status"], LIMITE_DELAI)
+
+    def test_etapes_evenements(self):
+        """
+        Test du parcours pas à pas : expansions, relâchements sur demande, chemin trouvé puis fin.
+        """
+        self.grille.set_weight(2, 2, 7)
+        depart, arrivee = self.grille.tab[0][0], self.grille.tab[4][4]
+        evenements = list(self.grille.etapes_dijkstra(depart, arrivee))
+        genres = [evenement.genre for evenement in evenements]
+        self.assertEqual(genres[-2:], [TROUVE, FIN])
+        self.assertNotIn(RELACHEMENT, genres)
+        self.assertEqual(genres[0], EXPANSION)
+        self.assertEqual(evenements[0].cellule, self.grille.cellule(0, 0))
+
+        trouve = evenements[-2]
+        _, solution = self.grille.parcours_dijkstra(depart, arrivee)
+        self.assertEqual(trouve.distance, sum(s.weight for s in solution.values()))
+        self.assertEqual(trouve.chemin[0], self.grille.cellule(0, 0))
+        self.assertEqual(trouve.chemin[-1], self.grille.cellule(4, 4))
+
+        genres = [evenement.genre for evenement in self.grille.etapes_dijkstra(depart, arrivee, relachements=True)]
+        self.assertIn(RELACHEMENT, genres)
+
+        for x in range(5):
+            self.grille.set_weight(x, 2, self.grille.WALL)
+        with self.assertRaises(NotConnectedGraphException):
+            list(self.grille.etapes_a_star(depart, arrivee))
+
+    def test_trace(self):
+        """
+        Test de la trace compacte : tableaux parallèles d'entiers 32 bits et chemin en identifiants de cellules.
+        """
+        self.grille.set_weight(2, 2, 7)
+        depart, arrivee = self.grille.tab[0][0], self.grille.tab[4][4]
+        trace = self.grille.tracer(self.grille.etapes_dijkstra(depart, arrivee))
+        self.assertEqual((trace.parents.itemsize, trace.enfants.itemsize, trace.solution.itemsize), (4, 4, 4))
+        self.assertEqual(len(trace.parents), len(trace.enfants))
+        self.assertEqual((trace.solution[0], trace.solution[-1]), (self.grille.cellule(0, 0), self.grille.cellule(4, 4)))
+
+        visited, solution = self.grille.parcours_dijkstra(depart, arrivee)
+        self.assertEqual({(self.grille.sommet(a), self.grille.sommet(b)) for a, b in zip(trace.parents, trace.enfants)},
+                         {(a, b) for a, bs in visited.items() for b in bs})
+        self.assertEqual(dict(zip(map(self.grille.sommet, trace.solution), map(self.grille.sommet, trace.solution[1:]))),
+                         solution)
+
+        for x in range(5):
+            self.grille.set_weight(x, 2, self.grille.WALL)
+        with self.assertRaises(NotConnectedGraphException):
+            self.grille.tracer(self.grille.etapes_largeur(depart, arrivee))
+
+    def test_limites(self):
+        """
+        Test des limites de recherche : exploration partielle et statut au lieu d'un chemin, y compris pendant
+        les précalculs.
+        """
+        depart, arrivee = self.grille.tab[0][0], self.grille.tab[4][4]
+        trace = self.grille.tracer(self.grille.limiter(self.grille.etapes_dijkstra(depart, arrivee), max_expansions=3))
+        self.assertEqual(trace.statut, LIMITE_EXPANSIONS)
+        self.assertEqual(len(trace.enfants), 2)
+        self.assertEqual(len(trace.solution), 0)
+
+        evenements = list(self.grille.limiter(self.grille.etapes_allerAToire(depart, arrivee), delai=0))
+        self.assertEqual([e.genre for e in evenements[-2:]], [INTERROMPU, FIN])
+        self.assertEqual(evenements[-2].statut, LIMITE_DELAI)
+
+        annulation = threading.Event()
+        annulation.set()
+        trace = self.grille.tracer(self.grille.limiter(self.grille.etapes_dijkstra(depart, arrivee), annulation=annulation))
+        self.assertEqual(trace.statut, LIMITE_ANNULATION)
+
+        trace = self.grille.tracer(self.grille.limiter(self.grille.etapes_dijkstra(depart, arrivee), max_expansions=1000,
+                                                       delai=60, annulation=threading.Event()))
+        self.assertEqual(trace.statut, TROUVE)
+        self.assertEqual(trace.solution[-1], self.grille.cellule(4, 4))
+
+        # Les précalculs (index des composantes, repères) sont interruptibles et ne laissent rien derrière eux
+        grande = Grille(100, 100)
+        trace = grande.tracer(grande.limiter(grande.etapes_a_star_reperes(grande.tab[0][0], grande.tab[99][99]),
+                                             annulation=annulation))
+        self.assertEqual(trace.statut, LIMITE_ANNULATION)
+        self.assertEqual(len(trace.enfants), 0)
+        self.assertIsNone(grande._etiquettes)
+        grande.composante(0)
+        grande.tracer(grande.limiter(grande.etapes_a_star_reperes(grande.tab[0][0], grande.tab[99][99]),
+                                     annulation=annulation))
+        self.assertIsNone(grande._reperes)
+        trace = grande.tracer(grande.limiter(grande.etapes_chemin_depuis_champ(grande.tab[0][0], grande.tab[99][99]),
+                                             annulation=annulation))
+        self.assertEqual(trace.statut, LIMITE_ANNULATION)
+        self.assertEqual(len(grande._arbres), 0)
+
+    def test_save_load(self):
+        """
+        Test du format binaire : aller-retour par fichier et par octets, rejet d'un fichier invalide ou de poids
+        hors de [1, WALL].
+        """
+        grille = Grille(4, 6)
+        grille.set_weight(1, 2, grille.WALL)
+        grille.set_weight(5, 3, 7)
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, "grille.saeg")
+            grille.save(chemin)
+            lue = Grille.load(chemin)
+        self.assertEqual((lue.height, lue.width), (4, 6))
+        self.assertEqual(lue.weights, grille.weights)
+        self.assertEqual(lue.tab[1][2].weight, lue.WALL)
+
+        buffer = io.BytesIO()
+        grille.save(buffer)
+        donnees = buffer.getvalue()
+        self.assertEqual(Grille.depuis_octets(donnees).weights, grille.weights)
+        with self.assertRaises(ValueError):
+            Grille.depuis_octets(donnees[:-1])
+        with self.assertRaises(ValueError):
+            Grille.depuis_octets(b"XXXX" + donnees[4:])
+        for poids in (0, -3, grille.WALL + 1):
+            grille.weights[0] = poids
+            buffer = io.BytesIO()
+            grille.save(buffer)
+            with self.assertRaises(ValueError):
+                Grille.depuis_octets(buffer.getvalue())
+
+    def test_magasin_grilles(self):
+        """
+        Test du magasin de grilles : une grille par session, remplacement, oubli de la moins récemment utilisée.
+        """
+        magasin = MagasinGrilles(lambda: Grille(5, 5), capacite=2)
+        grille_a, verrou_a = magasin.obtenir("a")
+        self.assertIs(magasin.obtenir("a")[0], grille_a)
+        magasin.remplacer("b", Grille(3, 4))
+        self.assertEqual(magasin.obtenir("b")[0].width, 4)
+        magasin.obtenir("a")
+        magasin.obtenir("c")
+        self.assertEqual(len(magasin), 2)
+        self.assertIs(magasin.obtenir("a")[0], grille_a)
+        self.assertEqual(magasin.obtenir("b")[0].width, 5)
+
+    def test_verrou_lecture_ecriture(self):
+        """
+        Test du verrou lecteurs/rédacteur : lectures simultanées, écriture exclusive.
+        """
+        verrou = VerrouLectureEcriture()
+        ecrit = threading.Event()
+
+        def rediger():
+            with verrou.ecriture():
+                ecrit.set()
+
+        with verrou.lecture():
+            with verrou.lecture():
+                redacteur = threading.Thread(target=rediger)
+                redacteur.start()
+                self.assertFalse(ecrit.wait(0.05))
+        redacteur.join(1)
+        self.assertTrue(ecrit.is_set())
+
+    def test_modifier_poids(self):
+        """
+        Test des modifications par lot : rectangles puis cellules, composantes tenues à jour, lot refusé en entier.
+        """
+        self.assertEqual(self.grille.composante(0), self.grille.composante(24))
+        version = self.grille.version
+        self.assertEqual(self.grille.modifier_poids([(0, 2, 7)], [(2, 0, 2, 4, self.grille.WALL)]), 6)
+        self.assertEqual(self.grille.version, version + 6)
+        self.assertEqual(self.grille.tab[0][2].weight, 7)
+        self.assertEqual([self.grille.tab[2][y].weight for y in range(5)], [self.grille.WALL] * 5)
+        self.assertNotEqual(self.grille.composante(0), self.grille.composante(24))
+        self.assertEqual(self.grille.modifier_poids([(0, 2, 7)]), 0)
+
+        with self.assertRaises(IndexError):
+            self.grille.modifier_poids([(0, 0, 3), (5, 0, 3)])
+        with self.assertRaises(BadWeightException):
+            self.grille.modifier_poids([(0, 0, 3)], [(0, 0, 1, 1, 0)])
+        with self.assertRaises(BadWeightException):
+            self.grille.modifier_poids([(0, 0, 3), (1, 0, self.grille.WALL + 1)])
+        with self.assertRaises(BadWeightException):
+            self.grille.modifier_poids(rectangles=[(0, 0, 1, 1, self.grille.WALL + 1)])
+        self.assertEqual(self.grille.tab[0][0].weight, 1)
+
+        self.assertEqual(self.grille.modifier_poids(rectangles=[(4, 4, 0, 0, 3)]), 25)
+        self.assertEqual(self.grille.composante(0), self.grille.composante(24))
+
+    def test_poids_en_octets(self):
+        """
+        Test des formats compacts de poids : aller-retour, taille du RLE, poids et tailles refusés d'un bloc.
+        """
+        self.grille.modifier_poids([(1, 1, 22)], [(3, 0, 3, 4, self.grille.WALL)])
+        self.assertEqual(len(self.grille.poids_en_octets(POIDS_UINT16)), 25 * 2)
+        self.assertEqual(len(self.grille.poids_en_octets(POIDS_RLE)), 5 * 8)
+        for format in (POIDS_UINT16, POIDS_UINT32, POIDS_RLE):
+            copie = Grille(5, 5)
+            self.assertEqual(copie.poids_depuis_octets(self.grille.poids_en_octets(format), format), 6)
+            self.assertEqual(copie.weights, self.grille.weights)
+            self.assertNotEqual(copie.composante(0), copie.composante(24))
+
+        with self.assertRaises(ValueError):
+            self.grille.poids_depuis_octets(bytes(24 * 2), POIDS_UINT16)
+        with self.assertRaises(ValueError):
+            self.grille.poids_depuis_octets((24).to_bytes(4, "little") + (1).to_bytes(4, "little"), POIDS_RLE)
+        with self.assertRaises(BadWeightException):
+            self.grille.poids_depuis_octets(bytes(25 * 4), POIDS_UINT32)
+        self.grille.weights[0] = -1
+        for format in (POIDS_UINT16, POIDS_UINT32, POIDS_RLE):
+            with self.assertRaises(ValueError):
+                self.grille.poids_en_octets(format)
+        self.assertEqual(self.grille.tab[1][1].weight, 22)
+
+    def test_empreinte(self):
+        """
+        Test de l'empreinte : stable sans modification, changée par un poids ou par une nouvelle grille.
+        """
+        empreinte = self.grille.empreinte
+        self.grille.set_weight(0, 0, 1)
+        self.assertEqual(self.grille.empreinte, empreinte)
+        self.grille.set_weight(0, 0, 3)
+        self.assertNotEqual(self.grille.empreinte, empreinte)
+        self.assertNotEqual(Grille(5, 5).empreinte, Grille(5, 5).empreinte)
+        buffer = io.BytesIO()
+        self.grille.save(buffer)
+        self.assertNotEqual(Grille.depuis_octets(buffer.getvalue()).empreinte, self.grille.empreinte)
+
+    def test_remplacer_poids(self):
+        """
+        Test du remplacement de tous les poids d'un bloc : composantes reconstruites, poids et taille vérifiés.
+        """
+        self.assertEqual(self.grille.composante(0), self.grille.composante(24))
+        weights = array("q", self.grille.weights)
+        for y in range(5):
+            weights[2 * 5 + y] = self.grille.WALL
+        self.assertEqual(self.grille.remplacer_poids(weights), 5)
+        self.assertNotEqual(self.grille.composante(0), self.grille.composante(24))
+        self.assertEqual(self.grille.remplacer_poids(weights), 0)
+
+        # Un petit remplacement passe par set_weight : LPA* et HPA* réparent au lieu de tout recalculer
+        grille = Grille(20, 20)
+        start, end = grille.tab[0][0], grille.tab[19][19]
+        visited, _ = grille.lpa_star(start, end)
+        premier = sum(len(v) for v in visited.values())
+        grille.hpa_star(start, end, taille_cluster=8)
+        planificateur, hierarchie = grille._planificateur, grille._hierarchie
+        weights = array("q", grille.weights)
+        weights[5 * 20 + 2] = 7
+        self.assertEqual(grille.remplacer_poids(weights), 1)
+        self.assertIs(grille._planificateur, planificateur)
+        self.assertIs(grille._hierarchie, hierarchie)
+        visited, _ = grille.lpa_star(start, end)
+        self.assertLess(sum(len(v) for v in visited.values()), premier)
+
+        # Au-delà d'un quart de la grille, les précalculs sont invalidés d'un bloc
+        attendu = sum(1 for weight in grille.weights if weight != 2)
+        self.assertEqual(grille.remplacer_poids(array("q", [2]) * len(grille.weights)), attendu)
+        self.assertIsNone(grille._planificateur)
+
+        with self.assertRaises(BadWeightException):
+            self.grille.remplacer_poids(array("q", [1] * 24 + [self.grille.WALL + 1]))
+        with self.assertRaises(ValueError):
+            self.grille.remplacer_poids(array("q", [1] * 24))
+
+
+class TestRoutes(unittest.TestCase):
+    def setUp(self):
+        # Une session par test, sur une grille 5x5
+        self.client = routes.app.test_client()
+        self.entetes = {"X-Grid-Id": self.id()}
+        self.client.put("/grid/dimensions", json={"height": 5, "width": 5}, headers=self.entetes)
+        self.requete = {"start_x": 0, "start_y": 0, "end_x": 4, "end_y": 4}
+
+    def test_diffusion_ndjson(self):
+        """
+        Test de la diffusion NDJSON : un objet JSON par ligne, de start à done, avec le chemin trouvé.
+        """
+        reponse = self.client.post("/algorithm/dijkstra", json={**self.requete, "stream": "ndjson"},
+                                   headers=self.entetes)
+        self.assertEqual(reponse.mimetype, "application/x-ndjson")
+        lignes = reponse.get_data(as_text=True).split("\n")
+        self.assertEqual(lignes[-1], "")
+        messages = [json.loads(ligne) for ligne in lignes[:-1]]
+        self.assertEqual(messages[0], {"event": "start", "height": 5, "width": 5})
+        self.assertEqual(messages[1]["event"], EXPANSION)
+        self.assertEqual([m["event"] for m in messages[-2:]], [TROUVE, FIN])
+        self.assertEqual(messages[-2]["path"][-1], 4 * 5 + 4)
+
+    def test_diffusion_sse(self):
+        """
+        Test de la diffusion Server-Sent Events : des blocs event/data séparés par une ligne vide.
+        """
+        reponse = self.client.post("/algorithm/a_star", json={**self.requete, "stream": "sse", "max_expansions": 2},
+                                   headers=self.entetes)
+        self.assertEqual(reponse.mimetype, "text/event-stream")
+        texte = reponse.get_data(as_text=True)
+        self.assertTrue(texte.endswith("\n\n"))
+        blocs = [bloc.split("\n") for bloc in texte[:-2].split("\n\n")]
+        for evenement, donnees in blocs:
+            self.assertTrue(evenement.startswith("event: ") and donnees.startswith("data: "))
+            self.assertEqual(json.loads(donnees[len("data: "):])["event"], evenement[len("event: "):])
+        self.assertEqual([bloc[0] for bloc in blocs[-2:]], ["event: " + INTERROMPU, "event: " + FIN])
+        self.assertIn('"status": "max_expansions"', blocs[-2][1])
+
+    def test_diffusion_sans_verrou(self):
+        """
+        Test d'une diffusion lue lentement : elle ne bloque pas les écritures sur la grille de la session.
+        """
+        reponse = self.client.post("/algorithm/dijkstra", json={**self.requete, "stream": "ndjson"},
+                                   headers=self.entetes, buffered=False)
+        morceaux = iter(reponse.response)
+        next(morceaux)
+        next(morceaux)
+        ecriture = threading.Thread(target=self.client.patch, args=("/grid/weights",),
+                                    kwargs={"json": {"changes": [[2, 2, 5]]}, "headers": self.entetes})
+        ecriture.start()
+        ecriture.join(5)
+        self.assertFalse(ecriture.is_alive())
+        reponse.close()
+
+    def test_jetons_annulation(self):
+        """
+        Test des jetons d'annulation : propres à la session, refusés s'ils sont déjà utilisés par une recherche en cours.
+        """
+        self.client.put("/grid/dimensions", json={"height": 100, "width": 100}, headers=self.entetes)
+        requete = {**self.requete, "end_x": 99, "end_y": 99}
+        reponse = self.client.post("/algorithm/dijkstra", json={**requete, "stream": "ndjson", "cancel_token": "t"},
+                                   headers=self.entetes, buffered=False)
+        morceaux = iter(reponse.response)
+        next(morceaux)
+        next(morceaux)
+
+        autre_session = {"X-Grid-Id": self.id() + "-autre"}
+        self.assertEqual(self.client.post("/algorithm/cancel", json={"cancel_token": "t"},
+                                          headers=autre_session).status_code, 404)
+        self.assertEqual(self.client.post("/algorithm/dijkstra", json={**requete, "cancel_token": "t"},
+                                          headers=self.entetes).status_code, 409)
+        self.assertEqual(self.client.post("/algorithm/dijkstra", json={**self.requete, "cancel_token": "t"},
+                                          headers=autre_session).status_code, 200)
+
+        self.assertEqual(self.client.post("/algorithm/cancel", json={"cancel_token": "t"},
+                                          headers=self.entetes).status_code, 200)
+        fin = b"".join(morceaux).decode().splitlines()
+        self.assertEqual(json.loads(fin[-2]), {"event": INTERROMPU, "status": LIMITE_ANNULATION})
+        reponse.close()
+        self.assertEqual(self.client.post("/algorithm/cancel", json={"cancel_token": "t"},
+                                          headers=self.entetes).status_code, 404)
+
+    def test_poids_binaires(self):
+        """
+        Test de GET /grid/weights : Vary: Accept sur chaque représentation, 406 si un poids n'est pas encodable.
+        """
+        reponse = self.client.get("/grid/weights", headers=self.entetes)
+        self.assertEqual(reponse.status_code, 200)
+        self.assertEqual(reponse.headers["Vary"], "Accept")
+        reponse = self.client.get("/grid/weights", headers={**self.entetes, "Accept": "application/x-grid-uint16"})
+        self.assertEqual(reponse.status_code, 200)
+        self.assertEqual(reponse.headers["Vary"], "Accept")
+        self.assertEqual(len(reponse.data), 25 * 2)
+
+        grille, _ = routes.magasin.obtenir(self.id())
+        grille.weights[0] = -1
+        reponse = self.client.get("/grid/weights", headers={**self.entetes, "Accept": "application/x-grid-uint16"})
+        self.assertEqual(reponse.status_code, 406)
+        self.assertEqual(reponse.headers["Vary"], "Accept")
+
+    def test_etag(self):
+        """
+        Test des ETag : 304 tant que la grille est inchangée, nouvel ETag après une modification ou un
+        redimensionnement, If-None-Match: * satisfait par un GET mais refusé (412) sur un POST.
+        """
+        reponse = self.client.get("/grid/weights", headers=self.entetes)
+        valeur = reponse.headers["ETag"]
+        reponse = self.client.get("/grid/weights", headers={**self.entetes, "If-None-Match": valeur})
+        self.assertEqual(reponse.status_code, 304)
+        self.assertEqual(reponse.headers["ETag"], valeur)
+        reponse = self.client.get("/grid/weights", headers={**self.entetes, "If-None-Match": f'W/{valeur}'})
+        self.assertEqual(reponse.status_code, 304)
+
+        resultat = self.client.post("/algorithm/dijkstra", json=self.requete, headers=self.entetes)
+        self.assertEqual(resultat.status_code, 200)
+        self.assertNotEqual(resultat.headers["ETag"], valeur)
+        reponse = self.client.post("/algorithm/dijkstra", json=self.requete,
+                                   headers={**self.entetes, "If-None-Match": resultat.headers["ETag"]})
+        self.assertEqual(reponse.status_code, 304)
+
+        self.client.patch("/grid/weights", json={"changes": [[2, 2, 7]]}, headers=self.entetes)
+        reponse = self.client.get("/grid/weights", headers={**self.entetes, "If-None-Match": valeur})
+        self.assertEqual(reponse.status_code, 200)
+        self.assertNotEqual(reponse.headers["ETag"], valeur)
+        valeur = reponse.headers["ETag"]
+
+        self.client.put("/grid/dimensions", json={"height": 5, "width": 5}, headers=self.entetes)
+        reponse = self.client.get("/grid/weights", headers={**self.entetes, "If-None-Match": valeur})
+        self.assertEqual(reponse.status_code, 200)
+        self.assertNotEqual(reponse.headers["ETag"], valeur)
+
+        reponse = self.client.get("/grid/weights", headers={**self.entetes, "If-None-Match": "*"})
+        self.assertEqual(reponse.status_code, 304)
+        reponse = self.client.post("/algorithm/dijkstra", json=self.requete,
+                                   headers={**self.entetes, "If-None-Match": "*"})
+        self.assertEqual(reponse.status_code, 412)
+        reponse = self.client.post("/algorithm/dijkstra", json=self.requete,
+                                   headers={**self.entetes, "If-None-Match": f'"autre", {resultat.headers["ETag"]}'})
+        self.assertEqual(reponse.status_code, 200)
+
+    def test_diffusion_refusee_incrementaux(self):
+        """
+        Test du refus de la diffusion pour LPA* et HPA*, dont l'état conservé dans la grille serait perdu avec la copie.
+        """
+        for route in ("/algorithm/lpa_star", "/algorithm/hpa_star"):
+            reponse = self.client.post(route, json={**self.requete, "stream": "ndjson"}, headers=self.entetes)
+            self.assertEqual(reponse.status_code, 400)
+            self.assertEqual(self.client.post(route, json=self.requete, headers=self.entetes).status_code, 200)